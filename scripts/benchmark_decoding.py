@@ -0,0 +1,87 @@
+"""Benchmark decoding of a 10k-record SearchWebAPI result page.
+
+Compares the kiota JSON parse nodes with the fast decoders in
+axcpy.searchwebapi.services.decoding.
+
+Usage:
+    python scripts/benchmark_decoding.py [--records 10000] [--fields 8] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+
+from kiota_serialization_json.json_parse_node_factory import JsonParseNodeFactory
+
+from axcpy.searchwebapi.generated.models.search_result import SearchResult
+from axcpy.searchwebapi.services.decoding import (
+    JSON_BACKEND,
+    decode_search_result,
+    record_rows,
+)
+
+
+def make_page(records: int, fields: int) -> bytes:
+    results = [
+        {
+            "id": f"doc-{i:08d}",
+            "rank": i + 1,
+            "relevance": 1.0 / (i + 1),
+            "uniqueField": f"unique-{i}",
+            "fields": [
+                {"id": f"rm_field_{f}", "value": f"value {i} {f}"} for f in range(fields)
+            ]
+            + [{"id": "rm_modificationdate", "value": "2024-01-01", "valueObject": {}}],
+        }
+        for i in range(records)
+    ]
+    page = {
+        "numberResults": records * 10,
+        "results": results,
+        "status": {"successful": True, "httpStatus": 200},
+    }
+    return json.dumps(page).encode()
+
+
+def kiota_decode(body: bytes) -> SearchResult:
+    node = JsonParseNodeFactory().get_root_parse_node("application/json", body)
+    return node.get_object_value(SearchResult)
+
+
+def measure(label: str, func: Callable[[bytes], object], body: bytes, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(body)
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<40} {best * 1000:9.1f} ms")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=10_000)
+    parser.add_argument("--fields", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    body = make_page(args.records, args.fields)
+    print(f"{args.records} records, {len(body) / 1e6:.1f} MB, JSON backend: {JSON_BACKEND}")
+    baseline = measure("kiota parse nodes", kiota_decode, body, args.repeat)
+    for label, func in [
+        ("decode_search_result", decode_search_result),
+        (
+            "decode_search_result(additional_data)",
+            lambda b: decode_search_result(b, additional_data=True),
+        ),
+        ("record_rows", lambda b: list(record_rows(b))),
+    ]:
+        elapsed = measure(label, func, body, args.repeat)
+        print(f"{'':<40} {baseline / elapsed:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark building SearchWebAPI record requests.
+
+Compares the fluent generated builders with the precompiled
+axcpy.searchwebapi.services.endpoints.CollectionEndpoints, up to the final URL
+(no network).
+
+Usage:
+    python scripts/benchmark_endpoints.py [--requests 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import warnings
+
+from kiota_abstractions.base_request_configuration import RequestConfiguration
+
+from axcpy.searchwebapi import SearchWebApiSession
+from axcpy.searchwebapi.services.endpoints import RecordsQueryParameters, collection_endpoints
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    warnings.simplefilter("ignore", DeprecationWarning)
+
+    swa = SearchWebApiSession("https://swa.example.com/searchWebApi", "user", "secret")
+    client, adapter = swa.client, swa.request_adapter
+    params = [
+        RecordsQueryParameters(query="york", fields="rm_title,rm_author", limit=1000, page=page)
+        for page in range(1, args.requests + 1)
+    ]
+
+    start = time.perf_counter()
+    for p in params:
+        info = (
+            client.projects.by_project_id("project")
+            .collections.by_collection_id("documents")
+            .records.to_get_request_information(RequestConfiguration(query_parameters=p))
+        )
+        adapter.set_base_url_for_request_information(info)
+        info.url  # noqa: B018
+    builders = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for p in params:
+        endpoints = collection_endpoints(client, "project", "documents")
+        endpoints.records_request(p).url  # noqa: B018
+    fast = time.perf_counter() - start
+
+    per = 1e6 / args.requests
+    print(f"fluent builders: {builders * per:8.1f} us/request")
+    print(f"endpoints:       {fast * per:8.1f} us/request ({builders / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark the import time of axcpy entry points.
+
+Each module is imported in a fresh interpreter, so module caches of earlier
+runs do not hide the cost. Reports the median wall time and whether the
+kiota stack of the searchwebapi extra was loaded.
+
+Usage:
+    python scripts/benchmark_import.py [--repeat 7] [module ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+DEFAULT_MODULES = [
+    "axcpy",
+    "axcpy.cli.main",
+    "axcpy.adp",
+    "axcpy.searchwebapi",
+    "axcpy.searchwebapi.services",
+]
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+kiota = any(m.startswith("kiota") for m in sys.modules)
+print(elapsed, len(sys.modules), kiota)
+"""
+
+
+def measure(module: str) -> tuple[float, int, bool]:
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+    return float(output[0]), int(output[1]), output[2] == "True"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'module':<30} {'median ms':>10} {'min ms':>8} {'modules':>8}  kiota")
+    for module in args.modules:
+        runs = [measure(module) for _ in range(args.repeat)]
+        times = [t * 1000 for t, _, _ in runs]
+        _, loaded, kiota = runs[-1]
+        print(
+            f"{module:<30} {statistics.median(times):>10.1f} {min(times):>8.1f} "
+            f"{loaded:>8}  {'yes' if kiota else 'no'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,32 @@
 Python client library for OpenText Axcelerate eDiscovery service.
 """
 
-# Re-export subpackages for convenience
-from axcpy import adp, searchwebapi
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from axcpy.__version__ import __version__
 
+if TYPE_CHECKING:
+    from axcpy import adp, searchwebapi
+
+# Subpackages are re-exported for convenience but imported on first access, so
+# `import axcpy` (and the CLI) does not load the kiota stack of searchwebapi.
+_SUBPACKAGES = ("adp", "searchwebapi")
+
 __all__ = [
     "__version__",
     "adp",
     "searchwebapi",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBPACKAGES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_SUBPACKAGES})
@@ -0,0 +1,16 @@
+"""Imports of optional dependencies with installation hints."""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+def require_numpy() -> Any:
+    """Import NumPy, which the ``analytics`` extra installs, on first use."""
+    try:
+        import numpy
+    except ImportError as e:  # pragma: no cover - depends on environment
+        raise ImportError(
+            "NumPy is required for array conversion. Install with: pip install axcpy[analytics]"
+        ) from e
+    return numpy
@@ -4,10 +4,21 @@ This module provides clients and models for interacting with ADP endpoints.
 """
 
 from axcpy.adp.models.request import ADPTaskRequest
+from axcpy.adp.services.alert_watcher import ServiceAlertWatcher
 from axcpy.adp.services.async_client import AsyncADPClient
 from axcpy.adp.services.async_session import AsyncSession
 from axcpy.adp.services.client import ADPClient
+from axcpy.adp.services.export_reader import ExportDocumentsReader, resolve_export_path
+from axcpy.adp.services.export_sharding import ShardedExport, range_partitions
+from axcpy.adp.services.query_engine_matrix import (
+    QueryEngineMatrixResult,
+    query_engine_matrix,
+)
 from axcpy.adp.services.session import Session
+from axcpy.adp.services.users_and_groups_sync import (
+    AsyncUsersAndGroupsReconciler,
+    UsersAndGroupsReconciler,
+)
 
 __all__ = [
     "ADPClient",
@@ -15,4 +26,13 @@ __all__ = [
     "AsyncADPClient",
     "AsyncSession",
     "ADPTaskRequest",
+    "UsersAndGroupsReconciler",
+    "AsyncUsersAndGroupsReconciler",
+    "ServiceAlertWatcher",
+    "QueryEngineMatrixResult",
+    "query_engine_matrix",
+    "ExportDocumentsReader",
+    "resolve_export_path",
+    "ShardedExport",
+    "range_partitions",
 ]
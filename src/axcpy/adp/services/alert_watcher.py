@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from pathlib import Path
+
+from axcpy.adp.models.read_service_alerts import ReadServiceAlertsTaskConfig, ServiceAlert
+
+from .async_session import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive timestamps as UTC so they compare with aware ones."""
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+
+
+class ServiceAlertWatcher:
+    """Incremental poller for the Read Service Alerts task.
+
+    The watcher keeps a watermark on `ServiceAlert.report_on` and only asks the
+    server for alerts reported after it (via the `adp_readServiceAlerts_date` filter).
+    Alerts are deduplicated by `id`, so alerts sharing the watermark timestamp are
+    not yielded twice. The most recent alerts are kept in a bounded ring buffer.
+
+    Parameters
+    ----------
+    session: AsyncSession
+        Authenticated session used to run the Read Service Alerts task.
+    interval: float, default 60.0
+        Seconds to wait between two polls when iterating.
+    maximum: int | None
+        Optional cap on the number of alerts returned per poll
+        (`adp_readServiceAlerts_maximum`).
+    state_path: str | Path | None
+        JSON file the watermark is persisted to after every poll that saw new
+        alerts. When the file exists it is loaded on construction, so a restarted
+        monitor resumes where it stopped.
+    buffer_size: int, default 1000
+        Number of recent alerts kept in `recent` and remembered for deduplication.
+    config: ReadServiceAlertsTaskConfig | None
+        Template for further task settings (e.g. blacklist); `date` and
+        `maximum` are managed by the watcher.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        interval: float = 60.0,
+        maximum: int | None = None,
+        state_path: str | Path | None = None,
+        buffer_size: int = 1000,
+        config: ReadServiceAlertsTaskConfig | None = None,
+    ) -> None:
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be at least 1")
+        self._session = session
+        self.interval = interval
+        self.maximum = maximum
+        self.state_path = Path(state_path) if state_path is not None else None
+        self._config = config or ReadServiceAlertsTaskConfig()
+        self._recent: deque[ServiceAlert] = deque(maxlen=buffer_size)
+        self._seen_ids: deque[str] = deque(maxlen=buffer_size)
+        self._seen_lookup: set[str] = set()
+        self._watermark: datetime | None = None
+        self._stopped = False
+        if self.state_path is not None and self.state_path.exists():
+            self._load_state()
+
+    @property
+    def watermark(self) -> datetime | None:
+        """Report time of the newest alert seen so far."""
+        return self._watermark
+
+    @property
+    def recent(self) -> list[ServiceAlert]:
+        """Most recent alerts, oldest first (bounded by `buffer_size`)."""
+        return list(self._recent)
+
+    def _remember(self, alert_id: str) -> None:
+        if len(self._seen_ids) == self._seen_ids.maxlen:
+            self._seen_lookup.discard(self._seen_ids[0])
+        self._seen_ids.append(alert_id)
+        self._seen_lookup.add(alert_id)
+
+    def _load_state(self) -> None:
+        assert self.state_path is not None
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable alert watermark %s: %s", self.state_path, e)
+            return
+        if state.get("watermark"):
+            self._watermark = _as_utc(datetime.fromisoformat(state["watermark"]))
+        for alert_id in state.get("seen_ids", []):
+            self._remember(alert_id)
+
+    def _save_state(self) -> None:
+        if self.state_path is None:
+            return
+        state = {
+            "watermark": self._watermark.isoformat() if self._watermark else None,
+            "seen_ids": list(self._seen_ids),
+        }
+        tmp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+        tmp_path.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp_path, self.state_path)
+
+    def _build_config(self) -> ReadServiceAlertsTaskConfig:
+        update: dict[str, str] = {}
+        if self._watermark is not None:
+            update["adp_readServiceAlerts_date"] = self._watermark.isoformat()
+        if self.maximum is not None:
+            update["adp_readServiceAlerts_maximum"] = str(self.maximum)
+        return self._config.model_copy(update=update)
+
+    def _accept(self, alerts: list[ServiceAlert]) -> list[ServiceAlert]:
+        """Filter out alerts already seen or older than the watermark, oldest first."""
+        fresh: list[ServiceAlert] = []
+        ordered = sorted(
+            alerts,
+            key=lambda a: _as_utc(a.report_on) if a.report_on else datetime.min.replace(tzinfo=UTC),
+        )
+        for alert in ordered:
+            if alert.id and alert.id in self._seen_lookup:
+                continue
+            reported = _as_utc(alert.report_on) if alert.report_on else None
+            if reported is not None and self._watermark is not None and reported < self._watermark:
+                continue
+            if alert.id:
+                self._remember(alert.id)
+            if reported is not None and (self._watermark is None or reported > self._watermark):
+                self._watermark = reported
+            self._recent.append(alert)
+            fresh.append(alert)
+        return fresh
+
+    async def poll(self, *, timeout: float | None = None) -> list[ServiceAlert]:
+        """Fetch alerts newer than the watermark once and return the unseen ones."""
+        result = await self._session.read_service_alerts(self._build_config(), timeout=timeout)
+        fresh = self._accept(result.adp_readServiceAlerts_json_output)
+        if fresh:
+            self._save_state()
+        return fresh
+
+    def stop(self) -> None:
+        """Stop iteration after the current poll."""
+        self._stopped = True
+
+    async def watch(self, *, timeout: float | None = None) -> AsyncIterator[ServiceAlert]:
+        """Yield new alerts as they appear, polling every `interval` seconds."""
+        self._stopped = False
+        while not self._stopped:
+            for alert in await self.poll(timeout=timeout):
+                yield alert
+            if self._stopped:
+                break
+            await asyncio.sleep(self.interval)
+
+    def __aiter__(self) -> AsyncIterator[ServiceAlert]:
+        return self.watch()
+
+
+__all__ = ["ServiceAlertWatcher"]
@@ -28,6 +28,10 @@ from axcpy.adp.models.read_configuration import (
     ReadConfigurationResult,
     ReadConfigurationTaskConfig,
 )
+from axcpy.adp.models.read_service_alerts import (
+    ReadServiceAlertsResult,
+    ReadServiceAlertsTaskConfig,
+)
 from axcpy.adp.models.request import ADPTaskRequest
 from axcpy.adp.models.response import ADPTaskResponse
 from axcpy.adp.models.start_application import (
@@ -274,6 +278,33 @@ class AsyncSession:
             timeout=timeout,
         )
 
+    async def read_service_alerts(
+        self,
+        config: ReadServiceAlertsTaskConfig,
+        *,
+        timeout: float | None = None,
+    ) -> ReadServiceAlertsResult:
+        """Read service alerts from the system.
+
+        Parameters
+        ----------
+        config : ReadServiceAlertsTaskConfig
+            Configuration for the Read Service Alerts task.
+        timeout : float | None
+            Optional timeout in seconds for this request.
+
+        Returns
+        -------
+        ReadServiceAlertsResult
+            Result containing service alert information.
+        """
+        result: ReadServiceAlertsResult = await self.run_task(
+            "read_service_alerts",
+            config=config,
+            timeout=timeout,
+        )
+        return result
+
     async def start_application(
         self,
         config: StartApplicationTaskConfig,
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import csv
+import logging
+from collections.abc import Collection, Iterator, Mapping
+from pathlib import Path, PureWindowsPath
+
+from axcpy.adp.models.export_documents import ExportDocumentsResult, ExportDocumentsTaskConfig
+
+logger = logging.getLogger(__name__)
+
+ExportValue = str | list[str]
+
+
+def resolve_export_path(
+    result: ExportDocumentsResult,
+    mounts: Mapping[str, str | Path] | None = None,
+) -> Path:
+    """Translate the server-side export location of a result into a local path.
+
+    `adp_exportDocuments_exportPath` is reported as seen by the ADP host (typically a
+    Windows path). `mounts` maps server path prefixes to local mount points, e.g.
+    ``{"E:\\\\MindServer\\\\export": "/mnt/axc-export"}``. The file name is appended
+    unless the export path already ends with it.
+    """
+    if not result.adp_exportDocuments_exportPath:
+        raise ValueError("Export result does not contain adp_exportDocuments_exportPath")
+
+    server_path = result.adp_exportDocuments_exportPath
+    file_name = result.adp_exportDocuments_exportFileName
+    local: Path | None = None
+    for prefix, mount_point in (mounts or {}).items():
+        server_parts = PureWindowsPath(server_path).parts
+        prefix_parts = PureWindowsPath(prefix).parts
+        if [p.lower() for p in server_parts[: len(prefix_parts)]] == [
+            p.lower() for p in prefix_parts
+        ]:
+            local = Path(mount_point).joinpath(*server_parts[len(prefix_parts) :])
+            break
+    if local is None:
+        local = Path(server_path)
+    if file_name and local.name != file_name:
+        local = local / file_name
+    return local
+
+
+class ExportDocumentsReader:
+    """Streaming reader for CSV files produced by the Export Documents task.
+
+    The CSV dialect is taken from the originating `ExportDocumentsTaskConfig`
+    (`field_separator`, `text_indicator`, `multivalue_separator`), so files are
+    parsed exactly as they were written. Rows are read lazily from disk; memory use
+    is bounded by the batch size, not by the export size.
+
+    Parameters
+    ----------
+    config: ExportDocumentsTaskConfig
+        Configuration the export was run with.
+    path: str | Path
+        Local path of the exported CSV file (see `resolve_export_path`).
+    multivalue_fields: Collection[str] | None
+        Columns holding multiple values. These are always returned as lists.
+        If None, any value containing the multivalue separator is split and all
+        other values are returned as plain strings.
+    encoding: str, default "utf-8-sig"
+        File encoding; the default transparently skips a UTF-8 byte order mark.
+    """
+
+    def __init__(
+        self,
+        config: ExportDocumentsTaskConfig,
+        path: str | Path,
+        *,
+        multivalue_fields: Collection[str] | None = None,
+        encoding: str = "utf-8-sig",
+    ) -> None:
+        self.config = config
+        self.path = Path(path)
+        self.multivalue_fields = set(multivalue_fields) if multivalue_fields is not None else None
+        self.encoding = encoding
+
+    @classmethod
+    def from_result(
+        cls,
+        config: ExportDocumentsTaskConfig,
+        result: ExportDocumentsResult,
+        *,
+        mounts: Mapping[str, str | Path] | None = None,
+        multivalue_fields: Collection[str] | None = None,
+        encoding: str = "utf-8-sig",
+    ) -> ExportDocumentsReader:
+        """Create a reader for the file described by an `ExportDocumentsResult`."""
+        return cls(
+            config,
+            resolve_export_path(result, mounts),
+            multivalue_fields=multivalue_fields,
+            encoding=encoding,
+        )
+
+    def _csv_options(self) -> dict[str, object]:
+        separator = self.config.adp_exportDocuments_field_separator or ","
+        quote = self.config.adp_exportDocuments_text_indicator
+        options: dict[str, object] = {"delimiter": separator, "strict": False}
+        if quote:
+            options.update(quotechar=quote, doublequote=True, quoting=csv.QUOTE_MINIMAL)
+        else:
+            options.update(quoting=csv.QUOTE_NONE)
+        return options
+
+    def _splitter(self, header: list[str]) -> list[bool | None]:
+        """Per column: True = always split, False = never, None = split if separator found."""
+        if self.multivalue_fields is None:
+            return [None] * len(header)
+        return [name in self.multivalue_fields for name in header]
+
+    def _convert(self, value: str, split: bool | None) -> ExportValue:
+        separator = self.config.adp_exportDocuments_multivalue_separator
+        if split is False or not separator:
+            return value
+        if split is None:
+            return value.split(separator) if separator in value else value
+        return value.split(separator) if value else []
+
+    def _iter_raw(self) -> Iterator[tuple[list[str], Iterator[list[str]]]]:
+        with self.path.open("r", encoding=self.encoding, newline="") as handle:
+            reader = csv.reader(handle, **self._csv_options())  # type: ignore[arg-type]
+            try:
+                header = next(reader)
+            except StopIteration:
+                return
+            yield header, reader
+
+    @property
+    def columns(self) -> list[str]:
+        """Column names from the header row."""
+        for header, _ in self._iter_raw():
+            return header
+        return []
+
+    def rows(self) -> Iterator[dict[str, ExportValue]]:
+        """Yield one dict per exported document, multivalue columns already split."""
+        for header, reader in self._iter_raw():
+            splitters = self._splitter(header)
+            width = len(header)
+            for line_number, raw in enumerate(reader, start=2):
+                if not raw:
+                    continue
+                if len(raw) != width:
+                    logger.warning(
+                        "%s:%d has %d fields, expected %d", self.path, line_number, len(raw), width
+                    )
+                    raw = (raw + [""] * width)[:width]
+                yield {
+                    name: self._convert(value, split)
+                    for name, value, split in zip(header, raw, splitters, strict=True)
+                }
+
+    def batches(self, size: int = 10_000) -> Iterator[dict[str, list[ExportValue]]]:
+        """Yield column batches (column name -> list of values) of at most `size` rows."""
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        columns: dict[str, list[ExportValue]] | None = None
+        count = 0
+        for row in self.rows():
+            if columns is None:
+                columns = {name: [] for name in row}
+            for name, value in row.items():
+                columns[name].append(value)
+            count += 1
+            if count == size:
+                yield columns
+                columns = {name: [] for name in columns}
+                count = 0
+        if columns is not None and count:
+            yield columns
+
+    def __iter__(self) -> Iterator[dict[str, ExportValue]]:
+        return self.rows()
+
+
+__all__ = ["ExportDocumentsReader", "resolve_export_path"]
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Collection, Iterator, Mapping, Sequence
+from datetime import UTC, datetime
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+
+from axcpy.adp.models.export_documents import ExportDocumentsResult, ExportDocumentsTaskConfig
+from axcpy.adp.models.query_engine import QueryEngineTaskConfig
+
+from .async_session import AsyncSession
+from .export_reader import ExportDocumentsReader, ExportValue, resolve_export_path
+from .query_engine_matrix import query_engine_matrix
+
+logger = logging.getLogger(__name__)
+
+Boundary = str | int | float | datetime
+
+
+def _format_boundary(value: Boundary) -> str:
+    """Render a boundary for a fielded query; datetimes become epoch millis with 'L' suffix."""
+    if isinstance(value, datetime):
+        aware = value.replace(tzinfo=UTC) if value.tzinfo is None else value
+        return f"{int(aware.timestamp() * 1000)}L"
+    return str(value)
+
+
+def range_partitions(field: str, boundaries: Sequence[Boundary]) -> list[str]:
+    """Build disjoint range restrictions on `field` that cover the whole value range.
+
+    ``range_partitions("rm_numeric_identifier", [1000, 2000])`` returns
+    ``["rm_numeric_identifier<1000", "rm_numeric_identifier>=1000 AND
+    rm_numeric_identifier<2000", "rm_numeric_identifier>=2000"]``.
+    Boundaries must be sorted ascending. Documents without a value in `field`
+    match none of the partitions; `ShardedExport.plan` detects that via counts.
+    """
+    if not boundaries:
+        raise ValueError("At least one boundary is required")
+    bounds = [_format_boundary(b) for b in boundaries]
+    partitions = [f"{field}<{bounds[0]}"]
+    for low, high in zip(bounds, bounds[1:], strict=False):
+        partitions.append(f"{field}>={low} AND {field}<{high}")
+    partitions.append(f"{field}>={bounds[-1]}")
+    return partitions
+
+
+class ExportPartition(BaseModel):
+    """One slice of a sharded export."""
+
+    index: int
+    restriction: str
+    query: str
+    export_name: str
+    expected_count: int | None = None
+    result: ExportDocumentsResult | None = None
+    error: str | None = None
+
+
+class ShardedExportResult(BaseModel):
+    """Outcome of a sharded export; partitions are kept in submission order.
+
+    Failed partitions keep their `error`; the other partitions' files are
+    complete and can be read, retried exports only need the failed ones.
+    """
+
+    config: ExportDocumentsTaskConfig
+    partitions: list[ExportPartition] = Field(default_factory=list)
+    total_count: int | None = None
+
+    @property
+    def failed(self) -> list[ExportPartition]:
+        return [p for p in self.partitions if p.error is not None]
+
+    def has_errors(self) -> bool:
+        return any(p.error is not None for p in self.partitions)
+
+    def paths(self, mounts: Mapping[str, str | Path] | None = None) -> list[Path]:
+        """Local paths of all partition files."""
+        paths = []
+        for partition in self.partitions:
+            if partition.error is not None:
+                raise RuntimeError(f"Partition {partition.index} failed: {partition.error}")
+            if partition.result is None:
+                raise RuntimeError(f"Partition {partition.index} has not been exported")
+            paths.append(resolve_export_path(partition.result, mounts))
+        return paths
+
+    def rows(
+        self,
+        *,
+        mounts: Mapping[str, str | Path] | None = None,
+        multivalue_fields: Collection[str] | None = None,
+    ) -> Iterator[dict[str, ExportValue]]:
+        """Stream the rows of all partition CSVs as one logical export."""
+        columns: list[str] | None = None
+        for path in self.paths(mounts):
+            reader = ExportDocumentsReader(self.config, path, multivalue_fields=multivalue_fields)
+            part_columns = reader.columns
+            if columns is None:
+                columns = part_columns
+            elif part_columns and part_columns != columns:
+                raise ValueError(f"Columns of {path} differ from the first partition")
+            yield from reader.rows()
+
+
+class ShardedExport:
+    """Split one Export Documents run into disjoint query partitions run in parallel.
+
+    Each partition restricts the base query (`adp_exportDocuments_query`) and is
+    exported as its own task, so the work spreads over all available ADP workers.
+    Before exporting, `plan` uses Query Engine counts to verify that the partitions
+    are disjoint and cover the base query completely.
+
+    Parameters
+    ----------
+    session: AsyncSession
+        Authenticated session used for counting and exporting.
+    config: ExportDocumentsTaskConfig
+        Template export configuration. Its export name is suffixed per partition.
+    partitions: Sequence[str]
+        Query restrictions, e.g. from `range_partitions`.
+    count_config: QueryEngineTaskConfig | None
+        Template for counting; by default derived from the export's engine and
+        engine credentials.
+    concurrency: int, default 4
+        Maximum number of partition exports in flight; match it to the number
+        of ADP workers.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        config: ExportDocumentsTaskConfig,
+        partitions: Sequence[str],
+        *,
+        count_config: QueryEngineTaskConfig | None = None,
+        concurrency: int = 4,
+    ) -> None:
+        if not partitions:
+            raise ValueError("At least one partition is required")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self._session = session
+        self.config = config
+        self.concurrency = concurrency
+        self.count_config = count_config or QueryEngineTaskConfig(
+            adp_queryEngine_engineName=config.adp_exportDocuments_engineIdentifier,
+            adp_queryEngine_engineUserName=config.adp_exportDocuments_engineUser,
+            adp_queryEngine_engineUserPassword=config.adp_exportDocuments_enginePassword or "",
+            adp_queryEngine_applicationIdentifier=config.adp_exportDocuments_applicationIdentifier,
+        )
+        base_query = self.base_query
+        base_name = config.adp_exportDocuments_exportName or "export"
+        self.partitions = [
+            ExportPartition(
+                index=i,
+                restriction=restriction,
+                query=restriction if base_query == "*" else f"({base_query}) AND ({restriction})",
+                export_name=f"{base_name}_part{i:03d}",
+            )
+            for i, restriction in enumerate(partitions)
+        ]
+
+    @property
+    def base_query(self) -> str:
+        return self.config.adp_exportDocuments_query.strip() or "*"
+
+    async def plan(self, *, verify: bool = True, timeout: float | None = None) -> int:
+        """Count the base query and every partition; returns the base query count.
+
+        Raises
+        ------
+        ValueError
+            If `verify` is set and the partition counts do not add up to the base
+            count (overlapping partitions or documents not covered by any of them).
+        """
+        engine = self.count_config.adp_queryEngine_engineName or ""
+        queries = [self.base_query] + [p.query for p in self.partitions]
+        matrix = await query_engine_matrix(
+            self._session,
+            [engine],
+            queries,
+            config=self.count_config,
+            concurrency=self.concurrency,
+            timeout=timeout,
+        )
+        if matrix.has_errors():
+            failed = [q for q, row in zip(queries, matrix.errors, strict=True) if row[0]]
+            raise RuntimeError(f"Counting failed for queries: {failed}")
+        counts = [row[0] or 0 for row in matrix.documents_count]
+        total = counts[0]
+        for partition, count in zip(self.partitions, counts[1:], strict=True):
+            partition.expected_count = count
+        if verify and sum(counts[1:]) != total:
+            raise ValueError(
+                f"Partitions cover {sum(counts[1:])} documents but the query matches {total}; "
+                "partitions overlap or miss documents (e.g. without a value in the range field)"
+            )
+        logger.debug("Sharded export of %d documents in %d partitions", total, len(counts) - 1)
+        return total
+
+    async def run(
+        self,
+        *,
+        verify: bool = True,
+        skip_empty: bool = True,
+        timeout: float | None = None,
+    ) -> ShardedExportResult:
+        """Plan, then export all partitions concurrently and wait for every file.
+
+        Partitions counted as empty are not exported when `skip_empty` is set.
+        A failing partition does not stop the others: every export runs to its
+        end and failures are recorded in `ExportPartition.error` (see
+        `ShardedExportResult.has_errors`).
+        """
+        total = await self.plan(verify=verify, timeout=timeout)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def export(partition: ExportPartition) -> None:
+            part_config = self.config.model_copy(
+                update={
+                    "adp_exportDocuments_query": partition.query,
+                    "adp_exportDocuments_exportName": partition.export_name,
+                    "adp_exportDocuments_waitForExport": True,
+                }
+            )
+            async with semaphore:
+                partition.result = await self._session.export_documents(
+                    part_config, timeout=timeout
+                )
+
+        selected = [p for p in self.partitions if not (skip_empty and p.expected_count == 0)]
+        outcomes = await asyncio.gather(*(export(p) for p in selected), return_exceptions=True)
+        for partition, outcome in zip(selected, outcomes, strict=True):
+            if isinstance(outcome, BaseException):
+                if not isinstance(outcome, Exception):
+                    raise outcome  # cancellation and interpreter exits
+                logger.warning("Export of partition %d failed: %s", partition.index, outcome)
+                partition.error = str(outcome) or type(outcome).__name__
+        return ShardedExportResult(config=self.config, partitions=selected, total_count=total)
+
+
+__all__ = [
+    "ExportPartition",
+    "ShardedExport",
+    "ShardedExportResult",
+    "range_partitions",
+]
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel, Field
+
+from axcpy._optional import require_numpy
+from axcpy.adp.models.query_engine import QueryEngineResult, QueryEngineTaskConfig
+
+from .async_session import AsyncSession
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class QueryEngineMatrixResult(BaseModel):
+    """Columnar result of a queries x engines Query Engine fan-out.
+
+    All matrices are indexed as ``[query_index][engine_index]`` and follow the order
+    of `queries` and `engines`. Cells whose task failed hold ``None`` and the error
+    message in `errors`.
+    """
+
+    engines: list[str]
+    queries: list[str]
+    documents_count: list[list[int | None]] = Field(default_factory=list)
+    aggregated_value: list[list[str | int | float | None]] = Field(default_factory=list)
+    latency_seconds: list[list[float]] = Field(default_factory=list)
+    errors: list[list[str | None]] = Field(default_factory=list)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.queries), len(self.engines)
+
+    def has_errors(self) -> bool:
+        return any(err is not None for row in self.errors for err in row)
+
+    def counts_array(self) -> np.ndarray:
+        """Document counts as a float array; failed cells are NaN."""
+        numpy = require_numpy()
+        counts: np.ndarray = numpy.array(
+            [[numpy.nan if c is None else c for c in row] for row in self.documents_count],
+            dtype=float,
+        )
+        return counts.reshape(self.shape)
+
+    def aggregated_array(self) -> np.ndarray:
+        """Aggregated values as a float array; missing or non-numeric cells are NaN."""
+        numpy = require_numpy()
+
+        def as_float(value: Any) -> float:
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return float("nan")
+
+        values: np.ndarray = numpy.array(
+            [[as_float(v) for v in row] for row in self.aggregated_value], dtype=float
+        )
+        return values.reshape(self.shape)
+
+    def latency_array(self) -> np.ndarray:
+        """Per-cell latency in seconds."""
+        numpy = require_numpy()
+        latencies: np.ndarray = numpy.array(self.latency_seconds, dtype=float)
+        return latencies.reshape(self.shape)
+
+
+async def query_engine_matrix(
+    session: AsyncSession,
+    engines: Sequence[str],
+    queries: Sequence[str],
+    *,
+    config: QueryEngineTaskConfig | None = None,
+    concurrency: int = 8,
+    timeout: float | None = None,
+) -> QueryEngineMatrixResult:
+    """Run the Query Engine task for every (query, engine) pair with bounded concurrency.
+
+    Identical (engine, query) cells are executed once and shared, so repeated
+    queries or engines in the input cost nothing extra.
+
+    Parameters
+    ----------
+    session: AsyncSession
+        Authenticated session used to run the tasks.
+    engines: Sequence[str]
+        Engine names (`adp_queryEngine_engineName`).
+    queries: Sequence[str]
+        Engine queries (`adp_queryEngine_engineQuery`).
+    config: QueryEngineTaskConfig | None
+        Template for all other task settings (credentials, field name, ...).
+    concurrency: int, default 8
+        Maximum number of tasks in flight.
+    timeout: float | None
+        Optional per-task timeout in seconds.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    template = config or QueryEngineTaskConfig()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    unique_cells = list(dict.fromkeys((e, q) for q in queries for e in engines))
+    outcomes: dict[tuple[str, str], tuple[QueryEngineResult | None, float, str | None]] = {}
+
+    async def run_cell(engine: str, query: str) -> None:
+        cell_config = template.model_copy(
+            update={
+                "adp_queryEngine_engineName": engine,
+                "adp_queryEngine_engineQuery": query,
+            }
+        )
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                result = await session.query_engine(cell_config, timeout=timeout)
+                error = None
+            except Exception as e:
+                logger.debug("Query Engine failed for %s / %r: %s", engine, query, e)
+                result, error = None, str(e)
+            outcomes[(engine, query)] = (result, time.perf_counter() - started, error)
+
+    await asyncio.gather(*(run_cell(e, q) for e, q in unique_cells))
+
+    matrix = QueryEngineMatrixResult(engines=list(engines), queries=list(queries))
+    for query in queries:
+        counts, values, latencies, errors = [], [], [], []
+        for engine in engines:
+            result, latency, error = outcomes[(engine, query)]
+            counts.append(result.adp_query_engine_documents_count if result else None)
+            values.append(result.adp_query_engine_aggregated_value if result else None)
+            latencies.append(latency)
+            errors.append(error)
+        matrix.documents_count.append(counts)
+        matrix.aggregated_value.append(values)
+        matrix.latency_seconds.append(latencies)
+        matrix.errors.append(errors)
+    return matrix
+
+
+__all__ = ["QueryEngineMatrixResult", "query_engine_matrix"]
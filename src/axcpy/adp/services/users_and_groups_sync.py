@@ -0,0 +1,357 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterator, Mapping, Sequence
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from axcpy.adp.models.manage_users_and_groups import (
+    GroupDefinition,
+    ManageUsersAndGroupsResult,
+    ManageUsersAndGroupsTaskConfig,
+    UserDefinition,
+    UsersAndGroups,
+    UserToGroup,
+)
+
+from .async_session import AsyncSession
+from .session import Session
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 200
+
+
+class UsersAndGroupsChangeSet(BaseModel):
+    """Minimal set of Manage Users and Groups definitions needed to reach a desired state.
+
+    Changes are grouped by the order in which they have to be submitted:
+    creations first (so that assignments can reference them), then membership
+    changes, then removals (so that no assignment points at a removed principal).
+    """
+
+    users_to_create: list[UserDefinition] = Field(default_factory=list)
+    groups_to_create: list[GroupDefinition] = Field(default_factory=list)
+    assignments_to_add: list[UserToGroup] = Field(default_factory=list)
+    assignments_to_remove: list[UserToGroup] = Field(default_factory=list)
+    users_to_remove: list[UserDefinition] = Field(default_factory=list)
+    groups_to_remove: list[GroupDefinition] = Field(default_factory=list)
+
+    def __len__(self) -> int:
+        return (
+            len(self.users_to_create)
+            + len(self.groups_to_create)
+            + len(self.assignments_to_add)
+            + len(self.assignments_to_remove)
+            + len(self.users_to_remove)
+            + len(self.groups_to_remove)
+        )
+
+    def is_empty(self) -> bool:
+        return len(self) == 0
+
+    def to_task_configs(
+        self, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[ManageUsersAndGroupsTaskConfig]:
+        """Yield task configurations carrying at most `batch_size` definitions each.
+
+        Phases are never mixed inside one task so that the server always sees
+        creations before assignments and assignments before removals.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        phases: list[Sequence[tuple[str, BaseModel]]] = [
+            [("user", d) for d in self.users_to_create]
+            + [("group", d) for d in self.groups_to_create],
+            [("assignment", d) for d in self.assignments_to_remove]
+            + [("assignment", d) for d in self.assignments_to_add],
+            [("user", d) for d in self.users_to_remove]
+            + [("group", d) for d in self.groups_to_remove],
+        ]
+        for phase in phases:
+            for start in range(0, len(phase), batch_size):
+                chunk = phase[start : start + batch_size]
+                definitions: dict[str, list[dict[str, Any]]] = {
+                    "user": [],
+                    "group": [],
+                    "assignment": [],
+                }
+                for kind, definition in chunk:
+                    definitions[kind].append(definition.model_dump(by_alias=True))
+                yield ManageUsersAndGroupsTaskConfig(
+                    adp_manageUsersAndGroups_userDefinition=definitions["user"],
+                    adp_manageUsersAndGroups_groupDefinition=definitions["group"],
+                    adp_manageUsersAndGroups_assignmentUserToGroup=definitions["assignment"],
+                )
+
+
+def _existing_users(state: UsersAndGroups, *, only_existent: bool) -> dict[str, bool]:
+    """Map user name -> external flag, skipping users the server reports as non-existent."""
+    return {
+        (user.Name or key): user.External
+        for key, user in state.Users.items()
+        if user.Existent or not only_existent
+    }
+
+
+def _existing_groups(state: UsersAndGroups, *, only_existent: bool) -> dict[str, set[str]]:
+    """Map group name -> member user names."""
+    return {
+        (group.Name or key): set(group.Users)
+        for key, group in state.Groups.items()
+        if group.Existent or not only_existent
+    }
+
+
+def diff_users_and_groups(
+    current: UsersAndGroups,
+    desired: UsersAndGroups,
+    *,
+    passwords: Mapping[str, str] | None = None,
+    prune: bool = False,
+) -> UsersAndGroupsChangeSet:
+    """Compute the changes required to turn `current` into `desired`.
+
+    Parameters
+    ----------
+    current: UsersAndGroups
+        State reported by the server (`ManageUsersAndGroupsResult` JSON output).
+        Entries flagged as not `Existent` are treated as absent.
+    desired: UsersAndGroups
+        Target state. `Existent` is ignored; every listed user and group is wanted.
+        Group membership is taken from `Group.Users`.
+    passwords: Mapping[str, str] | None
+        Passwords for users that have to be created. Users that are not listed
+        are created with an empty password (typical for external/LDAP users).
+        Existing users whose external flag changes are re-created; those that
+        become internal users must have a password here.
+    prune: bool, default False
+        If True, users, groups and assignments missing from `desired` are removed,
+        so `desired` must then list the whole directory, including built-in and
+        service accounts. If False, the change set only ever adds.
+
+    Raises
+    ------
+    ValueError
+        If an existing user would become an internal user without a password.
+    """
+    passwords = passwords or {}
+    current_users = _existing_users(current, only_existent=True)
+    current_groups = _existing_groups(current, only_existent=True)
+    desired_users = _existing_users(desired, only_existent=False)
+    desired_groups = _existing_groups(desired, only_existent=False)
+
+    changes = UsersAndGroupsChangeSet()
+
+    missing_passwords = [
+        name
+        for name, external in desired_users.items()
+        if not external
+        and name in current_users
+        and current_users[name] != external
+        and not passwords.get(name)
+    ]
+    if missing_passwords:
+        raise ValueError(
+            "Users becoming internal users need a password: " + ", ".join(sorted(missing_passwords))
+        )
+
+    for name in sorted(desired_users):
+        external = desired_users[name]
+        if name not in current_users or current_users[name] != external:
+            changes.users_to_create.append(
+                UserDefinition.model_validate(
+                    {
+                        "User name": name,
+                        "External user": external,
+                        "Password": passwords.get(name, ""),
+                    }
+                )
+            )
+    for name in sorted(desired_groups.keys() - current_groups.keys()):
+        changes.groups_to_create.append(GroupDefinition.model_validate({"Group name": name}))
+
+    for group in sorted(desired_groups):
+        wanted = desired_groups[group]
+        present = current_groups.get(group, set())
+        for user in sorted(wanted - present):
+            changes.assignments_to_add.append(
+                UserToGroup.model_validate({"Group name": group, "User name": user})
+            )
+
+    if not prune:
+        return changes
+
+    for group in sorted(current_groups):
+        wanted = desired_groups.get(group, set())
+        if group not in desired_groups:
+            # Memberships disappear together with the group itself.
+            continue
+        for user in sorted(current_groups[group] - wanted):
+            changes.assignments_to_remove.append(
+                UserToGroup.model_validate({"Group name": group, "User name": user, "Remove": True})
+            )
+    for name in sorted(current_users.keys() - desired_users.keys()):
+        changes.users_to_remove.append(
+            UserDefinition.model_validate({"User name": name, "Remove": True})
+        )
+    for name in sorted(current_groups.keys() - desired_groups.keys()):
+        changes.groups_to_remove.append(
+            GroupDefinition.model_validate({"Group name": name, "Remove": True})
+        )
+
+    return changes
+
+
+def _read_state_config() -> ManageUsersAndGroupsTaskConfig:
+    """Task configuration that submits no changes and returns the full directory."""
+    return ManageUsersAndGroupsTaskConfig(
+        adp_manageUsersAndGroups_ReturnAllUsersUnderGroup="true",
+    )
+
+
+class UsersAndGroupsReconciler:
+    """Synchronise the ADP user directory with a desired state using minimal changes.
+
+    The current state is read through the Manage Users and Groups task itself
+    (by submitting it without definitions), diffed against the desired state,
+    and only the differences are submitted, split into tasks of at most
+    `batch_size` definitions.
+
+    Parameters
+    ----------
+    session: Session
+        Authenticated session used to run the Manage Users and Groups task.
+    batch_size: int, default 200
+        Maximum number of definitions sent in a single task request.
+    prune: bool, default False
+        Remove users, groups and assignments that are not part of the desired state;
+        the desired state then has to list every account to keep.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        prune: bool = False,
+    ) -> None:
+        self._session = session
+        self.batch_size = batch_size
+        self.prune = prune
+
+    def read_state(self, *, timeout: float | None = None) -> UsersAndGroups:
+        """Return the users and groups currently known to the server."""
+        result = self._session.manage_users_and_groups(_read_state_config(), timeout=timeout)
+        return result.adp_manageUsersAndGroups_json_output
+
+    def plan(
+        self,
+        desired: UsersAndGroups,
+        *,
+        passwords: Mapping[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> UsersAndGroupsChangeSet:
+        """Read the current state and return the changes needed to reach `desired`."""
+        current = self.read_state(timeout=timeout)
+        return diff_users_and_groups(current, desired, passwords=passwords, prune=self.prune)
+
+    def apply(
+        self,
+        changes: UsersAndGroupsChangeSet,
+        *,
+        timeout: float | None = None,
+    ) -> list[ManageUsersAndGroupsResult]:
+        """Submit a change set in batches; returns one result per submitted task."""
+        results = []
+        for config in changes.to_task_configs(self.batch_size):
+            results.append(self._session.manage_users_and_groups(config, timeout=timeout))
+        return results
+
+    def sync(
+        self,
+        desired: UsersAndGroups,
+        *,
+        passwords: Mapping[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> UsersAndGroupsChangeSet:
+        """Plan and apply in one go. Returns the change set that was submitted."""
+        changes = self.plan(desired, passwords=passwords, timeout=timeout)
+        if changes.is_empty():
+            logger.debug("Users and groups already in sync, nothing to submit")
+            return changes
+        logger.debug("Submitting %d user/group changes", len(changes))
+        self.apply(changes, timeout=timeout)
+        return changes
+
+
+class AsyncUsersAndGroupsReconciler:
+    """Async variant of `UsersAndGroupsReconciler` built on `AsyncSession`."""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        prune: bool = False,
+    ) -> None:
+        self._session = session
+        self.batch_size = batch_size
+        self.prune = prune
+
+    async def read_state(self, *, timeout: float | None = None) -> UsersAndGroups:
+        """Return the users and groups currently known to the server."""
+        result = await self._session.manage_users_and_groups(_read_state_config(), timeout=timeout)
+        return result.adp_manageUsersAndGroups_json_output
+
+    async def plan(
+        self,
+        desired: UsersAndGroups,
+        *,
+        passwords: Mapping[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> UsersAndGroupsChangeSet:
+        """Read the current state and return the changes needed to reach `desired`."""
+        current = await self.read_state(timeout=timeout)
+        return diff_users_and_groups(current, desired, passwords=passwords, prune=self.prune)
+
+    async def apply(
+        self,
+        changes: UsersAndGroupsChangeSet,
+        *,
+        timeout: float | None = None,
+    ) -> list[ManageUsersAndGroupsResult]:
+        """Submit a change set in batches; returns one result per submitted task.
+
+        Batches are sent one after another since later phases depend on earlier ones.
+        """
+        results = []
+        for config in changes.to_task_configs(self.batch_size):
+            results.append(await self._session.manage_users_and_groups(config, timeout=timeout))
+        return results
+
+    async def sync(
+        self,
+        desired: UsersAndGroups,
+        *,
+        passwords: Mapping[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> UsersAndGroupsChangeSet:
+        """Plan and apply in one go. Returns the change set that was submitted."""
+        changes = await self.plan(desired, passwords=passwords, timeout=timeout)
+        if changes.is_empty():
+            logger.debug("Users and groups already in sync, nothing to submit")
+            return changes
+        logger.debug("Submitting %d user/group changes", len(changes))
+        await self.apply(changes, timeout=timeout)
+        return changes
+
+
+__all__ = [
+    "UsersAndGroupsChangeSet",
+    "UsersAndGroupsReconciler",
+    "AsyncUsersAndGroupsReconciler",
+    "diff_users_and_groups",
+]
@@ -1,10 +1,18 @@
 """SearchWebAPI CLI commands."""
 
+import asyncio
+from typing import TYPE_CHECKING, Literal
+
 import typer
 from rich.console import Console
 
+if TYPE_CHECKING:
+    from axcpy.searchwebapi.services import ExportReport
+
 search_app = typer.Typer(name="search", help="SearchWebAPI commands")
 console = Console()
+# Progress goes to stderr so that `--output -` can be piped.
+err_console = Console(stderr=True)
 
 
 @search_app.command()
@@ -19,6 +27,153 @@ def query(q: str) -> None:
 
 
 @search_app.command()
-def export() -> None:
-    """Export search results."""
-    console.print("[yellow]Export coming soon...[/yellow]")
+def export(
+    query: str = typer.Argument("*", help="Query expression"),
+    project: str = typer.Option(..., "--project", "-P", help="Project ID"),
+    collection: str = typer.Option(..., "--collection", "-c", help="Collection ID"),
+    fields: list[str] = typer.Option(
+        [],
+        "--fields",
+        "-f",
+        help="Fields to export (comma-separated or repeated); 'body' adds content",
+    ),
+    output: str = typer.Option("-", "--output", "-o", help="Output file, '-' for stdout"),
+    format: str | None = typer.Option(
+        None, "--format", help="ndjson or csv (default: from the output file suffix)"
+    ),
+    order: str | None = typer.Option(
+        None, "--order", help="Order criteria, e.g. rm_modificationdate:asc"
+    ),
+    join_restriction: str | None = typer.Option(
+        None, "--join-restriction", help="Join restriction"
+    ),
+    language: str | None = typer.Option(None, "--language", help="Query language"),
+    resume: bool = typer.Option(
+        False, "--resume", help="Append after the last record already in the output file"
+    ),
+    page_size: int = typer.Option(1000, "--page-size", help="Records per request (max 1000)"),
+    prefetch: int = typer.Option(4, "--prefetch", help="Pages fetched ahead of writing"),
+    max_records: int | None = typer.Option(None, "--max-records", help="Stop after N records"),
+    validate: bool = typer.Option(
+        True, "--validate/--no-validate", help="Check the fields against the collection schema"
+    ),
+    base_url: str = typer.Option(
+        ..., "--base-url", "-b", help="SearchWebAPI base URL", envvar="SWA_BASE_URL"
+    ),
+    username: str = typer.Option(
+        ..., "--username", "-u", help="Authentication username", envvar="SWA_USERNAME"
+    ),
+    password: str = typer.Option(
+        ...,
+        "--password",
+        "-p",
+        help="Authentication password",
+        envvar="SWA_PASSWORD",
+        hide_input=True,
+    ),
+    ignore_tls: bool = typer.Option(
+        False, "--ignore-tls", help="Ignore TLS certificate verification"
+    ),
+) -> None:
+    """Export search results to NDJSON or CSV, streaming page by page.
+
+    Example:
+        axcpy search export "york" -P project -c documents -f rm_title,rm_author
+            -o york.csv --order rm_modificationdate:asc --resume
+    """
+    if format not in (None, "ndjson", "csv"):
+        err_console.print(f"[red]Error: unsupported format {format!r}, use ndjson or csv[/red]")
+        raise typer.Exit(1)
+    if resume and output == "-":
+        err_console.print("[red]Error: --resume requires an output file[/red]")
+        raise typer.Exit(1)
+    attributes = [f.strip() for value in fields for f in value.split(",") if f.strip()]
+
+    try:
+        report = asyncio.run(
+            _export(
+                query=query,
+                project=project,
+                collection=collection,
+                attributes=attributes,
+                output=output,
+                fmt=format,  # type: ignore[arg-type]
+                order=order,
+                join_restriction=join_restriction,
+                language=language,
+                resume=resume,
+                page_size=page_size,
+                prefetch=prefetch,
+                max_records=max_records,
+                validate=validate,
+                base_url=base_url,
+                username=username,
+                password=password,
+                ignore_tls=ignore_tls,
+            )
+        )
+    except Exception as e:
+        err_console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+    err_console.print(
+        f"[green]Exported {report.records} records[/green] "
+        f"({report.records_per_second:.0f} records/s, last rank {report.last_rank})"
+    )
+
+
+async def _export(
+    *,
+    query: str,
+    project: str,
+    collection: str,
+    attributes: list[str],
+    output: str,
+    fmt: Literal["ndjson", "csv"] | None,
+    order: str | None,
+    join_restriction: str | None,
+    language: str | None,
+    resume: bool,
+    page_size: int,
+    prefetch: int,
+    max_records: int | None,
+    validate: bool,
+    base_url: str,
+    username: str,
+    password: str,
+    ignore_tls: bool,
+) -> "ExportReport":
+    # imported here so the other commands start without the kiota stack
+    from axcpy.searchwebapi import SearchWebApiSession
+    from axcpy.searchwebapi.services import ExportReport, SchemaCache, SearchExport
+
+    def progress(report: ExportReport) -> None:
+        total = f"/{report.number_results}" if report.number_results is not None else ""
+        err_console.print(
+            f"{report.resumed_after_rank + report.records}{total} records, "
+            f"{report.records_per_second:.0f} records/s"
+        )
+
+    async with SearchWebApiSession(base_url, username, password, ignore_tls=ignore_tls) as swa:
+        body = "body" in attributes
+        fields = [a for a in attributes if a != "body"]
+        if validate and fields:
+            projection = await SchemaCache(swa.client).projection(
+                project, collection, fields, folder_names=False
+            )
+            fields = projection.fields.split(",") if projection.fields else []
+        exporter = SearchExport(
+            swa.client,
+            project,
+            collection,
+            query=query,
+            fields=fields,
+            body=body,
+            order=order,
+            join_restriction=join_restriction,
+            language=language,
+            page_size=page_size,
+            prefetch=prefetch,
+            max_records=max_records,
+        )
+        return await exporter.write(output, fmt, resume=resume, on_progress=progress)
@@ -1,5 +1,42 @@
-"""SearchWebAPI Client Library (Kiota-generated)."""
+"""SearchWebAPI Client Library (Kiota-generated).
 
-from axcpy.searchwebapi.generated.search_web_api_client import SearchWebApiClient
+`SearchWebApiClient` and `SearchWebApiSession` are imported on first access:
+they pull in the kiota packages of the ``searchwebapi`` extra.
+"""
 
-__all__ = ["SearchWebApiClient"]
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from axcpy.searchwebapi.generated.search_web_api_client import SearchWebApiClient
+    from axcpy.searchwebapi.services.session import SearchWebApiSession
+
+_LAZY = {
+    "SearchWebApiClient": "axcpy.searchwebapi.generated.search_web_api_client",
+    "SearchWebApiSession": "axcpy.searchwebapi.services.session",
+}
+
+__all__ = ["SearchWebApiClient", "SearchWebApiSession"]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        module = importlib.import_module(module_name)
+    except ModuleNotFoundError as e:
+        if e.name is None or not e.name.startswith("kiota"):
+            raise
+        raise ImportError(
+            f"{name} requires the kiota packages. Install with: pip install axcpy[searchwebapi]"
+        ) from e
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY})
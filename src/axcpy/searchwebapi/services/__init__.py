@@ -0,0 +1,109 @@
+"""SearchWebAPI Services module.
+
+This module contains hand-written helpers built on top of the generated client.
+"""
+
+from axcpy.searchwebapi.services.cache import CachedSearch, SearchCache, SearchKey
+from axcpy.searchwebapi.services.cached_searches import (
+    CachedSearchReport,
+    CachedSearchScope,
+    new_trace_token,
+)
+from axcpy.searchwebapi.services.changes import ChangeWriter, merge_changes
+from axcpy.searchwebapi.services.concurrency import bounded_map
+from axcpy.searchwebapi.services.decoding import (
+    decode_model,
+    decode_search_result,
+    record_rows,
+)
+from axcpy.searchwebapi.services.downloads import BinaryDownloader, DownloadResult
+from axcpy.searchwebapi.services.endpoints import CollectionEndpoints, collection_endpoints
+from axcpy.searchwebapi.services.export import ExportReport, SearchExport
+from axcpy.searchwebapi.services.facets import FacetScanner, FacetValues
+from axcpy.searchwebapi.services.highlighting import (
+    DocumentHighlighter,
+    HighlightedContent,
+    HighlightExpressionCache,
+    HitTable,
+    InDocumentSearchBatch,
+    fetch_highlight_expression,
+    highlight_expressions,
+)
+from axcpy.searchwebapi.services.ingestion import BulkIngestion, IngestionReport, IngestionState
+from axcpy.searchwebapi.services.insertion import InsertDocument, InsertResult, MultipartInserter
+from axcpy.searchwebapi.services.measures import (
+    MeasureArray,
+    MeasureAxis,
+    SparseMeasure,
+    fetch_measure_array,
+    measure_array,
+)
+from axcpy.searchwebapi.services.paging import RecordPager, iter_records, join_values
+from axcpy.searchwebapi.services.schema import (
+    CollectionSchema,
+    FieldProjection,
+    SchemaCache,
+    fetch_collection_schema,
+)
+from axcpy.searchwebapi.services.session import (
+    SearchWebApiSession,
+    SessionAuthenticationProvider,
+    SessionHttpClient,
+)
+from axcpy.searchwebapi.services.snapshot import SnapshotCursor, search_result_range
+from axcpy.searchwebapi.services.tokens import SearchTokenLease, SearchTokenPool
+
+__all__ = [
+    "BinaryDownloader",
+    "BulkIngestion",
+    "CachedSearch",
+    "CachedSearchReport",
+    "CachedSearchScope",
+    "ChangeWriter",
+    "CollectionEndpoints",
+    "CollectionSchema",
+    "DocumentHighlighter",
+    "DownloadResult",
+    "ExportReport",
+    "FacetScanner",
+    "FacetValues",
+    "FieldProjection",
+    "HighlightExpressionCache",
+    "HighlightedContent",
+    "HitTable",
+    "InDocumentSearchBatch",
+    "IngestionReport",
+    "IngestionState",
+    "InsertDocument",
+    "InsertResult",
+    "MeasureArray",
+    "MeasureAxis",
+    "MultipartInserter",
+    "RecordPager",
+    "SchemaCache",
+    "SearchCache",
+    "SearchExport",
+    "SearchKey",
+    "SearchTokenLease",
+    "SearchTokenPool",
+    "SearchWebApiSession",
+    "SessionAuthenticationProvider",
+    "SessionHttpClient",
+    "SnapshotCursor",
+    "SparseMeasure",
+    "bounded_map",
+    "collection_endpoints",
+    "decode_model",
+    "decode_search_result",
+    "fetch_collection_schema",
+    "fetch_highlight_expression",
+    "fetch_measure_array",
+    "highlight_expressions",
+    "iter_records",
+    "join_values",
+    "measure_array",
+    "merge_changes",
+    "new_trace_token",
+    "record_rows",
+    "search_result_range",
+]
@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from typing import Any, NamedTuple, cast
+
+from axcpy.searchwebapi.generated.models.dimension_request import DimensionRequest
+from axcpy.searchwebapi.generated.models.search_result import SearchResult
+from axcpy.searchwebapi.generated.search_web_api_client import SearchWebApiClient
+
+from .decoding import decode_search_result
+from .endpoints import RecordsQueryParameters, collection_endpoints
+from .measures import MeasureArray, fetch_measure_array
+from .paging import join_values
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class SearchKey(NamedTuple):
+    """Fingerprint of a read request; `options` holds endpoint-specific parameters."""
+
+    endpoint: str
+    project_id: str
+    collection_id: str
+    query: str
+    join_restriction: str | None = None
+    language: str | None = None
+    order: str | None = None
+    fields: str | None = None
+    page: int | None = None
+    options: tuple[Any, ...] = ()
+
+
+class SearchCache:
+    """LRU cache with time-to-live for decoded search results.
+
+    Entries are keyed by `SearchKey` and expire `ttl` seconds after they were
+    stored; the least recently used entry is evicted beyond `max_entries`.
+    `invalidate` drops the entries of a collection (or a whole project) and
+    makes results of requests still in flight at that moment uncacheable, so a
+    search racing with a change never repopulates the cache with stale data.
+    While a collection is suspended (see `suspend`), its results are neither
+    served from nor stored in the cache.
+
+    The cache does not observe requests itself: only writers given the cache
+    (`ChangeWriter`, `BulkIngestion`, `MultipartInserter`) invalidate it when
+    they modify a collection. After any other write, e.g. a raw client call or
+    another process changing the collection, cached results stay stale for up
+    to `ttl` seconds unless you call `invalidate`.
+
+    Cached values are shared between callers and must not be modified.
+
+    Parameters
+    ----------
+    max_entries: int, default 1024
+        Maximum number of cached results.
+    ttl: float | None, default 60.0
+        Seconds an entry stays valid; None keeps entries until evicted.
+    clock: Callable[[], float]
+        Time source (seconds), `time.monotonic` by default.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        ttl: float | None = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[SearchKey, tuple[float, Any]] = OrderedDict()
+        self._generations: dict[tuple[str, str | None], int] = {}
+        self._in_flight: dict[tuple[SearchKey, tuple[int, int]], asyncio.Future[Any]] = {}
+        self._suspended: dict[tuple[str, str], int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: SearchKey) -> bool:
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def _generation(self, key: SearchKey) -> tuple[int, int]:
+        return (
+            self._generations.get((key.project_id, key.collection_id), 0),
+            self._generations.get((key.project_id, None), 0),
+        )
+
+    def _is_suspended(self, key: SearchKey) -> bool:
+        return bool(self._suspended) and (key.project_id, key.collection_id) in self._suspended
+
+    def get(self, key: SearchKey, default: Any = None, *, count: bool = True) -> Any:
+        """Return the cached value for `key`, or `default` if absent or expired."""
+        entry = self._entries.get(key) if not self._is_suspended(key) else None
+        if entry is not None and (self.ttl is None or self._clock() - entry[0] < self.ttl):
+            self._entries.move_to_end(key)
+            if count:
+                self.hits += 1
+            return entry[1]
+        if entry is not None:
+            del self._entries[key]
+        if count:
+            self.misses += 1
+        return default
+
+    def put(self, key: SearchKey, value: Any) -> None:
+        if self._is_suspended(key):
+            return
+        self._entries[key] = (self._clock(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, project_id: str, collection_id: str | None = None) -> int:
+        """Drop the entries of a collection (all collections if None); returns the count."""
+        scope = (project_id, collection_id)
+        self._generations[scope] = self._generations.get(scope, 0) + 1
+        stale = [
+            key
+            for key in self._entries
+            if key.project_id == project_id
+            and (collection_id is None or key.collection_id == collection_id)
+        ]
+        for key in stale:
+            del self._entries[key]
+        logger.debug("Invalidated %d cached results of %s/%s", len(stale), *scope)
+        return len(stale)
+
+    def suspend(self, project_id: str, collection_id: str) -> None:
+        """Invalidate a collection and stop caching its results until `resume`.
+
+        Used while the server applies changes asynchronously, when any result
+        could still change. Calls nest: caching resumes after as many `resume`
+        calls as there were `suspend` calls.
+        """
+        scope = (project_id, collection_id)
+        self._suspended[scope] = self._suspended.get(scope, 0) + 1
+        self.invalidate(project_id, collection_id)
+
+    def resume(self, project_id: str, collection_id: str) -> None:
+        """Undo one `suspend` of a collection."""
+        scope = (project_id, collection_id)
+        remaining = self._suspended.get(scope, 0) - 1
+        if remaining > 0:
+            self._suspended[scope] = remaining
+        else:
+            self._suspended.pop(scope, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get_or_fetch[T](
+        self, key: SearchKey, fetch: Callable[[], Awaitable[T]], *, store: bool = True
+    ) -> T:
+        """Return the cached value or await `fetch` and cache its result.
+
+        Concurrent calls for the same key share a single `fetch`. With
+        ``store=False`` only that sharing applies: the cache is neither read
+        nor written, for callers that keep the results themselves.
+        """
+        if store:
+            cached = self.get(key, _MISSING)
+            if cached is not _MISSING:
+                return cast(T, cached)
+        generation = self._generation(key)
+        flight_key = (key, generation)
+        pending = self._in_flight.get(flight_key)
+        if pending is not None:
+            await asyncio.wait([pending])
+            if pending.cancelled():  # the caller that started the fetch was cancelled
+                return await self.get_or_fetch(key, fetch, store=store)
+            return cast(T, pending.result())
+
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._in_flight[flight_key] = future
+        try:
+            value = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else waits
+            raise
+        else:
+            future.set_result(value)
+            if store and self._generation(key) == generation:
+                self.put(key, value)
+            return value
+        finally:
+            del self._in_flight[flight_key]
+
+
+class CachedSearch:
+    """Cached ``/records`` and ``/measures`` reads through a `SearchCache`.
+
+    Parameters
+    ----------
+    client: SearchWebApiClient
+        Client of an authenticated session.
+    cache: SearchCache | None
+        Cache to use; a new one with default settings if None.
+
+    Example
+    -------
+    >>> cache = SearchCache(ttl=30)
+    >>> search = CachedSearch(swa.client, cache)
+    >>> page = await search.records("p", "documents", query="york", page=1)
+    >>> async with ChangeWriter(swa.client, "p", "documents", cache=cache) as writer:
+    ...     await writer.add("york", tag)  # drops the cached "documents" results
+    """
+
+    def __init__(self, client: SearchWebApiClient, cache: SearchCache | None = None) -> None:
+        self._client = client
+        self.cache = cache if cache is not None else SearchCache()
+
+    async def records(
+        self,
+        project_id: str,
+        collection_id: str,
+        *,
+        query: str = "*",
+        fields: str | Sequence[str] | None = None,
+        folder_fields: str | Sequence[str] | None = None,
+        body: bool = False,
+        order: str | None = None,
+        join_restriction: str | None = None,
+        language: str | None = None,
+        page: int = 1,
+        page_size: int = 100,
+    ) -> SearchResult:
+        """One page of ``GET /records``, decoded."""
+        params = RecordsQueryParameters(
+            query=query,
+            fields=join_values(fields),
+            folder_fields=join_values(folder_fields),
+            body=body,
+            order=order,
+            join_restriction=join_restriction,
+            language=language,
+            limit=page_size,
+            page=page,
+        )
+        key = SearchKey(
+            "records",
+            project_id,
+            collection_id,
+            query,
+            join_restriction,
+            language,
+            order,
+            params.fields,
+            page,
+            (params.folder_fields, body, page_size),
+        )
+        endpoints = collection_endpoints(self._client, project_id, collection_id)
+
+        async def fetch() -> SearchResult:
+            content = await endpoints.get_records(params)
+            return decode_search_result(content or b"{}")
+
+        return await self.cache.get_or_fetch(key, fetch)
+
+    async def measures(
+        self,
+        project_id: str,
+        collection_id: str,
+        dimensions: Sequence[DimensionRequest],
+        *,
+        query: str = "*",
+        measure_type: str | Mapping[str, Any] | None = None,
+        join_restriction: str | None = None,
+        language: str | None = None,
+    ) -> MeasureArray:
+        """``POST /measures`` as a `MeasureArray` (see `fetch_measure_array`)."""
+        if isinstance(measure_type, Mapping):
+            measure_type = json.dumps(measure_type, sort_keys=True)
+        dimension_key = tuple(
+            json.dumps({k: v for k, v in vars(d).items() if v}, sort_keys=True, default=str)
+            for d in dimensions
+        )
+        key = SearchKey(
+            "measures",
+            project_id,
+            collection_id,
+            query,
+            join_restriction,
+            language,
+            options=(measure_type, dimension_key),
+        )
+        return await self.cache.get_or_fetch(
+            key,
+            lambda: fetch_measure_array(
+                self._client,
+                project_id,
+                collection_id,
+                dimensions,
+                query=query,
+                measure_type=measure_type,
+                join_restriction=join_restriction,
+                language=language,
+            ),
+        )
+
+
+__all__ = ["CachedSearch", "SearchCache", "SearchKey"]
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import logging
+import re
+import secrets
+import time
+from collections.abc import Sequence
+from contextvars import Token
+from types import TracebackType
+
+from kiota_abstractions.base_request_configuration import RequestConfiguration
+from pydantic import BaseModel, Field
+
+from axcpy.searchwebapi.generated.projects.item.collections.item.cached_searches.cached_searches_request_builder import (  # noqa: E501
+    CachedSearchesRequestBuilder,
+)
+from axcpy.searchwebapi.generated.search_web_api_client import SearchWebApiClient
+
+from .decoding import loads
+from .session import trace_token
+
+logger = logging.getLogger(__name__)
+
+_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+_LABEL = re.compile(r"[^A-Za-z0-9_-]+")
+# Trace ids per DELETE request, keeping the query string short.
+_DROP_BATCH = 100
+
+
+def _base36(value: int) -> str:
+    digits = []
+    while True:
+        value, digit = divmod(value, 36)
+        digits.append(_DIGITS[digit])
+        if not value:
+            return "".join(reversed(digits))
+
+
+def new_trace_token(label: str | None = None) -> str:
+    """Create a unique SWA-MDC-TOKEN of the form ``SLONG.SLONG[.label]``."""
+    token = f"{_base36(time.time_ns() // 1_000_000)}.{_base36(secrets.randbits(62))}"
+    if label:
+        token += "." + _LABEL.sub("_", label)
+    return token
+
+
+class CachedSearchReport(BaseModel):
+    """Server-side cached searches created inside one `CachedSearchScope`."""
+
+    trace_token: str
+    label: str | None = None
+    created: dict[str, int] = Field(default_factory=dict)
+    dropped: int = 0
+
+    @property
+    def total_created(self) -> int:
+        return sum(self.created.values())
+
+
+class CachedSearchScope:
+    """Tag the searches of a workload with a trace id and drop their caches afterwards.
+
+    The SearchWebAPI keeps a cached search result per query so that paging and
+    follow-up requests do not re-execute it; batch jobs that never release them
+    inflate mindserver memory. Inside the scope every request of the current
+    task (and of tasks started from it) sends the scope's SWA-MDC-TOKEN, which
+    the server stores as creation trace id of each cached search. The caches
+    stay available for reuse until the scope exits; then exactly the cached
+    searches created inside the scope are dropped via
+    ``DELETE cachedSearches?creationTraceIds=``, leaving other workloads of the
+    session untouched. `report` tells how many cached searches were created per
+    collection (searches the server already evicted on its own are not counted).
+
+    Parameters
+    ----------
+    client: SearchWebApiClient
+        Client of an authenticated `SearchWebApiSession`.
+    project_id: str
+        Project searched by the workload.
+    collection_ids: str | Sequence[str]
+        Collection(s) searched by the workload.
+    label: str | None
+        Workload name appended to the trace id (visible in mindserver logs).
+    drop_on_exit: bool, default True
+        Drop the scope's cached searches when the scope exits.
+
+    Example
+    -------
+    >>> async with CachedSearchScope(swa.client, "p", "documents", label="privscreen") as scope:
+    ...     async for record in RecordPager(swa.client, "p", "documents", query=screen):
+    ...         ...
+    >>> print(scope.report.total_created, "cached searches dropped")
+    """
+
+    def __init__(
+        self,
+        client: SearchWebApiClient,
+        project_id: str,
+        collection_ids: str | Sequence[str],
+        *,
+        label: str | None = None,
+        drop_on_exit: bool = True,
+    ) -> None:
+        if isinstance(collection_ids, str):
+            collection_ids = [collection_ids]
+        project = client.projects.by_project_id(project_id)
+        self._builders = {
+            c: project.collections.by_collection_id(c).cached_searches for c in collection_ids
+        }
+        self.trace_token = new_trace_token(label)
+        self.drop_on_exit = drop_on_exit
+        self.report = CachedSearchReport(trace_token=self.trace_token, label=label)
+        self._context_token: Token[str | None] | None = None
+
+    def _owned(self, trace_id: str | None) -> bool:
+        return trace_id is not None and trace_id.startswith(self.trace_token)
+
+    async def cached_searches(self, collection_id: str) -> list[str]:
+        """Creation trace ids of the scope's cached searches in `collection_id`."""
+        content = await self._builders[collection_id].get()
+        descriptions = loads(content) if content else []
+        if isinstance(descriptions, dict):  # error response
+            descriptions = []
+        return [
+            d["creationTraceId"]
+            for d in descriptions
+            if isinstance(d, dict) and self._owned(d.get("creationTraceId"))
+        ]
+
+    async def count(self) -> dict[str, int]:
+        """Number of live cached searches of the scope per collection."""
+        return {c: len(await self.cached_searches(c)) for c in self._builders}
+
+    async def drop(self) -> int:
+        """Drop the scope's cached searches in all collections; returns how many."""
+        dropped = 0
+        for collection_id, builder in self._builders.items():
+            trace_ids = await self.cached_searches(collection_id)
+            created = self.report.created
+            created[collection_id] = created.get(collection_id, 0) + len(trace_ids)
+            for i in range(0, len(trace_ids), _DROP_BATCH):
+                batch = trace_ids[i : i + _DROP_BATCH]
+                params = (
+                    CachedSearchesRequestBuilder.CachedSearchesRequestBuilderDeleteQueryParameters(
+                        creation_trace_ids=",".join(batch)
+                    )
+                )
+                await builder.delete(
+                    request_configuration=RequestConfiguration(query_parameters=params)
+                )
+            dropped += len(trace_ids)
+        self.report.dropped += dropped
+        return dropped
+
+    async def __aenter__(self) -> CachedSearchScope:
+        self._context_token = trace_token.set(self.trace_token)
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if self._context_token is not None:
+            trace_token.reset(self._context_token)
+            self._context_token = None
+        if self.drop_on_exit:
+            await self.drop()
+        else:
+            self.report.created = await self.count()
+        logger.info(
+            "Workload %s created %d cached searches %s",
+            self.report.label or self.trace_token,
+            self.report.total_created,
+            self.report.created,
+        )
+
+
+__all__ = ["CachedSearchReport", "CachedSearchScope", "new_trace_token"]
@@ -0,0 +1,396 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Iterable, Sequence
+from contextlib import suppress
+from types import TracebackType
+from typing import TYPE_CHECKING
+
+from kiota_abstractions.base_request_configuration import RequestConfiguration
+
+from axcpy.searchwebapi.generated.models.change_request import ChangeRequest
+from axcpy.searchwebapi.generated.models.change_request_type import ChangeRequest_type
+from axcpy.searchwebapi.generated.models.change_result import ChangeResult
+from axcpy.searchwebapi.generated.models.wait_for_pending_changes_result import (
+    WaitForPendingChangesResult,
+)
+from axcpy.searchwebapi.generated.projects.item.collections.item.records.records_request_builder import (  # noqa: E501
+    RecordsRequestBuilder,
+)
+from axcpy.searchwebapi.generated.search_web_api_client import SearchWebApiClient
+
+from .decoding import decode_model
+from .endpoints import QueueQueryParameters, collection_endpoints
+
+if TYPE_CHECKING:
+    from .cache import SearchCache
+
+logger = logging.getLogger(__name__)
+
+# Successive changes of these types on the same field collapse into one change
+# carrying the union of their folder ids.
+_UNION_TYPES = frozenset(
+    {
+        ChangeRequest_type.ADD_FOLDERS,
+        ChangeRequest_type.REMOVE_FOLDERS,
+        ChangeRequest_type.REMOVE_FOLDERS_AND_BRANCH,
+    }
+)
+# For these types only the last change on a field matters.
+_LAST_WINS_TYPES = frozenset(
+    {
+        ChangeRequest_type.SET_FOLDERS,
+        ChangeRequest_type.SET_TEXT,
+        ChangeRequest_type.SET_TEXTS,
+        ChangeRequest_type.SET_PARENT,
+        ChangeRequest_type.MAKE_ROOT,
+    }
+)
+
+_Signature = tuple[tuple[object, ...], ...]
+
+
+def _union(*folder_lists: list[str] | None) -> list[str]:
+    return list(dict.fromkeys(f for folders in folder_lists for f in folders or ()))
+
+
+def _merge_pair(previous: ChangeRequest, change: ChangeRequest) -> ChangeRequest | None:
+    """Merge `change` into the preceding change on the same field, or return None."""
+    if change.type in _LAST_WINS_TYPES and previous.type == change.type:
+        return change
+    if change.type in _UNION_TYPES and previous.type == change.type:
+        return ChangeRequest(
+            field=change.field,
+            type=change.type,
+            folder_ids=_union(previous.folder_ids, change.folder_ids),
+        )
+    if change.type == ChangeRequest_type.ADD_FOLDERS and previous.type == (
+        ChangeRequest_type.SET_FOLDERS
+    ):
+        return ChangeRequest(
+            field=change.field,
+            type=ChangeRequest_type.SET_FOLDERS,
+            folder_ids=_union(previous.folder_ids, change.folder_ids),
+        )
+    if change.type == ChangeRequest_type.APPEND_TEXT and previous.type in (
+        ChangeRequest_type.APPEND_TEXT,
+        ChangeRequest_type.SET_TEXT,
+    ):
+        return ChangeRequest(
+            field=change.field,
+            type=previous.type,
+            text=(previous.text or "") + (change.text or ""),
+        )
+    return None
+
+
+def merge_changes(changes: Iterable[ChangeRequest]) -> list[ChangeRequest]:
+    """Collapse a sequence of changes for one scope into an equivalent shorter one.
+
+    Changes on different fields are independent; for each field, a change is
+    merged into the previous change on that field when the result is the same,
+    e.g. two ADD_FOLDERS become one with the union of folder ids, a SET_TEXT
+    followed by another SET_TEXT keeps only the second. Changes of other
+    combinations (e.g. ADD_FOLDERS followed by REMOVE_FOLDERS) are kept in order.
+    """
+    merged: list[ChangeRequest] = []
+    last_on_field: dict[str | None, int] = {}
+    for change in changes:
+        index = last_on_field.get(change.field)
+        if index is not None:
+            combined = _merge_pair(merged[index], change)
+            if combined is not None:
+                merged[index] = combined
+                continue
+        last_on_field[change.field] = len(merged)
+        merged.append(change)
+    return merged
+
+
+def _signature(changes: Sequence[ChangeRequest]) -> _Signature:
+    return tuple(
+        (
+            c.type,
+            c.field,
+            tuple(c.folder_ids) if c.folder_ids is not None else None,
+            c.text,
+            tuple(c.texts) if c.texts is not None else None,
+        )
+        for c in changes
+    )
+
+
+def combine_scopes(scopes: Sequence[str]) -> str:
+    """OR-combine scope queries into one query."""
+    if len(scopes) == 1:
+        return scopes[0]
+    return " OR ".join(f"({scope})" for scope in scopes)
+
+
+class ChangeWriter:
+    """Write-behind batcher for ``PUT /records`` change requests.
+
+    Changes are queued per scope (the query selecting the documents they apply
+    to) and sent in batches: changes of one scope are merged with
+    `merge_changes`, and scopes that end up with identical change lists are
+    OR-combined into a single request. Batches are flushed when `max_pending`
+    changes are queued, every `flush_interval` seconds while the writer is
+    running, and on `flush`. Requests use ``blockUntilComplete=false``; call
+    `flush_and_wait` when later searches must see the changes.
+
+    Changes of one scope keep their order. Requests for different scopes are
+    sent concurrently, so overlapping scopes should not carry conflicting
+    changes within one flush.
+
+    Parameters
+    ----------
+    client: SearchWebApiClient
+        Client of an authenticated session.
+    project_id: str
+        Target project.
+    collection_id: str
+        Target collection.
+    max_pending: int, default 1000
+        Number of queued changes that triggers a flush.
+    max_scopes_per_request: int, default 100
+        Maximum number of scope queries OR-combined into one request.
+    flush_interval: float | None, default 1.0
+        Seconds between background flushes while running; None disables them.
+    concurrency: int, default 4
+        Maximum number of requests in flight during a flush.
+    language: str | None
+        Language used to interpret scope queries.
+    cache: SearchCache | None
+        Search cache whose entries for the collection are invalidated after
+        every flush. Changes are applied asynchronously, so the collection is
+        also suspended in the cache (not cached at all) from the first flush
+        until `flush_and_wait` reports the change queue drained; call it before
+        relying on cached searches again.
+
+    Example
+    -------
+    >>> async with ChangeWriter(swa.client, "p", "documents") as writer:
+    ...     for scope in reviewed_document_queries:
+    ...         await writer.add(scope, tag_responsive)
+    ...     await writer.flush_and_wait()
+    """
+
+    def __init__(
+        self,
+        client: SearchWebApiClient,
+        project_id: str,
+        collection_id: str,
+        *,
+        max_pending: int = 1000,
+        max_scopes_per_request: int = 100,
+        flush_interval: float | None = 1.0,
+        concurrency: int = 4,
+        language: str | None = None,
+        cache: SearchCache | None = None,
+    ) -> None:
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        if max_scopes_per_request < 1:
+            raise ValueError("max_scopes_per_request must be at least 1")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        collection = client.projects.by_project_id(project_id).collections.by_collection_id(
+            collection_id
+        )
+        self._records = collection.records
+        self._endpoints = collection_endpoints(client, project_id, collection_id)
+        self.project_id = project_id
+        self.collection_id = collection_id
+        self.cache = cache
+        self._cache_suspended = False
+        self.max_pending = max_pending
+        self.max_scopes_per_request = max_scopes_per_request
+        self.flush_interval = flush_interval
+        self.concurrency = concurrency
+        self.language = language
+        self._pending: dict[str, list[ChangeRequest]] = {}
+        self._pending_count = 0
+        self._flush_lock = asyncio.Lock()
+        self._timer: asyncio.Task[None] | None = None
+        self._error: BaseException | None = None
+        self.changes_submitted = 0
+        self.requests_sent = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of queued changes not yet sent."""
+        return self._pending_count
+
+    def _raise_background_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    async def add(self, scope: str, *changes: ChangeRequest) -> None:
+        """Queue changes for the documents matching the query `scope`."""
+        self._raise_background_error()
+        for change in changes:
+            if change.type == ChangeRequest_type.SET_CONTENT:
+                raise ValueError("SET_CONTENT requires a multipart request and cannot be batched")
+        self._pending.setdefault(scope, []).extend(changes)
+        self._pending_count += len(changes)
+        self.changes_submitted += len(changes)
+        if self._pending_count >= self.max_pending:
+            await self.flush()
+
+    def _batches(
+        self, pending: dict[str, list[ChangeRequest]]
+    ) -> list[tuple[list[str], list[ChangeRequest]]]:
+        groups: dict[_Signature, tuple[list[ChangeRequest], list[str]]] = {}
+        for scope, changes in pending.items():
+            merged = merge_changes(changes)
+            groups.setdefault(_signature(merged), (merged, []))[1].append(scope)
+        batches = []
+        for merged, scopes in groups.values():
+            for i in range(0, len(scopes), self.max_scopes_per_request):
+                batches.append((scopes[i : i + self.max_scopes_per_request], merged))
+        return batches
+
+    async def _put(self, query: str, changes: list[ChangeRequest]) -> None:
+        params = RecordsRequestBuilder.RecordsRequestBuilderPutQueryParameters(
+            query=query,
+            block_until_complete=False,
+            language=self.language,
+        )
+        content = await self._records.put(
+            changes, request_configuration=RequestConfiguration(query_parameters=params)
+        )
+        if content:
+            status = decode_model(content, ChangeResult).status
+            if status is not None and status.successful is False:
+                raise RuntimeError(f"Change request failed: {status.error_message}")
+
+    def _invalidate(self) -> None:
+        if self.cache is None:
+            return
+        if self._cache_suspended:
+            self.cache.invalidate(self.project_id, self.collection_id)
+        else:
+            self.cache.suspend(self.project_id, self.collection_id)
+            self._cache_suspended = True
+
+    def _resume_cache(self) -> None:
+        if self.cache is not None and self._cache_suspended:
+            self.cache.resume(self.project_id, self.collection_id)
+            self._cache_suspended = False
+
+    def _requeue(self, failed: dict[str, list[ChangeRequest]]) -> None:
+        """Put the changes of failed requests back ahead of changes queued since."""
+        for scope, queued in self._pending.items():
+            failed[scope] = [*failed.get(scope, ()), *queued]
+        self._pending = failed
+        self._pending_count = sum(len(c) for c in failed.values())
+
+    async def flush(self) -> int:
+        """Send all queued changes; returns the number of requests sent.
+
+        If requests fail, their changes are queued again (so a later `flush` or
+        `close` resends them) and the first error is raised once all requests
+        of the flush have finished.
+        """
+        self._raise_background_error()
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            pending, self._pending, self._pending_count = self._pending, {}, 0
+            batches = self._batches(pending)
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def send(scopes: list[str], changes: list[ChangeRequest]) -> None:
+                async with semaphore:
+                    await self._put(combine_scopes(scopes), changes)
+
+            try:
+                outcomes = await asyncio.gather(
+                    *(send(s, c) for s, c in batches), return_exceptions=True
+                )
+            finally:
+                self._invalidate()
+            errors = []
+            failed: dict[str, list[ChangeRequest]] = {}
+            for (scopes, changes), outcome in zip(batches, outcomes, strict=True):
+                if isinstance(outcome, BaseException):
+                    failed.update(dict.fromkeys(scopes, changes))
+                    errors.append(outcome)
+            if failed:
+                self._requeue(failed)
+            self.requests_sent += len(batches) - len(errors)
+            logger.debug(
+                "Flushed %d changes for %d scopes in %d requests (%d failed)",
+                sum(len(c) for c in pending.values()),
+                len(pending),
+                len(batches),
+                len(errors),
+            )
+            if errors:
+                raise errors[0]
+            return len(batches)
+
+    async def flush_and_wait(
+        self, *, timeout: float = 60.0, only_high_priority_changes: bool = False
+    ) -> bool:
+        """Flush, then wait until the server has applied all scheduled changes.
+
+        Returns the ``success`` flag of ``changes/queue``: False if the changes
+        were not all applied within `timeout` seconds (a negative timeout waits
+        indefinitely).
+        """
+        await self.flush()
+        params = QueueQueryParameters(
+            timeout_millis=int(timeout * 1000),
+            only_high_priority_changes=only_high_priority_changes or None,
+        )
+        content = await self._endpoints.wait_for_changes(params)
+        result = decode_model(content or b"{}", WaitForPendingChangesResult)
+        if result.success and not self._pending:
+            self._resume_cache()
+        return bool(result.success)
+
+    async def _flush_periodically(self) -> None:
+        assert self.flush_interval is not None
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:  # surfaced on the next add/flush
+                logger.warning("Background flush failed: %s", e)
+                self._error = e
+
+    def start(self) -> None:
+        """Start background flushing every `flush_interval` seconds."""
+        if self._timer is None and self.flush_interval is not None:
+            self._timer = asyncio.create_task(self._flush_periodically())
+
+    async def close(self) -> None:
+        """Stop background flushing and send all remaining changes."""
+        if self._timer is not None:
+            self._timer.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._timer
+            self._timer = None
+        if self._error is not None:
+            # the failed changes were queued again and are retried below
+            logger.debug("Retrying changes of failed background flush: %s", self._error)
+            self._error = None
+        await self.flush()
+
+    async def __aenter__(self) -> ChangeWriter:
+        self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+
+__all__ = ["ChangeWriter", "combine_scopes", "merge_changes"]
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterable, Awaitable, Callable, Iterable
+
+
+class _Done:
+    """Sentinel closing the work and result queues (items may be None)."""
+
+
+_DONE = _Done()
+
+
+async def bounded_map[T, R](
+    func: Callable[[T], Awaitable[R]],
+    items: Iterable[T] | AsyncIterable[T],
+    *,
+    concurrency: int,
+) -> AsyncGenerator[tuple[T, R | None, Exception | None]]:
+    """Apply `func` to `items` with at most `concurrency` calls in flight.
+
+    `items` is consumed lazily, at most `concurrency` items ahead of the calls.
+    Outcomes are yielded in completion order as ``(item, result, error)`` where
+    exactly one of `result` and `error` is set: a call raising an `Exception`
+    does not stop the others. An exception raised while iterating `items`
+    propagates once the calls already started have been yielded.
+
+    Closing the generator early (``break``, ``aclose()``) cancels the calls in
+    flight and stops consuming `items`.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    queue: asyncio.Queue[T | _Done] = asyncio.Queue(maxsize=concurrency)
+    results: asyncio.Queue[tuple[T, R | None, Exception | None] | _Done] = asyncio.Queue()
+
+    async def stop_workers() -> None:
+        for _ in range(concurrency):
+            await queue.put(_DONE)
+
+    async def feed() -> None:
+        # No `finally`: when cancelled, the workers are cancelled too, and
+        # waiting for room in a full queue would never return.
+        try:
+            if isinstance(items, AsyncIterable):
+                async for item in items:
+                    await queue.put(item)
+            else:
+                for item in items:
+                    await queue.put(item)
+        except Exception:
+            await stop_workers()
+            raise
+        await stop_workers()
+
+    async def work() -> None:
+        try:
+            while not isinstance(item := await queue.get(), _Done):
+                try:
+                    outcome: tuple[T, R | None, Exception | None] = (item, await func(item), None)
+                except Exception as e:
+                    outcome = (item, None, e)
+                results.put_nowait(outcome)
+        finally:
+            results.put_nowait(_DONE)
+
+    tasks = [asyncio.create_task(feed())]
+    tasks += [asyncio.create_task(work()) for _ in range(concurrency)]
+    try:
+        finished = 0
+        while finished < concurrency:
+            outcome = await results.get()
+            if isinstance(outcome, _Done):
+                finished += 1
+            else:
+                yield outcome
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+__all__ = ["bounded_map"]
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import dataclasses
+import importlib
+import json
+import re
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from enum import Enum
+from typing import Any
+
+from axcpy.searchwebapi.generated.models.search_result import SearchResult
+
+try:  # optional fast JSON backend
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - depends on environment
+    _orjson = None  # type: ignore[assignment]
+
+_MODELS_PACKAGE = "axcpy.searchwebapi.generated.models"
+_PRIMITIVES = {"Any", "Optional", "Union", "bool", "bytes", "dict", "float", "int", "list", "str"}
+_IDENTIFIER = re.compile(r"[A-Za-z_]\w*")
+
+JSON_BACKEND = "orjson" if _orjson is not None else "json"
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:
+    """Parse a JSON document with orjson when installed, falling back to the stdlib."""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def _snake(key: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", key).lower()
+
+
+def _module_name(class_name: str) -> str:
+    return re.sub(r"(?<!^)(?<!_)(?=[A-Z])", "_", class_name).lower()
+
+
+def _resolve_model(class_name: str) -> type:
+    module = importlib.import_module(f"{_MODELS_PACKAGE}.{_module_name(class_name)}")
+    model: type = getattr(module, class_name)
+    return model
+
+
+_Builder = Callable[[Any, bool], Any]
+_BUILDERS: dict[type, _Builder] = {}
+
+
+def _converter(annotation: str) -> _Builder | None:
+    names = [n for n in _IDENTIFIER.findall(annotation) if n not in _PRIMITIVES]
+    if not names:
+        return None
+    target = _resolve_model(names[0])
+    if issubclass(target, Enum):
+
+        def element(value: Any, keep: bool) -> Any:
+            try:
+                return target(value)
+            except ValueError:
+                return None
+
+    else:
+        built: list[_Builder] = []
+
+        def element(value: Any, keep: bool) -> Any:
+            if not built:  # compiled lazily: models may reference each other
+                built.append(_builder(target))
+            return built[0](value, keep)
+
+    if "list[" not in annotation:
+        return element
+
+    def convert_list(values: Any, keep: bool) -> Any:
+        return [element(v, keep) for v in values]
+
+    return convert_list
+
+
+def _builder[T](model: type[T]) -> Callable[[Any, bool], T]:
+    """Return the cached constructor for `model`, compiling it on first use.
+
+    The constructor bypasses the dataclass ``__init__``: it copies a template of
+    the default attribute values and fills in the JSON values, which is several
+    times cheaper per object on large result pages.
+    """
+    build = _BUILDERS.get(model)
+    if build is not None:
+        return build
+
+    generated: Any = model  # a kiota dataclass, which type[T] does not express
+    annotations = {f.name: f.type for f in dataclasses.fields(generated)}
+    template = dict(vars(generated()))
+    plain: list[tuple[str, str]] = []
+    converted: list[tuple[str, str, _Builder]] = []
+    for key in generated().get_field_deserializers():
+        attr = _snake(key)
+        convert = _converter(str(annotations[attr]))
+        if convert is None:
+            plain.append((key, attr))
+        else:
+            converted.append((key, attr, convert))
+    known = frozenset(key for key, _ in plain) | frozenset(key for key, _, _ in converted)
+    new = model.__new__
+
+    if not known:
+        # Schema-less models (e.g. Field_valueObject) only carry additional data.
+        def build(data: Any, keep: bool) -> Any:
+            obj = new(model)
+            state = dict(template)
+            state["additional_data"] = data if isinstance(data, dict) else {"value": data}
+            obj.__dict__ = state
+            return obj
+
+    else:
+
+        def build(data: Any, keep: bool) -> Any:
+            obj = new(model)
+            state = dict(template)
+            get = data.get
+            for key, attr in plain:
+                state[attr] = get(key)
+            for key, attr, convert in converted:
+                value = get(key)
+                state[attr] = None if value is None else convert(value, keep)
+            state["additional_data"] = (
+                {k: v for k, v in data.items() if k not in known} if keep else {}
+            )
+            obj.__dict__ = state
+            return obj
+
+    _BUILDERS[model] = build
+    return build
+
+
+def decode_model[T](
+    data: bytes | str | Mapping[str, Any],
+    model: type[T],
+    *,
+    additional_data: bool = False,
+) -> T:
+    """Decode a JSON response body directly into a generated model.
+
+    Unlike the kiota parse nodes, the JSON is parsed in one pass (orjson when
+    available) and mapped with a per-model constructor compiled once. Unknown properties
+    are dropped unless `additional_data` is set, in which case they are kept in
+    each model's ``additional_data`` exactly like the generated deserializers do.
+
+    Decoding a large page allocates many small objects without creating cycles.
+    Bulk readers that decode many pages may call ``gc.freeze()`` after warm-up
+    (or pause the cyclic GC around their own loop) to avoid repeated collections.
+
+    Parameters
+    ----------
+    data: bytes | str | Mapping[str, Any]
+        Response body as returned by e.g. ``RecordsRequestBuilder.get`` or an
+        already parsed JSON object.
+    model: type
+        Generated model class, e.g. `SearchResult`.
+    additional_data: bool, default False
+        Keep properties not described in the OpenAPI description.
+    """
+    parsed = data if isinstance(data, Mapping) else loads(data)
+    if not isinstance(parsed, Mapping):
+        raise ValueError(
+            f"Expected a JSON object for {model.__name__}, got {type(parsed).__name__}"
+        )
+    return _builder(model)(parsed, additional_data)
+
+
+def decode_search_result(
+    data: bytes | str | Mapping[str, Any], *, additional_data: bool = False
+) -> SearchResult:
+    """Decode a /records or /searchToken response body into a `SearchResult`."""
+    return decode_model(data, SearchResult, additional_data=additional_data)
+
+
+def record_rows(data: bytes | str | Mapping[str, Any]) -> Iterator[dict[str, Any]]:
+    """Yield one flat dict per record without building model objects.
+
+    This is the lightweight path for bulk consumers: each row holds ``id``,
+    ``rank``, ``relevance`` and, when present, ``body`` plus one entry per
+    requested field (field id -> string value).
+    """
+    parsed = data if isinstance(data, Mapping) else loads(data)
+    results: Iterable[Mapping[str, Any]] = parsed.get("results") or ()
+    for record in results:
+        row: dict[str, Any] = {
+            "id": record.get("id"),
+            "rank": record.get("rank"),
+            "relevance": record.get("relevance"),
+        }
+        if record.get("body") is not None:
+            row["body"] = record["body"]
+        for field in record.get("fields") or ():
+            row[field.get("id")] = field.get("value")
+        yield row
+
+
+__all__ = [
+    "JSON_BACKEND",
+    "decode_model",
+    "decode_search_result",
+    "loads",
+    "record_rows",
+]
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from contextlib import aclosing
+from pathlib import Path
+
+from kiota_abstractions.request_information import RequestInformation
+from pydantic import BaseModel
+
+from .concurrency import bounded_map
+from .endpoints import collection_endpoints
+from .session import SearchWebApiSession
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.jsonl"
+PARTIAL_DIR = ".partial"
+
+_FILENAME = re.compile(r"""filename\*?=(?:UTF-8'')?"?([^";]+)"?""", re.IGNORECASE)
+
+DownloadItem = str | tuple[str, str | None]
+
+
+class DownloadResult(BaseModel):
+    """One downloaded (or already present) binary."""
+
+    record_id: str
+    field: str
+    path: Path | None = None
+    digest: str | None = None
+    size: int = 0
+    filename: str | None = None
+    skipped: bool = False
+    error: str | None = None
+
+
+def _filename(content_disposition: str | None) -> str | None:
+    if not content_disposition:
+        return None
+    match = _FILENAME.search(content_disposition)
+    return match.group(1) if match else None
+
+
+class BinaryDownloader:
+    """Stream binaries from ``binary/{recordId}/content?field=`` to a content-addressed store.
+
+    Bodies are written to disk chunk by chunk while their digest is computed, so
+    memory use is bounded by `chunk_size` per worker regardless of file size.
+    Finished files are stored as ``<root>/<d[:2]>/<d[2:4]>/<digest>`` (identical
+    natives are stored once) and recorded in ``<root>/manifest.jsonl``.
+
+    Interrupted downloads stay in ``<root>/.partial`` and continue with an HTTP
+    range request on the next attempt; records already in the manifest are
+    skipped, so a failed bulk run can simply be started again.
+
+    Parameters
+    ----------
+    session: SearchWebApiSession
+        Authenticated session; its pooled HTTP client is used for streaming.
+    project_id: str
+        Project of the records.
+    collection_id: str
+        Collection of the records.
+    root: str | Path
+        Root directory of the store.
+    field: str
+        Default binary field (e.g. the native field of the data model).
+    workers: int, default 4
+        Number of concurrent downloads in `download_many`.
+    chunk_size: int, default 1 MiB
+        Bytes read from the response per write.
+    algorithm: str, default "sha256"
+        `hashlib` algorithm used for addressing and verification.
+
+    Example
+    -------
+    >>> downloader = BinaryDownloader(swa, "p", "documents", "/data/natives", field="rm_native")
+    >>> async for result in downloader.download_many(record_ids):
+    ...     print(result.record_id, result.path)
+    """
+
+    def __init__(
+        self,
+        session: SearchWebApiSession,
+        project_id: str,
+        collection_id: str,
+        root: str | Path,
+        *,
+        field: str,
+        workers: int = 4,
+        chunk_size: int = 1024 * 1024,
+        algorithm: str = "sha256",
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        hashlib.new(algorithm)  # fail early on unknown algorithms
+        self._session = session
+        self._endpoints = collection_endpoints(session.client, project_id, collection_id)
+        self.root = Path(root)
+        self.field = field
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.algorithm = algorithm
+        self._manifest: dict[tuple[str, str], DownloadResult] | None = None
+        self._manifest_lock = asyncio.Lock()
+        # (record_id, field) -> lock and number of callers holding or awaiting it
+        self._key_locks: dict[tuple[str, str], tuple[asyncio.Lock, int]] = {}
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / MANIFEST_NAME
+
+    def path_for(self, digest: str) -> Path:
+        """Location of the file with the given digest in the store."""
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    def _load_manifest(self) -> dict[tuple[str, str], DownloadResult]:
+        if self._manifest is None:
+            self._manifest = {}
+            if self.manifest_path.exists():
+                with self.manifest_path.open(encoding="utf-8") as handle:
+                    for line in handle:
+                        if line.strip():
+                            entry = DownloadResult.model_validate_json(line)
+                            self._manifest[(entry.record_id, entry.field)] = entry
+        return self._manifest
+
+    async def _record(self, result: DownloadResult) -> None:
+        async with self._manifest_lock:
+            self._load_manifest()[(result.record_id, result.field)] = result
+            self.root.mkdir(parents=True, exist_ok=True)
+            with self.manifest_path.open("a", encoding="utf-8") as handle:
+                handle.write(result.model_dump_json(exclude={"skipped", "error"}) + "\n")
+
+    def _partial_path(self, record_id: str, field: str) -> Path:
+        key = hashlib.sha1(f"{record_id}\0{field}".encode()).hexdigest()
+        return self.root / PARTIAL_DIR / key
+
+    def _request_info(self, record_id: str, field: str) -> RequestInformation:
+        return self._endpoints.binary_content_request(record_id, field)
+
+    async def download(
+        self,
+        record_id: str,
+        *,
+        field: str | None = None,
+        expected_digest: str | None = None,
+    ) -> DownloadResult:
+        """Download one binary (or return its manifest entry if already stored).
+
+        Concurrent calls for the same record and field (e.g. duplicate ids in
+        `download_many`) are serialized, so they never write the same partial
+        file; the later ones find the binary in the manifest.
+
+        Raises
+        ------
+        ValueError
+            If `expected_digest` is given and does not match the downloaded data;
+            the partial file is discarded.
+        """
+        field = field or self.field
+        key = (record_id, field)
+        lock, users = self._key_locks.get(key, (asyncio.Lock(), 0))
+        self._key_locks[key] = (lock, users + 1)
+        try:
+            async with lock:
+                return await self._download(record_id, field, expected_digest)
+        finally:
+            lock, users = self._key_locks[key]
+            if users == 1:
+                del self._key_locks[key]
+            else:
+                self._key_locks[key] = (lock, users - 1)
+
+    async def _download(
+        self, record_id: str, field: str, expected_digest: str | None
+    ) -> DownloadResult:
+        known = self._load_manifest().get((record_id, field))
+        if known is not None and known.path is not None and known.path.exists():
+            if expected_digest is None or known.digest == expected_digest.lower():
+                return known.model_copy(update={"skipped": True})
+
+        partial = self._partial_path(record_id, field)
+        partial.parent.mkdir(parents=True, exist_ok=True)
+        hasher = hashlib.new(self.algorithm)
+        offset = 0
+        if partial.exists():
+            with partial.open("rb") as handle:
+                while chunk := handle.read(self.chunk_size):
+                    hasher.update(chunk)
+                    offset += len(chunk)
+
+        request = await self._session.to_http_request(self._request_info(record_id, field))
+        if offset:
+            request.headers["Range"] = f"bytes={offset}-"
+        response = await self._session.http_client.send(request, stream=True)
+        try:
+            if response.status_code == 416 and offset:
+                pass  # the partial file is already complete
+            else:
+                response.raise_for_status()
+                if offset and response.status_code != 206:
+                    logger.debug("Server ignored range request for %s, restarting", record_id)
+                    hasher = hashlib.new(self.algorithm)
+                    offset = 0
+                mode = "ab" if offset else "wb"
+                with partial.open(mode) as handle:
+                    async for chunk in response.aiter_bytes(self.chunk_size):
+                        handle.write(chunk)
+                        hasher.update(chunk)
+                        offset += len(chunk)
+            filename = _filename(response.headers.get("Content-Disposition"))
+        finally:
+            await response.aclose()
+
+        digest = hasher.hexdigest()
+        if expected_digest is not None and digest != expected_digest.lower():
+            partial.unlink(missing_ok=True)
+            raise ValueError(
+                f"{self.algorithm} mismatch for {record_id}: "
+                f"expected {expected_digest}, got {digest}"
+            )
+        target = self.path_for(digest)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists():
+            partial.unlink()  # identical content is already stored
+        else:
+            os.replace(partial, target)
+        result = DownloadResult(
+            record_id=record_id,
+            field=field,
+            path=target,
+            digest=digest,
+            size=offset,
+            filename=filename,
+        )
+        await self._record(result)
+        return result
+
+    async def download_many(
+        self,
+        items: Iterable[DownloadItem] | AsyncIterable[DownloadItem],
+        *,
+        expected_digests: dict[str, str] | None = None,
+    ) -> AsyncIterator[DownloadResult]:
+        """Download many binaries with `workers` concurrent downloads.
+
+        `items` are record ids or ``(record_id, field)`` pairs and are consumed
+        lazily. Results are yielded in completion order; failures are reported
+        through `DownloadResult.error` instead of stopping the run.
+        """
+        digests = expected_digests or {}
+
+        async def fetch(item: DownloadItem) -> DownloadResult:
+            record_id, field = (item, None) if isinstance(item, str) else item
+            return await self.download(
+                record_id, field=field, expected_digest=digests.get(record_id)
+            )
+
+        async with aclosing(bounded_map(fetch, items, concurrency=self.workers)) as outcomes:
+            async for item, result, error in outcomes:
+                if result is None:
+                    record_id, field = (item, None) if isinstance(item, str) else item
+                    logger.warning("Downloading %s failed: %s", record_id, error)
+                    result = DownloadResult(
+                        record_id=record_id, field=field or self.field, error=str(error)
+                    )
+                yield result
+
+
+__all__ = ["BinaryDownloader", "DownloadResult"]
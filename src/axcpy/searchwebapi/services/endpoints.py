@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import dataclasses
+import weakref
+from datetime import UTC, datetime
+from enum import Enum
+from typing import Any
+from urllib.parse import quote
+
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_adapter import RequestAdapter
+from kiota_abstractions.request_information import RequestInformation
+from kiota_abstractions.serialization import Parsable, ParsableFactory
+
+from axcpy.searchwebapi.generated.models.record import Record
+from axcpy.searchwebapi.generated.models.search_result import SearchResult
+from axcpy.searchwebapi.generated.models.search_result_token import SearchResultToken
+from axcpy.searchwebapi.generated.models.search_result_token_response import (
+    SearchResultTokenResponse,
+)
+from axcpy.searchwebapi.generated.models.wait_for_pending_changes_result import (
+    WaitForPendingChangesResult,
+)
+from axcpy.searchwebapi.generated.projects.item.collections.item.binary.item.content.content_request_builder import (  # noqa: E501
+    ContentRequestBuilder as BinaryContentRequestBuilder,
+)
+from axcpy.searchwebapi.generated.projects.item.collections.item.changes.queue.queue_request_builder import (  # noqa: E501
+    QueueRequestBuilder,
+)
+from axcpy.searchwebapi.generated.projects.item.collections.item.records.item.content.content_request_builder import (  # noqa: E501
+    ContentRequestBuilder,
+)
+from axcpy.searchwebapi.generated.projects.item.collections.item.records.records_request_builder import (  # noqa: E501
+    RecordsRequestBuilder,
+)
+from axcpy.searchwebapi.generated.projects.item.collections.item.search_token.search_token_request_builder import (  # noqa: E501
+    SearchTokenRequestBuilder,
+)
+from axcpy.searchwebapi.generated.search_web_api_client import SearchWebApiClient
+
+BinaryContentQueryParameters = BinaryContentRequestBuilder.ContentRequestBuilderGetQueryParameters
+RecordsQueryParameters = RecordsRequestBuilder.RecordsRequestBuilderGetQueryParameters
+RecordContentQueryParameters = ContentRequestBuilder.ContentRequestBuilderGetQueryParameters
+QueueQueryParameters = QueueRequestBuilder.QueueRequestBuilderGetQueryParameters
+SearchTokenQueryParameters = SearchTokenRequestBuilder.SearchTokenRequestBuilderGetQueryParameters
+
+_JSON = "application/json"
+
+# (field name, wire name) per query parameter class, in URL template order.
+_WIRE_NAMES: dict[type, list[tuple[str, str]]] = {}
+
+
+def _wire_names(params: Any) -> list[tuple[str, str]]:
+    cls = type(params)
+    names = _WIRE_NAMES.get(cls)
+    if names is None:
+        names = sorted(
+            ((f.name, params.get_query_parameter(f.name)) for f in dataclasses.fields(params)),
+            key=lambda item: item[1],
+        )
+        _WIRE_NAMES[cls] = names
+    return names
+
+
+def _format(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, Enum):
+        return str(value.value)
+    if isinstance(value, datetime):
+        return (value if value.tzinfo else value.replace(tzinfo=UTC)).isoformat("T")
+    return str(value)
+
+
+def query_string(params: Any | None) -> str:
+    """Encode generated query parameters like the builders' RFC 6570 templates."""
+    if params is None:
+        return ""
+    pairs = [
+        f"{wire}={quote(_format(value), safe='')}"
+        for name, wire in _wire_names(params)
+        if (value := getattr(params, name)) is not None
+    ]
+    return "?" + "&".join(pairs) if pairs else ""
+
+
+class CollectionEndpoints:
+    """Precompiled requests for the hot endpoints of one collection.
+
+    The fluent builders create a chain of builder objects per call, copy their
+    path parameters at every step and expand the full URL template of the
+    endpoint. This class expands the collection's base URL once and builds
+    `RequestInformation` objects with their final URL directly, which matters in
+    tight loops (paging, downloads, token renewal, change polling). Requests go
+    through the same request adapter, so authentication, session renewal and
+    error mapping are unchanged. Use `collection_endpoints` to share one
+    instance per client and collection.
+
+    Parameters
+    ----------
+    request_adapter: RequestAdapter
+        Adapter of the client; its `base_url` must already be set.
+    project_id: str
+        Project of the collection.
+    collection_id: str
+        Collection.
+
+    Example
+    -------
+    >>> endpoints = collection_endpoints(swa.client, "p", "documents")
+    >>> content = await endpoints.get_records(RecordsQueryParameters(query="york", limit=100))
+    """
+
+    def __init__(
+        self, request_adapter: RequestAdapter[Any], project_id: str, collection_id: str
+    ) -> None:
+        self.request_adapter = request_adapter
+        self.project_id = project_id
+        self.collection_id = collection_id
+        self.base_url = (
+            f"{request_adapter.base_url}/projects/{quote(project_id, safe='')}"
+            f"/collections/{quote(collection_id, safe='')}"
+        )
+        self._records_url = self.base_url + "/records"
+        self._binary_url = self.base_url + "/binary/"
+        self._search_token_url = self.base_url + "/searchToken"
+        self._queue_url = self.base_url + "/changes/queue"
+
+    @staticmethod
+    def _request(method: Method, url: str, accept: str | None = _JSON) -> RequestInformation:
+        info = RequestInformation(method)
+        info.url = url
+        if accept is not None:
+            info.headers.try_add("Accept", accept)
+        return info
+
+    def _with_body(self, info: RequestInformation, body: Parsable) -> RequestInformation:
+        info.set_content_from_parsable(self.request_adapter, _JSON, body)
+        return info
+
+    async def _send(
+        self, info: RequestInformation, error_model: type[ParsableFactory[Any]] | None
+    ) -> bytes | None:
+        error_mapping = {"XXX": error_model} if error_model is not None else None
+        return await self.request_adapter.send_primitive_async(info, "bytes", error_mapping)
+
+    # records
+
+    def records_request(self, params: RecordsQueryParameters | None = None) -> RequestInformation:
+        """``GET .../records`` request information."""
+        return self._request(Method.GET, self._records_url + query_string(params))
+
+    async def get_records(self, params: RecordsQueryParameters | None = None) -> bytes | None:
+        """Raw ``GET .../records`` response; decode with `decode_search_result`."""
+        return await self._send(self.records_request(params), SearchResult)
+
+    def record_content_request(
+        self, record_id: str, params: RecordContentQueryParameters | None = None
+    ) -> RequestInformation:
+        """``GET .../records/{recordId}/content`` request information."""
+        url = f"{self._records_url}/{quote(record_id, safe='')}/content{query_string(params)}"
+        return self._request(Method.GET, url)
+
+    async def get_record_content(
+        self, record_id: str, params: RecordContentQueryParameters | None = None
+    ) -> bytes | None:
+        """Raw ``GET .../records/{recordId}/content`` response."""
+        return await self._send(self.record_content_request(record_id, params), Record)
+
+    # binary content
+
+    def binary_content_request(
+        self, record_id: str, field: str | None = None
+    ) -> RequestInformation:
+        """``GET .../binary/{recordId}/content`` request information."""
+        url = f"{self._binary_url}{quote(record_id, safe='')}/content"
+        if field is not None:
+            url += f"?field={quote(field, safe='')}"
+        return self._request(Method.GET, url, accept=None)
+
+    async def get_binary_content(self, record_id: str, field: str | None = None) -> bytes | None:
+        """Binary of a record, buffered; stream large files with `BinaryDownloader`."""
+        return await self._send(self.binary_content_request(record_id, field), None)
+
+    # searchToken
+
+    def search_token_request(
+        self,
+        method: Method = Method.GET,
+        params: SearchTokenQueryParameters | None = None,
+        token: str | None = None,
+    ) -> RequestInformation:
+        """``searchToken`` request information: GET creates, PUT renews, DELETE drops a token."""
+        accept = None if method == Method.DELETE else _JSON
+        info = self._request(method, self._search_token_url + query_string(params), accept)
+        if token is not None:
+            self._with_body(info, SearchResultToken(token=token))
+        return info
+
+    async def create_search_token(self, params: SearchTokenQueryParameters) -> bytes | None:
+        """Raw ``GET .../searchToken`` response (a `SearchResultTokenResponse`)."""
+        return await self._send(
+            self.search_token_request(Method.GET, params), SearchResultTokenResponse
+        )
+
+    async def renew_search_token(self, token: str) -> bytes | None:
+        """Raw ``PUT .../searchToken`` response (a `SearchResultTokenResponse`)."""
+        return await self._send(
+            self.search_token_request(Method.PUT, token=token), SearchResultTokenResponse
+        )
+
+    async def delete_search_token(self, token: str) -> bytes | None:
+        """``DELETE .../searchToken``."""
+        return await self._send(self.search_token_request(Method.DELETE, token=token), None)
+
+    # changes/queue
+
+    def changes_queue_request(
+        self, params: QueueQueryParameters | None = None
+    ) -> RequestInformation:
+        """``GET .../changes/queue`` request information."""
+        return self._request(Method.GET, self._queue_url + query_string(params))
+
+    async def wait_for_changes(self, params: QueueQueryParameters | None = None) -> bytes | None:
+        """Raw ``GET .../changes/queue`` response (a `WaitForPendingChangesResult`)."""
+        return await self._send(self.changes_queue_request(params), WaitForPendingChangesResult)
+
+
+# Keyed by the client rather than its adapter: the endpoints hold the adapter, so
+# an adapter key would stay reachable from its own value and never be released.
+_ENDPOINTS: weakref.WeakKeyDictionary[
+    SearchWebApiClient, dict[tuple[str, str], CollectionEndpoints]
+] = weakref.WeakKeyDictionary()
+
+
+def collection_endpoints(
+    client: SearchWebApiClient, project_id: str, collection_id: str
+) -> CollectionEndpoints:
+    """Shared `CollectionEndpoints` of a client's collection, created on first use."""
+    by_collection = _ENDPOINTS.setdefault(client, {})
+    endpoints = by_collection.get((project_id, collection_id))
+    if endpoints is None:
+        endpoints = CollectionEndpoints(client.request_adapter, project_id, collection_id)
+        by_collection[(project_id, collection_id)] = endpoints
+    return endpoints
+
+
+__all__ = [
+    "BinaryContentQueryParameters",
+    "CollectionEndpoints",
+    "QueueQueryParameters",
+    "RecordContentQueryParameters",
+    "RecordsQueryParameters",
+    "SearchTokenQueryParameters",
+    "collection_endpoints",
+    "query_string",
+]
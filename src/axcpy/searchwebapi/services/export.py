@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import aclosing
+from pathlib import Path
+from typing import IO, Any, Literal
+
+from pydantic import BaseModel
+
+from axcpy.searchwebapi.generated.search_web_api_client import SearchWebApiClient
+
+from .paging import MAX_PAGE_SIZE, RecordPager, join_values
+
+logger = logging.getLogger(__name__)
+
+ExportFormat = Literal["ndjson", "csv"]
+BASE_COLUMNS = ("id", "rank", "relevance")
+# Bytes read from the end of an export to find its last complete record.
+_TAIL_CHUNK = 64 * 1024
+
+
+class ExportReport(BaseModel):
+    """Progress and outcome of a `SearchExport`."""
+
+    records: int = 0
+    number_results: int | None = None
+    resumed_after_rank: int = 0
+    last_rank: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def export_format(path: str | os.PathLike[str]) -> ExportFormat:
+    """Export format implied by a file name (``.csv``, otherwise NDJSON)."""
+    return "csv" if Path(path).suffix.lower() == ".csv" else "ndjson"
+
+
+def _complete_end(handle: IO[bytes]) -> int:
+    """Offset just after the last newline of a file (0 if it has none)."""
+    position = handle.seek(0, os.SEEK_END)
+    while position > 0:
+        step = min(_TAIL_CHUNK, position)
+        position -= step
+        handle.seek(position)
+        last_newline = handle.read(step).rfind(b"\n")
+        if last_newline != -1:
+            return position + last_newline + 1
+    return 0
+
+
+def _lines_before(handle: IO[bytes], end: int) -> Iterator[tuple[bytes, int]]:
+    """Lines ending at or before `end`, last first, with the offset just after each."""
+    position, buffer = end, b""
+    while buffer or position > 0:
+        previous = buffer.rfind(b"\n", 0, len(buffer) - 1)
+        if previous == -1 and position > 0:
+            step = min(_TAIL_CHUNK, position)
+            position -= step
+            handle.seek(position)
+            buffer = handle.read(step) + buffer
+            continue
+        yield buffer[previous + 1 : -1], position + len(buffer)
+        buffer = buffer[: previous + 1]
+
+
+def _rank(line: bytes, fmt: ExportFormat, column: int) -> int | None:
+    if fmt == "ndjson":
+        rank = json.loads(line).get("rank")
+        return None if rank is None else int(rank)
+    value = next(csv.reader([line.decode()]))[column]
+    return int(value) if value else None
+
+
+def last_written_rank(path: str | os.PathLike[str], fmt: ExportFormat | None = None) -> int:
+    """Rank of the last complete record in an export file (0 if there is none).
+
+    The file is cut off after that record so it can be appended to: a trailing
+    partial line, left by an interrupted export, and records without a rank
+    after it are dropped and exported again on resume.
+    """
+    path = Path(path)
+    if not path.exists():
+        return 0
+    fmt = fmt or export_format(path)
+    header_end, column = 0, 0
+    if fmt == "csv":
+        header = csv_header(path)
+        column = header.index("rank") if "rank" in header else -1
+        with path.open("rb") as handle:
+            first = handle.readline()
+        header_end = len(first) if first.endswith(b"\n") else 0
+        if header_end and column == -1:
+            raise ValueError(f"Cannot resume {path}: it has no rank column")
+    rank, keep = 0, header_end
+    with path.open("r+b") as handle:
+        for line, line_end in _lines_before(handle, _complete_end(handle)):
+            if line_end <= header_end:
+                break
+            line_rank = _rank(line, fmt, column)
+            if line_rank is not None:
+                rank, keep = line_rank, line_end
+                break
+        if handle.seek(0, os.SEEK_END) != keep:
+            logger.info("Dropping the partial or unranked last lines of %s", path)
+            handle.truncate(keep)
+    return rank
+
+
+def csv_header(path: str | os.PathLike[str]) -> list[str]:
+    """Column names of a CSV export."""
+    with open(path, encoding="utf-8", newline="") as handle:
+        return next(csv.reader(handle), [])
+
+
+class SearchExport:
+    """Stream all records of a search to NDJSON or CSV.
+
+    Pages of ``/records`` are fetched by a `RecordPager` with `prefetch` pages in
+    flight while the current page is written, and decoded into flat rows without
+    building model objects, so memory stays constant regardless of the result
+    size. NDJSON lines hold ``id``, ``rank``, ``relevance``, ``body`` if
+    requested, and the requested fields; CSV files have these columns. The
+    output is flushed after every page.
+
+    An interrupted export can be resumed: the rank of the last complete record
+    in the file is read back, a partial trailing line is cut off, and the
+    export continues with the page containing the next rank. Resuming relies on
+    a stable result order, so pass an `order` and avoid exporting a collection
+    while it changes.
+
+    Parameters
+    ----------
+    client: SearchWebApiClient
+        Client of an authenticated session.
+    project_id: str
+        Project to search.
+    collection_id: str
+        Collection to search.
+    query: str, default "*"
+        Query expression.
+    fields: str | Sequence[str] | None
+        Fields to export; see `SchemaCache.projection` to validate them first.
+    body: bool, default False
+        Export the summarized content as ``body``.
+    order: str | None
+        Order criteria, e.g. ``"rm_modificationdate:asc"``.
+    join_restriction: str | None
+        Restriction on a joined collection.
+    language: str | None
+        Query language.
+    page_size: int, default 1000
+        Records per request.
+    prefetch: int, default 4
+        Pages requested ahead of the page being written.
+    max_records: int | None
+        Stop after this many records (counted from the start of the result).
+
+    Example
+    -------
+    >>> export = SearchExport(swa.client, "p", "documents", query="york", fields=["rm_title"])
+    >>> report = await export.write("york.ndjson", resume=True)
+    >>> print(report.records, f"{report.records_per_second:.0f} records/s")
+    """
+
+    def __init__(
+        self,
+        client: SearchWebApiClient,
+        project_id: str,
+        collection_id: str,
+        *,
+        query: str = "*",
+        fields: str | Sequence[str] | None = None,
+        body: bool = False,
+        order: str | None = None,
+        join_restriction: str | None = None,
+        language: str | None = None,
+        page_size: int = MAX_PAGE_SIZE,
+        prefetch: int = 4,
+        max_records: int | None = None,
+    ) -> None:
+        self._client = client
+        self.project_id = project_id
+        self.collection_id = collection_id
+        self.query = query
+        joined = join_values(fields)
+        self.fields = [f for f in joined.split(",") if f] if joined else []
+        self.body = body
+        self.order = order
+        self.join_restriction = join_restriction
+        self.language = language
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.max_records = max_records
+
+    @property
+    def columns(self) -> list[str]:
+        return [*BASE_COLUMNS, *(["body"] if self.body else []), *self.fields]
+
+    def _pager(self, after_rank: int) -> RecordPager:
+        max_records = self.max_records
+        start_page = after_rank // self.page_size + 1
+        if max_records is not None:
+            max_records = max(max_records - (start_page - 1) * self.page_size, 0)
+        return RecordPager(
+            self._client,
+            self.project_id,
+            self.collection_id,
+            query=self.query,
+            fields=self.fields or None,
+            body=self.body,
+            order=self.order,
+            join_restriction=self.join_restriction,
+            language=self.language,
+            page_size=self.page_size,
+            prefetch=self.prefetch,
+            max_records=max_records,
+            start_page=start_page,
+        )
+
+    async def write_to(
+        self,
+        handle: IO[str],
+        fmt: ExportFormat = "ndjson",
+        *,
+        after_rank: int = 0,
+        header: bool = True,
+        on_progress: Callable[[ExportReport], None] | None = None,
+        progress_interval: float = 5.0,
+    ) -> ExportReport:
+        """Write the records ranked after `after_rank` to an open text stream."""
+        report = ExportReport(resumed_after_rank=after_rank, last_rank=after_rank)
+        columns = self.columns
+        if fmt == "csv":
+            writer = csv.DictWriter(handle, columns, extrasaction="ignore", lineterminator="\n")
+            if header:
+                writer.writeheader()
+            write_rows: Callable[[list[dict[str, Any]]], Any] = writer.writerows
+        else:
+            dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+            def write_rows(rows: list[dict[str, Any]]) -> None:
+                handle.writelines(
+                    dumps({c: row.get(c) for c in columns if c in row}) + "\n" for row in rows
+                )
+
+        pager = self._pager(after_rank)
+        skip = after_rank % self.page_size  # records of the first page already written
+        start = time.perf_counter()
+        reported = start
+        async with aclosing(pager.row_pages()) as pages:
+            async for page in pages:
+                report.number_results = pager.number_results
+                rows = page.results
+                if skip:
+                    rows, skip = rows[skip:], 0
+                if self.max_records is not None:
+                    rows = rows[: max(self.max_records - after_rank - report.records, 0)]
+                if rows:
+                    write_rows(rows)
+                    handle.flush()
+                    report.records += len(rows)
+                    report.last_rank = rows[-1].get("rank") or report.last_rank
+                now = time.perf_counter()
+                report.elapsed = now - start
+                if on_progress is not None and now - reported >= progress_interval:
+                    reported = now
+                    on_progress(report)
+                if not page.results:
+                    break
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    async def write(
+        self,
+        path: str | os.PathLike[str],
+        fmt: ExportFormat | None = None,
+        *,
+        resume: bool = False,
+        on_progress: Callable[[ExportReport], None] | None = None,
+        progress_interval: float = 5.0,
+    ) -> ExportReport:
+        """Export to a file (``-`` for stdout), appending after its last record if `resume`."""
+        if str(path) == "-":
+            return await self.write_to(
+                sys.stdout,
+                fmt or "ndjson",
+                on_progress=on_progress,
+                progress_interval=progress_interval,
+            )
+        fmt = fmt or export_format(path)
+        fresh = not resume or not Path(path).exists() or Path(path).stat().st_size == 0
+        # checked first: last_written_rank truncates a partly written last line
+        if not fresh and fmt == "csv" and csv_header(path) != self.columns:
+            raise ValueError(f"Cannot resume {path}: its columns differ from {self.columns}")
+        after_rank = last_written_rank(path, fmt) if resume else 0
+        if after_rank:
+            logger.info("Resuming export to %s after rank %d", path, after_rank)
+        with open(path, "w" if fresh else "a", encoding="utf-8", newline="") as handle:
+            return await self.write_to(
+                handle,
+                fmt,
+                after_rank=after_rank,
+                header=fresh,
+                on_progress=on_progress,
+                progress_interval=progress_interval,
+            )
+
+
+__all__ = ["ExportReport", "SearchExport", "csv_header", "export_format", "last_written_rank"]
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from typing import TYPE_CHECKING
+
+from kiota_abstractions.base_request_configuration import RequestConfiguration
+from pydantic import BaseModel, Field
+
+from axcpy._optional import require_numpy
+from axcpy.searchwebapi.generated.models.folder_record import FolderRecord
+from axcpy.searchwebapi.generated.models.folder_values_result import FolderValuesResult
+from axcpy.searchwebapi.generated.projects.item.collections.item.filters.item.values.values_request_builder import (  # noqa: E501
+    ValuesRequestBuilder,
+)
+from axcpy.searchwebapi.generated.search_web_api_client import SearchWebApiClient
+
+from .decoding import decode_model
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAX_FACET_PAGE_SIZE = 1000
+# Merging meta engines report this instead of the real number of folders.
+UNKNOWN_NUMBER_RESULTS = 2**31 - 1
+
+_DONE = object()
+
+
+class FacetValues(BaseModel):
+    """All values of one facet as parallel columns (index i describes one folder)."""
+
+    field_id: str
+    ids: list[str] = Field(default_factory=list)
+    display_names: list[str | None] = Field(default_factory=list)
+    counts: list[int] = Field(default_factory=list)
+    expected_count: int | None = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def complete(self) -> bool | None:
+        """Whether all folders reported by the server were collected (None if unknown)."""
+        if self.expected_count is None:
+            return None
+        return len(self.ids) >= self.expected_count
+
+    def counts_array(self) -> np.ndarray:
+        """Document counts as an int64 array."""
+        numpy = require_numpy()
+        counts: np.ndarray = numpy.asarray(self.counts, dtype=numpy.int64)
+        return counts
+
+    def ids_array(self) -> np.ndarray:
+        """Folder ids as a NumPy string array."""
+        numpy = require_numpy()
+        ids: np.ndarray = numpy.asarray(self.ids, dtype=str)
+        return ids
+
+
+class FacetScanner:
+    """Enumerate all values of a facet from ``filters/{fieldId}/values`` concurrently.
+
+    Each shard pages with the maximum page size. When the server reports the
+    number of folders, the remaining pages of a shard are requested concurrently;
+    otherwise (merging meta engines) the shard is paged until a short page.
+    With `prefixes`, the keyspace is additionally split by display name prefix
+    and the shards are scanned in parallel. Prefixes must be disjoint and cover
+    all values; `collect` checks the result against the unsharded folder count
+    when the server reports one.
+
+    Parameters
+    ----------
+    client: SearchWebApiClient
+        Client of an authenticated session.
+    project_id: str
+        Project to query.
+    collection_id: str
+        Collection to query.
+    field_id: str
+        Facet (folder field) to enumerate.
+    query: str, default "*"
+        Query restricting the documents counted.
+    join_restriction: str | None
+        Restriction on a joined collection.
+    language: str | None
+        Query language.
+    order: str | None
+        Order criterion within a page ('count', 'relevance', 'name', ...).
+    prefixes: Sequence[str] | None
+        Display name prefixes to shard the keyspace by.
+    page_size: int, default 1000
+        Folders per request (the server allows at most 1000).
+    concurrency: int, default 4
+        Maximum number of requests in flight.
+    return_empty_folders: bool, default False
+        Also return folders with a count of zero.
+
+    Example
+    -------
+    >>> scanner = FacetScanner(swa.client, "p", "documents", "custodian")
+    >>> facet = await scanner.collect()
+    >>> top = facet.counts_array().argsort()[::-1][:10]
+    """
+
+    def __init__(
+        self,
+        client: SearchWebApiClient,
+        project_id: str,
+        collection_id: str,
+        field_id: str,
+        *,
+        query: str = "*",
+        join_restriction: str | None = None,
+        language: str | None = None,
+        order: str | None = None,
+        prefixes: Sequence[str] | None = None,
+        page_size: int = MAX_FACET_PAGE_SIZE,
+        concurrency: int = 4,
+        return_empty_folders: bool = False,
+    ) -> None:
+        if not 1 <= page_size <= MAX_FACET_PAGE_SIZE:
+            raise ValueError(f"page_size must be between 1 and {MAX_FACET_PAGE_SIZE}")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self._values = (
+            client.projects.by_project_id(project_id)
+            .collections.by_collection_id(collection_id)
+            .filters.by_field_id(field_id)
+            .values
+        )
+        self.field_id = field_id
+        self.query = query
+        self.join_restriction = join_restriction
+        self.language = language
+        self.order = order
+        self.prefixes = list(prefixes) if prefixes else None
+        self.page_size = page_size
+        self.concurrency = concurrency
+        self.return_empty_folders = return_empty_folders
+        self._semaphore: asyncio.Semaphore | None = None
+
+    async def fetch(self, *, offset: int, limit: int, prefix: str | None) -> FolderValuesResult:
+        """Fetch one page of folders."""
+        params = ValuesRequestBuilder.ValuesRequestBuilderGetQueryParameters(
+            query=self.query,
+            join_restriction=self.join_restriction,
+            language=self.language,
+            order=self.order,
+            prefix=prefix,
+            offset=offset,
+            limit=limit,
+            return_empty_folders=self.return_empty_folders or None,
+        )
+        semaphore = self._semaphore or asyncio.Semaphore(self.concurrency)
+        async with semaphore:
+            content = await self._values.get(
+                request_configuration=RequestConfiguration(query_parameters=params)
+            )
+        return decode_model(content or b"{}", FolderValuesResult)
+
+    async def _scan_shard(
+        self, prefix: str | None, emit: Callable[[list[FolderRecord]], Awaitable[None]]
+    ) -> None:
+        first = await self.fetch(offset=0, limit=self.page_size, prefix=prefix)
+        await emit(first.results or [])
+        if len(first.results or ()) < self.page_size:
+            return
+        total = first.number_results
+        if total is not None and total < UNKNOWN_NUMBER_RESULTS:
+
+            async def page(offset: int) -> None:
+                result = await self.fetch(offset=offset, limit=self.page_size, prefix=prefix)
+                await emit(result.results or [])
+
+            await asyncio.gather(*(page(o) for o in range(self.page_size, total, self.page_size)))
+            return
+        offset = self.page_size
+        while True:
+            result = await self.fetch(offset=offset, limit=self.page_size, prefix=prefix)
+            await emit(result.results or [])
+            if len(result.results or ()) < self.page_size:
+                return
+            offset += self.page_size
+
+    async def records(self) -> AsyncIterator[FolderRecord]:
+        """Yield the folders of all shards as pages arrive (not in `order`)."""
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        queue: asyncio.Queue[object] = asyncio.Queue(maxsize=2 * self.concurrency)
+
+        prefixes: list[str | None] = list(self.prefixes) if self.prefixes else [None]
+        shards = [asyncio.create_task(self._scan_shard(p, queue.put)) for p in prefixes]
+
+        async def run() -> None:
+            # _DONE is only sent when the scan ends: after a cancellation nobody
+            # drains the queue, and waiting for room in it would never return.
+            try:
+                await asyncio.gather(*shards)
+            except Exception:
+                for task in shards:
+                    task.cancel()
+                await queue.put(_DONE)
+                raise
+            await queue.put(_DONE)
+
+        runner = asyncio.create_task(run())
+        try:
+            while (page := await queue.get()) is not _DONE:
+                for record in page:  # type: ignore[attr-defined]
+                    yield record
+            await runner  # re-raises a failed request
+        finally:
+            for task in (runner, *shards):
+                task.cancel()
+            await asyncio.gather(runner, *shards, return_exceptions=True)
+            self._semaphore = None
+
+    async def expected_count(self) -> int | None:
+        """Number of folders of the unsharded facet, if the server reports it."""
+        result = await self.fetch(offset=0, limit=1, prefix=None)
+        total = result.number_results
+        return total if total is not None and total < UNKNOWN_NUMBER_RESULTS else None
+
+    async def collect(self) -> FacetValues:
+        """Enumerate the whole facet into columns; folders seen twice are kept once."""
+        facet = FacetValues(field_id=self.field_id)
+        seen: set[str] = set()
+        async for record in self.records():
+            folder_id = record.id or ""
+            if folder_id in seen:
+                continue
+            seen.add(folder_id)
+            facet.ids.append(folder_id)
+            facet.display_names.append(record.display_name)
+            facet.counts.append(record.count or 0)
+        if self.prefixes:
+            facet.expected_count = await self.expected_count()
+            if facet.complete is False:
+                logger.warning(
+                    "Prefixes of %s cover %d of %d folders",
+                    self.field_id,
+                    len(facet),
+                    facet.expected_count,
+                )
+        return facet
+
+
+__all__ = ["FacetScanner", "FacetValues"]
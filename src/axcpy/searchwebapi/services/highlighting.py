@@ -0,0 +1,481 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import weakref
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Iterable, Sequence
+from contextlib import aclosing
+from typing import Literal, NamedTuple, cast
+
+from kiota_abstractions.base_request_configuration import RequestConfiguration
+from pydantic import BaseModel, Field
+
+from axcpy.searchwebapi.generated.models.highlight_result_entity import HighlightResultEntity
+from axcpy.searchwebapi.generated.models.highlighted_word_result import HighlightedWordResult
+from axcpy.searchwebapi.generated.models.record import Record
+from axcpy.searchwebapi.generated.models.search_result_highlighting_result import (
+    SearchResultHighlightingResult,
+)
+from axcpy.searchwebapi.generated.projects.item.collections.item.records.item.in_document_search.in_document_search_request_builder import (  # noqa: E501
+    InDocumentSearchRequestBuilder,
+)
+from axcpy.searchwebapi.generated.projects.item.collections.item.search.highlight_expression.highlight_expression_request_builder import (  # noqa: E501
+    HighlightExpressionRequestBuilder,
+)
+from axcpy.searchwebapi.generated.search_web_api_client import SearchWebApiClient
+
+from .cache import SearchCache, SearchKey
+from .concurrency import bounded_map
+from .decoding import decode_model
+from .endpoints import RecordContentQueryParameters, collection_endpoints
+from .paging import join_values
+
+logger = logging.getLogger(__name__)
+
+# Hit categories of a HighlightedWordResult, by attribute name.
+HIT_KINDS = ("search_terms", "concept_terms", "training_terms", "user_terms")
+
+SearchOutcome = tuple[str, HighlightedWordResult | None, Exception | None]
+
+
+async def fetch_highlight_expression(
+    client: SearchWebApiClient,
+    project_id: str,
+    collection_id: str,
+    *,
+    query: str,
+    join_restriction: str | None = None,
+    language: str | None = None,
+) -> dict[str, str]:
+    """Regular expressions matching the words of a search, by field ('*' for all fields)."""
+    params = HighlightExpressionRequestBuilder.HighlightExpressionRequestBuilderGetQueryParameters(
+        query=query,
+        join_restriction=join_restriction,
+        language=language,
+    )
+    content = await (
+        client.projects.by_project_id(project_id)
+        .collections.by_collection_id(collection_id)
+        .search.highlight_expression.get(
+            request_configuration=RequestConfiguration(query_parameters=params)
+        )
+    )
+    result = decode_model(content or b"{}", SearchResultHighlightingResult)
+    return {h.field or "*": h.regular_expression or "" for h in result.results or ()}
+
+
+class HighlightExpressionCache:
+    """Memoized ``search/highlightExpression`` results.
+
+    Expressions are keyed by collection, query, join restriction and language
+    and kept for `ttl` seconds; concurrent requests for the same search share a
+    single fetch. `DocumentHighlighter` and `InDocumentSearchBatch` use the
+    client's shared cache (see `highlight_expressions`) unless given another
+    one, so every search is compiled once, however many documents are opened
+    under it.
+
+    Parameters
+    ----------
+    client: SearchWebApiClient
+        Client of an authenticated session.
+    max_entries: int, default 256
+        Maximum number of memoized expressions.
+    ttl: float | None, default 600.0
+        Seconds an expression stays valid; None keeps it until evicted.
+    cache: SearchCache | None
+        Cache to store the expressions in (its own limits apply); a new one if None.
+    """
+
+    def __init__(
+        self,
+        client: SearchWebApiClient,
+        *,
+        max_entries: int = 256,
+        ttl: float | None = 600.0,
+        cache: SearchCache | None = None,
+    ) -> None:
+        self._client = client
+        self.cache = cache if cache is not None else SearchCache(max_entries=max_entries, ttl=ttl)
+
+    def cached(
+        self,
+        project_id: str,
+        collection_id: str,
+        *,
+        query: str,
+        join_restriction: str | None = None,
+        language: str | None = None,
+    ) -> dict[str, str] | None:
+        """The memoized expression, or None without fetching it."""
+        key = SearchKey(
+            "highlightExpression", project_id, collection_id, query, join_restriction, language
+        )
+        return cast("dict[str, str] | None", self.cache.get(key, count=False))
+
+    async def get(
+        self,
+        project_id: str,
+        collection_id: str,
+        *,
+        query: str,
+        join_restriction: str | None = None,
+        language: str | None = None,
+    ) -> dict[str, str]:
+        """The highlight expression of a search, fetched on first use."""
+        key = SearchKey(
+            "highlightExpression", project_id, collection_id, query, join_restriction, language
+        )
+        return await self.cache.get_or_fetch(
+            key,
+            lambda: fetch_highlight_expression(
+                self._client,
+                project_id,
+                collection_id,
+                query=query,
+                join_restriction=join_restriction,
+                language=language,
+            ),
+        )
+
+    def invalidate(self, project_id: str, collection_id: str | None = None) -> int:
+        """Drop memoized expressions, e.g. after the thesaurus was changed."""
+        return self.cache.invalidate(project_id, collection_id)
+
+
+_EXPRESSIONS: weakref.WeakKeyDictionary[SearchWebApiClient, HighlightExpressionCache] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def highlight_expressions(client: SearchWebApiClient) -> HighlightExpressionCache:
+    """Shared `HighlightExpressionCache` of a client, created on first use."""
+    expressions = _EXPRESSIONS.get(client)
+    if expressions is None:
+        # a proxy, so that the shared cache does not keep its own key alive
+        expressions = _EXPRESSIONS[client] = HighlightExpressionCache(weakref.proxy(client))
+    return expressions
+
+
+class HighlightedContent(NamedTuple):
+    """A record's content with search-term highlighting and the search's expression."""
+
+    record_id: str
+    record: Record
+    expression: dict[str, str]
+
+
+class DocumentHighlighter:
+    """Open documents with highlighting for one search through ``records/{recordId}/content``.
+
+    The search's highlight expression comes from a `HighlightExpressionCache`:
+    when it is not memoized yet it is fetched concurrently with the first
+    document, and every further document of the search costs a single request.
+
+    Parameters
+    ----------
+    client: SearchWebApiClient
+        Client of an authenticated session.
+    project_id: str
+        Project of the records.
+    collection_id: str
+        Collection of the records.
+    query: str
+        Query whose hits are highlighted.
+    join_restriction: str | None
+        Restriction on a joined collection.
+    language: str | None
+        Query language.
+    user_terms: str | Sequence[str] | None
+        Additional terms to highlight.
+    fields: str | Sequence[str] | None
+        Fields to return with the content.
+    fields_highlighted: str | Sequence[str] | None
+        Fields to return as XML with highlighting applied.
+    hit_navigation: str | None
+        Highlighted position to return: 'first', 'previous', 'next', 'last',
+        'firstUser' or 'nextUser'.
+    expressions: HighlightExpressionCache | None
+        Expression cache; the client's shared one if None.
+
+    Example
+    -------
+    >>> expressions = HighlightExpressionCache(swa.client)
+    >>> viewer = DocumentHighlighter(
+    ...     swa.client, "p", "documents", query="york", expressions=expressions
+    ... )
+    >>> doc = await viewer.content(record_id, page=2)
+    >>> doc.record.body, doc.expression["*"]
+    """
+
+    def __init__(
+        self,
+        client: SearchWebApiClient,
+        project_id: str,
+        collection_id: str,
+        *,
+        query: str,
+        join_restriction: str | None = None,
+        language: str | None = None,
+        user_terms: str | Sequence[str] | None = None,
+        fields: str | Sequence[str] | None = None,
+        fields_highlighted: str | Sequence[str] | None = None,
+        hit_navigation: str | None = None,
+        expressions: HighlightExpressionCache | None = None,
+    ) -> None:
+        self._endpoints = collection_endpoints(client, project_id, collection_id)
+        self.project_id = project_id
+        self.collection_id = collection_id
+        self.query = query
+        self.join_restriction = join_restriction
+        self.language = language
+        self.expressions = expressions if expressions is not None else highlight_expressions(client)
+        self.user_terms = join_values(user_terms)
+        self.fields = join_values(fields)
+        self.fields_highlighted = join_values(fields_highlighted)
+        self.hit_navigation = hit_navigation
+
+    def highlight_expression(self) -> Awaitable[dict[str, str]]:
+        """The search's highlight expression, from the cache or fetched."""
+        return self.expressions.get(
+            self.project_id,
+            self.collection_id,
+            query=self.query,
+            join_restriction=self.join_restriction,
+            language=self.language,
+        )
+
+    def query_parameters(self, page: int | None = None) -> RecordContentQueryParameters:
+        return RecordContentQueryParameters(
+            body=True,
+            fields=self.fields,
+            fields_highlighted=self.fields_highlighted,
+            highlight_search_term_query=self.query,
+            highlight_search_term_join_restriction=self.join_restriction,
+            highlight_search_term_language=self.language,
+            highlight_user_terms=self.user_terms,
+            highlight_hit_navigation=self.hit_navigation,
+            page=page,
+        )
+
+    async def _record(self, record_id: str, page: int | None) -> Record:
+        content = await self._endpoints.get_record_content(record_id, self.query_parameters(page))
+        return decode_model(content or b"{}", Record)
+
+    async def content(self, record_id: str, *, page: int | None = None) -> HighlightedContent:
+        """One document (or one `page` of it) with the search's hits highlighted."""
+        expression = self.expressions.cached(
+            self.project_id,
+            self.collection_id,
+            query=self.query,
+            join_restriction=self.join_restriction,
+            language=self.language,
+        )
+        if expression is not None:
+            return HighlightedContent(record_id, await self._record(record_id, page), expression)
+        expression, record = await asyncio.gather(
+            self.highlight_expression(), self._record(record_id, page)
+        )
+        return HighlightedContent(record_id, record, expression or {})
+
+
+class HitTable(BaseModel):
+    """Columnar in-document hits of a batch.
+
+    The hit columns (`record_ids`, `kinds`, `pages`, `locations`) hold one entry
+    per hit. `pages` are 1-based page numbers, 0 where the server did not report
+    pages. `locations` are relative positions (0.0 = start, 1.0 = end) within the
+    page or the document, depending on the batch's `relative_to`. The term
+    columns (`term_record_ids`, `term_kinds`, `terms`) list the distinct terms
+    highlighted per document; the API does not attribute individual hits to terms.
+    """
+
+    expression: dict[str, str] = Field(default_factory=dict)
+    record_ids: list[str] = Field(default_factory=list)
+    kinds: list[str] = Field(default_factory=list)
+    pages: list[int] = Field(default_factory=list)
+    locations: list[float] = Field(default_factory=list)
+    term_record_ids: list[str] = Field(default_factory=list)
+    term_kinds: list[str] = Field(default_factory=list)
+    terms: list[str] = Field(default_factory=list)
+    hit_counts: dict[str, int] = Field(default_factory=dict)
+    errors: dict[str, str] = Field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.record_ids)
+
+    def add(self, record_id: str, result: HighlightedWordResult) -> None:
+        """Append the hits of one document."""
+        total = 0
+        for kind in HIT_KINDS:
+            entity: HighlightResultEntity | None = getattr(result, kind)
+            if entity is None:
+                continue
+            locations = entity.hit_locations_rel or []
+            by_page = entity.number_hits_by_page or []
+            if by_page and sum(by_page) == len(locations):
+                pages = [page for page, n in enumerate(by_page, start=1) for _ in range(n)]
+            else:
+                pages = [0] * len(locations)
+            self.record_ids.extend([record_id] * len(locations))
+            self.kinds.extend([kind] * len(locations))
+            self.pages.extend(pages)
+            self.locations.extend(locations)
+            for term in entity.terms_to_highlight or ():
+                self.term_record_ids.append(record_id)
+                self.term_kinds.append(kind)
+                self.terms.append(term)
+            total += entity.number_hits if entity.number_hits is not None else len(locations)
+        self.hit_counts[record_id] = total
+
+
+class InDocumentSearchBatch:
+    """Run ``records/{recordId}/inDocumentSearch`` for a stream of records.
+
+    The highlight expression of the query is resolved once through
+    ``search/highlightExpression`` before the batch starts: this validates the
+    query before thousands of requests are issued and is returned with the hit
+    table for client-side highlighting. All documents are then searched with
+    identical highlight parameters, so the server evaluates the query once for
+    the session and reuses its cached search. Up to `concurrency` documents are
+    searched at a time and the record ids are consumed lazily.
+
+    Parameters
+    ----------
+    client: SearchWebApiClient
+        Client of an authenticated session.
+    project_id: str
+        Project of the records.
+    collection_id: str
+        Collection of the records.
+    query: str
+        Query whose hits are located in each document.
+    join_restriction: str | None
+        Restriction on a joined collection.
+    language: str | None
+        Query language.
+    user_terms: str | Sequence[str] | None
+        Additional terms to highlight (reported as kind ``user_terms``).
+    content_field_names: str | Sequence[str] | None
+        XML content tags to search; defaults to the project's content tags.
+    page_tag: str | None
+        XML tag delimiting pages.
+    relative_to: "page" | "document", default "page"
+        Whether hit locations are relative to their page or to the document.
+    concurrency: int, default 8
+        Maximum number of documents searched concurrently.
+    expressions: HighlightExpressionCache | None
+        Shared expression cache, so batches and `DocumentHighlighter` instances
+        of the same search reuse one expression; the client's shared one if None.
+
+    Example
+    -------
+    >>> batch = InDocumentSearchBatch(swa.client, "p", "documents", query=privilege_screen)
+    >>> table = await batch.run(record_ids)
+    >>> table.record_ids[:3], table.pages[:3]
+    """
+
+    def __init__(
+        self,
+        client: SearchWebApiClient,
+        project_id: str,
+        collection_id: str,
+        *,
+        query: str,
+        join_restriction: str | None = None,
+        language: str | None = None,
+        user_terms: str | Sequence[str] | None = None,
+        content_field_names: str | Sequence[str] | None = None,
+        page_tag: str | None = None,
+        relative_to: Literal["page", "document"] = "page",
+        concurrency: int = 8,
+        expressions: HighlightExpressionCache | None = None,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if relative_to not in ("page", "document"):
+            raise ValueError("relative_to must be 'page' or 'document'")
+        self._client = client
+        self._records = (
+            client.projects.by_project_id(project_id)
+            .collections.by_collection_id(collection_id)
+            .records
+        )
+        self.project_id = project_id
+        self.collection_id = collection_id
+        self.query = query
+        self.join_restriction = join_restriction
+        self.language = language
+        self.concurrency = concurrency
+        self.expressions = expressions if expressions is not None else highlight_expressions(client)
+        self.expression: dict[str, str] | None = None
+        self._params = (
+            InDocumentSearchRequestBuilder.InDocumentSearchRequestBuilderGetQueryParameters(
+                highlight_search_term_query=query,
+                highlight_search_term_join_restriction=join_restriction,
+                highlight_search_term_language=language,
+                highlight_user_terms=join_values(user_terms),
+                content_field_names=join_values(content_field_names),
+                page_tag=page_tag,
+                request_hit_locations_page_relative=relative_to == "page" or None,
+                request_hit_locations_document_relative=relative_to == "document" or None,
+            )
+        )
+
+    async def highlight_expression(self) -> dict[str, str]:
+        """The query's highlight expression, fetched on first use."""
+        if self.expression is None:
+            self.expression = await self.expressions.get(
+                self.project_id,
+                self.collection_id,
+                query=self.query,
+                join_restriction=self.join_restriction,
+                language=self.language,
+            )
+        return self.expression
+
+    async def search(self, record_id: str) -> HighlightedWordResult:
+        """Hits of the query in one document."""
+        content = await self._records.by_record_id(record_id).in_document_search.get(
+            request_configuration=RequestConfiguration(query_parameters=self._params)
+        )
+        return decode_model(content or b"{}", HighlightedWordResult)
+
+    async def results(
+        self, record_ids: Iterable[str] | AsyncIterable[str]
+    ) -> AsyncIterator[SearchOutcome]:
+        """Yield ``(record_id, result, error)`` in completion order.
+
+        Exactly one of `result` and `error` is set. Errors are reported
+        separately because generated API results are exceptions themselves
+        (kiota raises the error-mapped `HighlightedWordResult`).
+        """
+        await self.highlight_expression()
+        async with aclosing(
+            bounded_map(self.search, record_ids, concurrency=self.concurrency)
+        ) as outcomes:
+            async for record_id, result, error in outcomes:
+                if error is not None:
+                    logger.warning("In-document search of %s failed: %s", record_id, error)
+                yield record_id, result, error
+
+    async def run(self, record_ids: Iterable[str] | AsyncIterable[str]) -> HitTable:
+        """Search all documents and collect their hits into a `HitTable`."""
+        table = HitTable()
+        async for record_id, result, error in self.results(record_ids):
+            if result is not None:
+                table.add(record_id, result)
+            else:
+                table.errors[record_id] = str(error) or type(error).__name__
+        table.expression = self.expression or {}
+        return table
+
+
+__all__ = [
+    "DocumentHighlighter",
+    "HighlightExpressionCache",
+    "HighlightedContent",
+    "HitTable",
+    "InDocumentSearchBatch",
+    "fetch_highlight_expression",
+    "highlight_expressions",
+]
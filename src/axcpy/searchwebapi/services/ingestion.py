@@ -0,0 +1,379 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import time
+from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator, Iterable
+from contextlib import aclosing
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel
+
+from axcpy.searchwebapi.generated.models.finish_transaction_request import (
+    FinishTransactionRequest,
+)
+from axcpy.searchwebapi.generated.models.insert_remove_request import InsertRemoveRequest
+from axcpy.searchwebapi.generated.models.insert_remove_result import InsertRemoveResult
+from axcpy.searchwebapi.generated.models.job_status import JobStatus
+from axcpy.searchwebapi.generated.models.record_data import RecordData
+from axcpy.searchwebapi.generated.models.start_transaction_request import (
+    StartTransactionRequest,
+)
+from axcpy.searchwebapi.generated.models.start_transaction_result import (
+    StartTransactionResult,
+)
+from axcpy.searchwebapi.generated.search_web_api_client import SearchWebApiClient
+
+from .decoding import decode_model
+from .paging import records_builder
+
+if TYPE_CHECKING:
+    from .cache import SearchCache
+
+logger = logging.getLogger(__name__)
+
+GIGABYTE = 1024**3
+FAILED_JOB_STATES = frozenset({JobStatus.FATAL, JobStatus.STOPPED})
+
+
+def record_size(record: RecordData) -> int:
+    """Approximate serialized size of a record in bytes (field names plus values)."""
+    size = len(record.unique_id or "") + 32
+    for field in record.field_data or ():
+        size += len(field.field_name or "") + 16
+        if field.value is not None:
+            size += len(field.value)
+        for value in field.value_list or ():
+            size += len(value) + 3
+    return size
+
+
+class IngestionState(BaseModel):
+    """Resumable progress of a bulk ingestion.
+
+    `uploaded_records` counts the leading records of the input stream whose
+    buffers were all acknowledged; a resumed run skips exactly that many.
+    """
+
+    indexing_buffer_id: str | None = None
+    uploaded_records: int = 0
+    uploaded_bytes: int = 0
+    uploaded_buffers: int = 0
+    job_id: str | None = None
+
+
+class IngestionReport(BaseModel):
+    """Outcome of an ingestion run."""
+
+    indexing_buffer_id: str
+    documents: int
+    bytes: int
+    buffers: int
+    upload_seconds: float
+    resumed_documents: int = 0
+    job_id: str | None = None
+    job_status: JobStatus | None = None
+
+    @property
+    def documents_per_second(self) -> float:
+        """Upload rate of this run (documents skipped on resume are not counted)."""
+        uploaded = self.documents - self.resumed_documents
+        return uploaded / self.upload_seconds if self.upload_seconds else 0.0
+
+
+class BulkIngestion:
+    """Insert a stream of `RecordData` through a bulk insert/remove transaction.
+
+    The pipeline opens a transaction (``records/bulkInsertRemoveTransaction``),
+    cuts the input into buffers bounded by record count and approximate size,
+    uploads up to `concurrency` buffers at a time to
+    ``{indexingBufferId}/buffer`` (the input is only consumed as fast as uploads
+    complete), finishes the transaction with a `FinishTransactionRequest` and
+    polls ``end/{jobId}`` until the indexing job is done.
+
+    Progress is kept in `state` and, if `state_path` is given, persisted after
+    every acknowledged buffer. After a failure, create a new `BulkIngestion`
+    with the same `state_path` and pass the same input again: the transaction
+    buffer is reused and records already uploaded are skipped. Records of
+    buffers that were in flight during the failure are sent again.
+
+    Parameters
+    ----------
+    client: SearchWebApiClient
+        Client of an authenticated session.
+    project_id: str
+        Target project.
+    collection_id: str
+        Target collection.
+    data_source_id: str
+        Name of the data source used to track the transaction.
+    max_records: int, default 1000
+        Maximum records per buffer.
+    max_bytes: int, default 8 MiB
+        Maximum approximate size per buffer (see `record_size`).
+    concurrency: int, default 4
+        Maximum number of buffers uploaded concurrently.
+    poll_interval: float, default 2.0
+        Seconds between job status requests.
+    state_path: str | Path | None
+        JSON file used to persist `IngestionState` for resuming.
+    cache: SearchCache | None
+        Search cache whose entries for the collection are invalidated when the
+        indexing job ends.
+
+    Example
+    -------
+    >>> ingestion = BulkIngestion(swa.client, "p", "documents", data_source_id="crawler")
+    >>> report = await ingestion.run(records)
+    >>> print(f"{report.documents_per_second:.0f} docs/s")
+    """
+
+    def __init__(
+        self,
+        client: SearchWebApiClient,
+        project_id: str,
+        collection_id: str,
+        *,
+        data_source_id: str,
+        max_records: int = 1000,
+        max_bytes: int = 8 * 1024 * 1024,
+        concurrency: int = 4,
+        poll_interval: float = 2.0,
+        state_path: str | Path | None = None,
+        cache: SearchCache | None = None,
+    ) -> None:
+        if max_records < 1:
+            raise ValueError("max_records must be at least 1")
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self._transactions = records_builder(
+            client, project_id, collection_id
+        ).bulk_insert_remove_transaction
+        self.project_id = project_id
+        self.collection_id = collection_id
+        self.cache = cache
+        self.data_source_id = data_source_id
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.state_path = Path(state_path) if state_path is not None else None
+        self.state = self._load_state()
+
+    def _load_state(self) -> IngestionState:
+        if self.state_path is not None and self.state_path.exists():
+            state = IngestionState.model_validate_json(self.state_path.read_text(encoding="utf-8"))
+            logger.info(
+                "Resuming ingestion into buffer %s after %d records",
+                state.indexing_buffer_id,
+                state.uploaded_records,
+            )
+            return state
+        return IngestionState()
+
+    def _save_state(self) -> None:
+        if self.state_path is None:
+            return
+        tmp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+        tmp_path.write_text(self.state.model_dump_json(), encoding="utf-8")
+        os.replace(tmp_path, self.state_path)
+
+    async def start(self) -> str:
+        """Open the transaction buffer (or reuse the one from a resumed state)."""
+        if self.state.indexing_buffer_id:
+            return self.state.indexing_buffer_id
+        content = await self._transactions.post(
+            StartTransactionRequest(data_source_id=self.data_source_id)
+        )
+        result = decode_model(content or b"{}", StartTransactionResult)
+        if not result.indexing_buffer_id:
+            raise RuntimeError("SearchWebAPI did not return an indexing buffer id")
+        self.state.indexing_buffer_id = result.indexing_buffer_id
+        self._save_state()
+        return result.indexing_buffer_id
+
+    async def _chunks(
+        self, records: Iterable[RecordData] | AsyncIterable[RecordData]
+    ) -> AsyncGenerator[tuple[list[RecordData], int]]:
+        skip = self.state.uploaded_records
+        chunk: list[RecordData] = []
+        chunk_bytes = 0
+
+        async def iterate() -> AsyncIterator[RecordData]:
+            if isinstance(records, AsyncIterable):
+                async for record in records:
+                    yield record
+            else:
+                for record in records:
+                    yield record
+
+        async for record in iterate():
+            if skip:
+                skip -= 1
+                continue
+            size = record_size(record)
+            if chunk and (len(chunk) >= self.max_records or chunk_bytes + size > self.max_bytes):
+                yield chunk, chunk_bytes
+                chunk, chunk_bytes = [], 0
+            chunk.append(record)
+            chunk_bytes += size
+        if chunk:
+            yield chunk, chunk_bytes
+
+    async def upload(self, records: Iterable[RecordData] | AsyncIterable[RecordData]) -> float:
+        """Upload all records into the open transaction; returns the elapsed seconds."""
+        buffer_id = await self.start()
+        buffer = self._transactions.by_indexing_buffer_id(buffer_id).buffer
+        slots = asyncio.Semaphore(self.concurrency)
+        # Kept until the end so every upload's outcome is retrieved by the final gather.
+        tasks: list[asyncio.Task[None]] = []
+        # Buffers complete out of order; only the acknowledged prefix counts as uploaded.
+        done: dict[int, tuple[int, int]] = {}
+        next_to_commit = 0
+        failure: BaseException | None = None
+
+        def commit() -> None:
+            nonlocal next_to_commit
+            while next_to_commit in done:
+                count, size = done.pop(next_to_commit)
+                self.state.uploaded_records += count
+                self.state.uploaded_bytes += size
+                self.state.uploaded_buffers += 1
+                next_to_commit += 1
+            self._save_state()
+
+        async def send(index: int, chunk: list[RecordData], size: int) -> None:
+            nonlocal failure
+            try:
+                content = await buffer.post(InsertRemoveRequest(new_records=chunk))
+                if content:
+                    status = decode_model(content, InsertRemoveResult).status
+                    if status is not None and status.successful is False:
+                        raise RuntimeError(f"Buffer {index} was rejected: {status.error_message}")
+                done[index] = (len(chunk), size)
+                commit()
+            except Exception as e:
+                failure = failure or e
+                raise
+            finally:
+                slots.release()
+
+        outcomes: list[BaseException | None] = []
+        started = time.perf_counter()
+        try:
+            index = 0
+            async with aclosing(self._chunks(records)) as chunks:
+                async for chunk, size in chunks:
+                    await slots.acquire()  # backpressure: wait for a free upload slot
+                    if failure is not None:
+                        slots.release()
+                        break
+                    tasks.append(asyncio.create_task(send(index, chunk, size)))
+                    index += 1
+            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            for task in tasks:
+                task.cancel()
+        if failure is not None:
+            failed = sum(isinstance(outcome, BaseException) for outcome in outcomes)
+            logger.warning(
+                "Ingestion failed after %d records (%d of %d buffers failed): %s",
+                self.state.uploaded_records,
+                failed,
+                len(tasks),
+                failure,
+            )
+            raise failure
+        return time.perf_counter() - started
+
+    async def finish(
+        self, *, analyzed_size_gb: int | None = None, timeout: float | None = None
+    ) -> JobStatus:
+        """End the transaction and wait until the indexing job has finished.
+
+        Raises
+        ------
+        RuntimeError
+            If the job ends in a failed state.
+        TimeoutError
+            If the job does not finish within `timeout` seconds.
+        """
+        if not self.state.indexing_buffer_id:
+            raise RuntimeError("No transaction has been started")
+        end = self._transactions.by_indexing_buffer_id(self.state.indexing_buffer_id).end
+        if self.state.job_id is None:
+            if analyzed_size_gb is None:
+                analyzed_size_gb = math.ceil(self.state.uploaded_bytes / GIGABYTE)
+            finished = await end.post(
+                FinishTransactionRequest(
+                    number_documents=self.state.uploaded_records,
+                    analyzed_size_gb=analyzed_size_gb,
+                )
+            )
+            if finished is None or not finished.job_id:
+                raise RuntimeError("SearchWebAPI did not return a job id")
+            self.state.job_id = finished.job_id
+            self._save_state()
+
+        job = end.by_job_id(self.state.job_id)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                job_response = await job.get()
+                status = job_response.job_status if job_response else None
+                logger.debug("Ingestion job %s is %s", self.state.job_id, status)
+                if status == JobStatus.FINISHED:
+                    break
+                if status in FAILED_JOB_STATES:
+                    raise RuntimeError(f"Ingestion job {self.state.job_id} ended as {status.value}")
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(f"Ingestion job {self.state.job_id} did not finish in time")
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate(self.project_id, self.collection_id)
+
+        if self.state_path is not None:
+            self.state_path.unlink(missing_ok=True)
+        return status
+
+    async def run(
+        self,
+        records: Iterable[RecordData] | AsyncIterable[RecordData],
+        *,
+        analyzed_size_gb: int | None = None,
+        timeout: float | None = None,
+    ) -> IngestionReport:
+        """Start, upload all records, finish and wait for the indexing job."""
+        resumed = self.state.uploaded_records
+        elapsed = await self.upload(records)
+        report = IngestionReport(
+            indexing_buffer_id=self.state.indexing_buffer_id or "",
+            documents=self.state.uploaded_records,
+            bytes=self.state.uploaded_bytes,
+            buffers=self.state.uploaded_buffers,
+            upload_seconds=elapsed,
+            resumed_documents=resumed,
+        )
+        logger.info(
+            "Uploaded %d documents in %.1fs (%.0f docs/s)",
+            report.documents - resumed,
+            elapsed,
+            report.documents_per_second,
+        )
+        report.job_status = await self.finish(analyzed_size_gb=analyzed_size_gb, timeout=timeout)
+        report.job_id = self.state.job_id
+        return report
+
+
+__all__ = [
+    "BulkIngestion",
+    "IngestionReport",
+    "IngestionState",
+    "record_size",
+]
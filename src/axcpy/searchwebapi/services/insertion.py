@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import secrets
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Mapping, Sequence
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import httpx
+from pydantic import BaseModel
+
+from axcpy.searchwebapi.generated.models.field_data import FieldData
+from axcpy.searchwebapi.generated.models.insert_remove_request import InsertRemoveRequest
+from axcpy.searchwebapi.generated.models.insert_remove_result import InsertRemoveResult
+from axcpy.searchwebapi.generated.models.record_data import RecordData
+
+from .concurrency import bounded_map
+from .decoding import decode_model
+from .session import SearchWebApiSession
+
+if TYPE_CHECKING:
+    from .cache import SearchCache
+
+logger = logging.getLogger(__name__)
+
+ATTACHMENT_ROOT_FIELD = "rm_attachmentroot"
+CRAWL_ID_FIELD = "rm_crawlid"
+CHECKSUM_FIELD = "rm_checksum"
+MODIFICATION_DATE_FIELD = "rm_modificationdate"
+NATIVE_FIELD = "rm_native"
+
+StreamSource = str | os.PathLike[str] | bytes | Iterable[bytes] | AsyncIterable[bytes]
+
+
+def format_date(value: datetime) -> str:
+    """Format a date as ``yyyy-MM-dd'T'HH:mm:ss.SSSXXX`` in UTC."""
+    if value.tzinfo is None:
+        value = value.astimezone()
+    return value.astimezone(UTC).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+@dataclass
+class InsertDocument:
+    """A document to insert with its content streams and native.
+
+    `content` streams are XML documents for the collection's content field(s);
+    the server concatenates several streams. Sources are file paths, bytes, or
+    (async) iterables of byte chunks; files are read chunk by chunk while they
+    are sent.
+    """
+
+    unique_id: str
+    fields: Mapping[str, str | Sequence[str]] = field(default_factory=dict)
+    content: Sequence[StreamSource] = ()
+    native: StreamSource | None = None
+    native_filename: str | None = None
+    attachment_root: str | None = None
+    modification_date: datetime | None = None
+
+
+class InsertResult(BaseModel):
+    """Outcome of inserting one document."""
+
+    unique_id: str
+    checksum: str | None = None
+    bytes_sent: int = 0
+    error: str | None = None
+
+
+def _is_path(source: StreamSource) -> bool:
+    return isinstance(source, str | os.PathLike)
+
+
+class _Part:
+    """One binary part of the multipart body."""
+
+    def __init__(self, source: StreamSource, filename: str, content_type: str) -> None:
+        self.source = source
+        self.filename = filename
+        self.content_type = content_type
+
+    async def chunks(self, chunk_size: int) -> AsyncIterator[bytes]:
+        source = self.source
+        if isinstance(source, bytes):
+            for start in range(0, len(source), chunk_size):
+                yield source[start : start + chunk_size]
+        elif isinstance(source, str | os.PathLike):
+            with open(source, "rb") as handle:
+                while chunk := handle.read(chunk_size):
+                    yield chunk
+        elif isinstance(source, AsyncIterable):
+            async for chunk in source:
+                yield chunk
+        else:
+            for chunk in source:
+                yield chunk
+
+
+class MultipartInserter:
+    """Insert documents with ``POST records/insertRemoveTransaction`` as streamed multipart.
+
+    Each document becomes one ``multipart/form-data`` request whose ``binaries``
+    parts are its XML content streams and native, read from disk (or the given
+    iterables) chunk by chunk while the request is sent, so memory use does not
+    depend on file sizes. Streamed fields reference their part by index as
+    required by the API (`content_field`, ``rm_native``).
+
+    The mandatory bookkeeping fields are filled in unless given in
+    `InsertDocument.fields`: ``rm_attachmentroot`` (the document itself),
+    ``rm_crawlid`` (`crawl_id`), ``rm_modificationdate`` (the document's date,
+    else the native's file time, else now) and ``rm_checksum``, the digest of
+    the native (or of the content streams without native) computed while
+    streaming. The JSON ``request`` part is therefore sent after the binaries.
+
+    Parameters
+    ----------
+    session: SearchWebApiSession
+        Authenticated session; its pooled HTTP client is used for streaming.
+    project_id: str
+        Target project.
+    collection_id: str
+        Target collection.
+    crawl_id: str
+        Value of ``rm_crawlid`` for all inserted documents.
+    content_field: str, default "content"
+        Content field the XML streams are inserted into.
+    concurrency: int, default 4
+        Number of insert requests in flight in `insert_many`.
+    chunk_size: int, default 1 MiB
+        Bytes read per chunk.
+    checksum_algorithm: str, default "md5"
+        `hashlib` algorithm for ``rm_checksum``.
+    cache: SearchCache | None
+        Search cache whose entries for the collection are invalidated after
+        every inserted document.
+
+    Example
+    -------
+    >>> inserter = MultipartInserter(swa, "p", "documents", crawl_id="import-7")
+    >>> docs = (InsertDocument(p.stem, content=[p], native=p.with_suffix(".pdf")) for p in xmls)
+    >>> async for result in inserter.insert_many(docs):
+    ...     print(result.unique_id, result.error or "ok")
+    """
+
+    def __init__(
+        self,
+        session: SearchWebApiSession,
+        project_id: str,
+        collection_id: str,
+        *,
+        crawl_id: str,
+        content_field: str = "content",
+        concurrency: int = 4,
+        chunk_size: int = 1024 * 1024,
+        checksum_algorithm: str = "md5",
+        cache: SearchCache | None = None,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        hashlib.new(checksum_algorithm)  # fail early on unknown algorithms
+        self._session = session
+        self._transaction = (
+            session.client.projects.by_project_id(project_id)
+            .collections.by_collection_id(collection_id)
+            .records.insert_remove_transaction
+        )
+        self.project_id = project_id
+        self.collection_id = collection_id
+        self.cache = cache
+        self.crawl_id = crawl_id
+        self.content_field = content_field
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.checksum_algorithm = checksum_algorithm
+
+    def _parts(self, document: InsertDocument) -> list[_Part]:
+        parts = [
+            _Part(source, f"content-{i}.xml", "application/xml")
+            for i, source in enumerate(document.content)
+        ]
+        if document.native is not None:
+            filename = document.native_filename
+            if filename is None:
+                filename = (
+                    os.path.basename(document.native) if _is_path(document.native) else "native"  # type: ignore[arg-type]
+                )
+            parts.append(_Part(document.native, filename, "application/octet-stream"))
+        return parts
+
+    def _modification_date(self, document: InsertDocument) -> datetime:
+        if document.modification_date is not None:
+            return document.modification_date
+        for source in (document.native, *document.content):
+            if source is not None and _is_path(source):
+                return datetime.fromtimestamp(Path(source).stat().st_mtime, tz=UTC)  # type: ignore[arg-type]
+        return datetime.now(UTC)
+
+    def record_data(self, document: InsertDocument, checksum: str) -> RecordData:
+        """RecordData of a document whose binaries are sent in `_parts` order."""
+        values: dict[str, str | Sequence[str]] = {
+            ATTACHMENT_ROOT_FIELD: document.attachment_root or document.unique_id,
+            CRAWL_ID_FIELD: self.crawl_id,
+            MODIFICATION_DATE_FIELD: format_date(self._modification_date(document)),
+            CHECKSUM_FIELD: checksum,
+        }
+        if document.content:
+            values[self.content_field] = (
+                "0"
+                if len(document.content) == 1
+                else [str(i) for i in range(len(document.content))]
+            )
+        if document.native is not None:
+            values[NATIVE_FIELD] = str(len(document.content))
+        values.update(document.fields)
+        return RecordData(
+            unique_id=document.unique_id,
+            field_data=[
+                FieldData(field_name=name, value=value)
+                if isinstance(value, str)
+                else FieldData(field_name=name, value_list=list(value))
+                for name, value in values.items()
+            ],
+        )
+
+    async def _body(
+        self, document: InsertDocument, boundary: str, result: InsertResult
+    ) -> AsyncIterator[bytes]:
+        # rm_checksum covers the native if there is one, else the content streams
+        hasher = hashlib.new(self.checksum_algorithm)
+        for index, part in enumerate(self._parts(document)):
+            hashed = document.native is None or index == len(document.content)
+            yield (
+                f"--{boundary}\r\n"
+                f'Content-Disposition: form-data; name="binaries"; filename="{part.filename}"\r\n'
+                f"Content-Type: {part.content_type}\r\n\r\n"
+            ).encode()
+            async for chunk in part.chunks(self.chunk_size):
+                if hashed:
+                    hasher.update(chunk)
+                result.bytes_sent += len(chunk)
+                yield chunk
+            yield b"\r\n"
+
+        result.checksum = hasher.hexdigest()
+        request = InsertRemoveRequest(new_records=[self.record_data(document, result.checksum)])
+        payload = self._transaction.to_post_request_information(request).content or b""
+        yield (
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="request"\r\n'
+            "Content-Type: application/json\r\n\r\n"
+        ).encode()
+        yield payload
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    async def _send(self, document: InsertDocument) -> InsertResult:
+        result = InsertResult(unique_id=document.unique_id)
+        boundary = secrets.token_hex(16)
+        info = self._transaction.to_post_request_information(InsertRemoveRequest())
+        template = await self._session.to_http_request(info)
+        headers = {
+            k: v
+            for k, v in template.headers.items()
+            if k.lower() not in ("content-type", "content-length", "host")
+        }
+        headers["Content-Type"] = f"multipart/form-data; boundary={boundary}"
+        request = self._session.http_client.build_request(
+            "POST", template.url, headers=headers, content=self._body(document, boundary, result)
+        )
+        response = await self._session.http_client.send(request)
+        response.raise_for_status()
+        if response.content:
+            status = decode_model(response.content, InsertRemoveResult).status
+            if status is not None and status.successful is False:
+                raise RuntimeError(f"Inserting {document.unique_id} failed: {status.error_message}")
+        return result
+
+    async def insert(self, document: InsertDocument) -> InsertResult:
+        """Insert one document.
+
+        Raises
+        ------
+        RuntimeError
+            If the server reports an unsuccessful status.
+        httpx.RequestNotRead
+            If the session expired while streaming from an iterable, which
+            cannot be sent a second time.
+        httpx.HTTPStatusError
+            If the request fails.
+        """
+        try:
+            try:
+                return await self._send(document)
+            except httpx.RequestNotRead:
+                # the session expired and the client cannot replay a streamed body;
+                # files and bytes can be streamed once more after the new login
+                sources = (*document.content, document.native)
+                if not all(s is None or isinstance(s, bytes) or _is_path(s) for s in sources):
+                    raise
+                logger.debug("Re-sending %s after session renewal", document.unique_id)
+                return await self._send(document)
+        finally:
+            if self.cache is not None:  # a failed request may still have inserted it
+                self.cache.invalidate(self.project_id, self.collection_id)
+
+    async def insert_many(
+        self, documents: Iterable[InsertDocument] | AsyncIterable[InsertDocument]
+    ) -> AsyncIterator[InsertResult]:
+        """Insert documents with `concurrency` requests in flight.
+
+        Documents are consumed lazily and results are yielded in completion
+        order; failures are reported through `InsertResult.error`.
+        """
+        async with aclosing(
+            bounded_map(self.insert, documents, concurrency=self.concurrency)
+        ) as outcomes:
+            async for document, result, error in outcomes:
+                if result is None:
+                    logger.warning("Inserting %s failed: %s", document.unique_id, error)
+                    result = InsertResult(unique_id=document.unique_id, error=str(error))
+                yield result
+
+
+__all__ = ["InsertDocument", "InsertResult", "MultipartInserter", "format_date"]
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from kiota_abstractions.base_request_configuration import RequestConfiguration
+
+from axcpy._optional import require_numpy
+from axcpy.searchwebapi.generated.models.dimension_request import DimensionRequest
+from axcpy.searchwebapi.generated.projects.item.collections.item.measures.measures_request_builder import (  # noqa: E501
+    MeasuresRequestBuilder,
+)
+from axcpy.searchwebapi.generated.search_web_api_client import SearchWebApiClient
+
+from .decoding import loads
+
+if TYPE_CHECKING:
+    import numpy as np
+
+DISPLAY_NAME_FIELD = "rm_display_name"
+
+
+@dataclass(frozen=True)
+class MeasureAxis:
+    """One labelled dimension of a measure cube."""
+
+    field_name: str
+    labels: tuple[str, ...]
+    display_names: tuple[str, ...]
+    size: int | None = None
+    documents_with_any_value: int | None = None
+    documents_with_no_value: int | None = None
+    _index: dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def index(self, label: str) -> int:
+        """Position of the member with identifier (or display name) `label`."""
+        if not self._index:
+            self._index.update((name, i) for i, name in enumerate(self.display_names))
+            self._index.update((name, i) for i, name in enumerate(self.labels))
+        try:
+            return self._index[label]
+        except KeyError:
+            raise KeyError(f"{label!r} is not a member of {self.field_name}") from None
+
+    def take(self, positions: Sequence[int]) -> MeasureAxis:
+        return MeasureAxis(
+            field_name=self.field_name,
+            labels=tuple(self.labels[i] for i in positions),
+            display_names=tuple(self.display_names[i] for i in positions),
+            size=self.size,
+            documents_with_any_value=self.documents_with_any_value,
+            documents_with_no_value=self.documents_with_no_value,
+        )
+
+
+Selector = str | int | slice | Sequence[str | int]
+
+
+class MeasureArray:
+    """Dense N-dimensional measure values with one `MeasureAxis` per dimension.
+
+    ``data[i, j]`` is the measure of the bucket formed by member ``i`` of the first
+    axis and member ``j`` of the second. A zero-dimensional measure is a 0-d array.
+    """
+
+    def __init__(self, data: np.ndarray, axes: Sequence[MeasureAxis]) -> None:
+        if data.ndim != len(axes) or any(n != len(a) for n, a in zip(data.shape, axes)):
+            raise ValueError(
+                f"Values of shape {data.shape} do not match axes "
+                f"{[(a.field_name, len(a)) for a in axes]}"
+            )
+        self.data = data
+        self.axes = tuple(axes)
+
+    def __repr__(self) -> str:
+        dims = ", ".join(f"{a.field_name}: {len(a)}" for a in self.axes)
+        return f"MeasureArray({dims}; dtype={self.data.dtype})"
+
+    @property
+    def dims(self) -> tuple[str, ...]:
+        return tuple(a.field_name for a in self.axes)
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return self.data.shape
+
+    def axis_number(self, dim: str | int) -> int:
+        """Position of the axis named `dim` (integers are returned unchanged)."""
+        if isinstance(dim, int):
+            return dim
+        try:
+            return self.dims.index(dim)
+        except ValueError:
+            raise KeyError(f"{dim!r} is not a dimension of {self.dims}") from None
+
+    def _positions(self, axis: MeasureAxis, selector: Selector) -> int | list[int] | slice:
+        if isinstance(selector, slice):
+            return selector
+        if isinstance(selector, str):
+            return axis.index(selector)
+        if isinstance(selector, int):
+            return selector
+        return [s if isinstance(s, int) else axis.index(s) for s in selector]
+
+    def sel(
+        self, selection: Mapping[str, Selector] | None = None, **by_dim: Selector
+    ) -> MeasureArray | Any:
+        """Select members by identifier, display name or position.
+
+        A single member drops its axis; a list or slice keeps it. Returns a
+        `MeasureArray`, or a NumPy scalar when every axis is dropped.
+
+        >>> cube.sel({"custodian": "Smith"}, doc_type=["email", "memo"])
+        """
+        selectors = {**(selection or {}), **by_dim}
+        index: list[Any] = [slice(None)] * len(self.axes)
+        axes: list[MeasureAxis | None] = list(self.axes)
+        for dim, selector in selectors.items():
+            number = self.axis_number(dim)
+            axis = self.axes[number]
+            positions = self._positions(axis, selector)
+            index[number] = positions
+            if isinstance(positions, int):
+                axes[number] = None
+            elif isinstance(positions, slice):
+                axes[number] = axis.take(range(len(axis))[positions])
+            else:
+                axes[number] = axis.take(positions)
+        data = self.data[tuple(index)]
+        kept = [a for a in axes if a is not None]
+        return MeasureArray(data, kept) if kept else data[()]
+
+    def reduce(
+        self, func: Callable[..., np.ndarray], dims: str | int | Sequence[str | int]
+    ) -> MeasureArray | Any:
+        """Aggregate over `dims` with a NumPy reduction such as ``numpy.sum``."""
+        if isinstance(dims, str | int):
+            dims = [dims]
+        numbers = tuple(sorted({self.axis_number(d) for d in dims}))
+        data = func(self.data, axis=numbers)
+        kept = [a for i, a in enumerate(self.axes) if i not in numbers]
+        return MeasureArray(data, kept) if kept else data[()]
+
+    def sum(self, dims: str | int | Sequence[str | int] | None = None) -> MeasureArray | Any:
+        numpy = require_numpy()
+        return self.reduce(numpy.sum, range(self.data.ndim) if dims is None else dims)
+
+    def max(self, dims: str | int | Sequence[str | int] | None = None) -> MeasureArray | Any:
+        numpy = require_numpy()
+        return self.reduce(numpy.max, range(self.data.ndim) if dims is None else dims)
+
+    def min(self, dims: str | int | Sequence[str | int] | None = None) -> MeasureArray | Any:
+        numpy = require_numpy()
+        return self.reduce(numpy.min, range(self.data.ndim) if dims is None else dims)
+
+    def marginal(self, dim: str | int) -> MeasureArray:
+        """Totals along `dim`, summing all other axes (only exact for additive measures)."""
+        number = self.axis_number(dim)
+        others = [i for i in range(self.data.ndim) if i != number]
+        result = self.sum(others) if others else self
+        assert isinstance(result, MeasureArray)
+        return result
+
+    def to_sparse(self) -> SparseMeasure:
+        """Coordinates and values of the non-zero cells."""
+        numpy = require_numpy()
+        coords = numpy.argwhere(self.data != 0)
+        return SparseMeasure(coords, self.data[tuple(coords.T)], self.axes)
+
+    def to_dict(self) -> dict[tuple[str, ...], Any]:
+        """Map member identifier tuples to values (non-zero cells only)."""
+        sparse = self.to_sparse()
+        labels = [a.labels for a in self.axes]
+        return {
+            tuple(labels[d][i] for d, i in enumerate(row)): value.item()
+            for row, value in zip(sparse.coords, sparse.values)
+        }
+
+
+class SparseMeasure:
+    """Coordinate (COO) form of a measure: ``values[k]`` sits at ``coords[k]``."""
+
+    def __init__(self, coords: np.ndarray, values: np.ndarray, axes: Sequence[MeasureAxis]) -> None:
+        self.coords = coords
+        self.values = values
+        self.axes = tuple(axes)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return tuple(len(a) for a in self.axes)
+
+    def to_dense(self) -> MeasureArray:
+        numpy = require_numpy()
+        data = numpy.zeros(self.shape, dtype=self.values.dtype)
+        data[tuple(self.coords.T)] = self.values
+        return MeasureArray(data, self.axes)
+
+
+def _axis(dimension: Mapping[str, Any]) -> MeasureAxis:
+    labels: list[str] = []
+    display_names: list[str] = []
+    for member in dimension.get("members") or ():
+        identifier = str(member.get("identifier"))
+        display_name = identifier
+        for member_field in member.get("fields") or ():
+            if member_field.get("id") == DISPLAY_NAME_FIELD and member_field.get("value"):
+                display_name = str(member_field["value"])
+        labels.append(identifier)
+        display_names.append(display_name)
+    return MeasureAxis(
+        field_name=dimension.get("fieldName") or "",
+        labels=tuple(labels),
+        display_names=tuple(display_names),
+        size=dimension.get("size"),
+        documents_with_any_value=dimension.get("documentsWithAnyValue"),
+        documents_with_no_value=dimension.get("documentsWithNoValue"),
+    )
+
+
+def measure_array(data: bytes | str | Mapping[str, Any]) -> MeasureArray:
+    """Convert a ``/measures`` response (raw JSON or parsed) into a `MeasureArray`.
+
+    Long results (``values``) become int64 arrays, floating point results
+    (``valuesDouble``) float64 arrays. The server returns a matrix with a single
+    row for zero- and one-dimensional measures; it is reshaped to the number of
+    dimensions.
+
+    Raises
+    ------
+    RuntimeError
+        If the response reports an unsuccessful status.
+    ValueError
+        If the response carries no values or they do not match the dimensions.
+    """
+    numpy = require_numpy()
+    cube = loads(data) if isinstance(data, bytes | str) else data
+    status = cube.get("status") or {}
+    if status.get("successful") is False:
+        raise RuntimeError(f"Measure request failed: {status.get('errorMessage')}")
+    axes = [_axis(d) for d in cube.get("dimensions") or ()]
+    if cube.get("values") is not None:
+        values = numpy.asarray(cube["values"], dtype=numpy.int64)
+    elif cube.get("valuesDouble") is not None:
+        values = numpy.asarray(cube["valuesDouble"], dtype=numpy.float64)
+    else:
+        raise ValueError("Measure response contains neither values nor valuesDouble")
+    shape = tuple(len(a) for a in axes)
+    if values.size != int(numpy.prod(shape)):
+        raise ValueError(f"{values.size} values do not fit dimensions of shape {shape}")
+    return MeasureArray(values.reshape(shape), axes)
+
+
+async def fetch_measure_array(
+    client: SearchWebApiClient,
+    project_id: str,
+    collection_id: str,
+    dimensions: Sequence[DimensionRequest],
+    *,
+    query: str = "*",
+    measure_type: str | Mapping[str, Any] | None = None,
+    join_restriction: str | None = None,
+    language: str | None = None,
+) -> MeasureArray:
+    """POST ``/measures`` and convert the cube into a `MeasureArray`.
+
+    Parameters
+    ----------
+    client: SearchWebApiClient
+        Client of an authenticated session.
+    project_id: str
+        Project to query.
+    collection_id: str
+        Collection to query.
+    dimensions: Sequence[DimensionRequest]
+        Zero, one or two dimensions of the measure.
+    query: str, default "*"
+        Query selecting the documents aggregated.
+    measure_type: str | Mapping[str, Any] | None
+        Aggregate to compute, as a MeasureTypeParameter mapping (e.g.
+        ``{"typeName": "sum", "fieldName": "size"}``) or its JSON; default is count.
+    join_restriction: str | None
+        Restriction on a joined collection.
+    language: str | None
+        Query language.
+
+    Example
+    -------
+    >>> cube = await fetch_measure_array(
+    ...     swa.client, "p", "documents",
+    ...     [DimensionRequest(field="custodian"), DimensionRequest(field="doc_type")],
+    ... )
+    >>> cube.sel(custodian="Smith").data
+    """
+    if isinstance(measure_type, Mapping):
+        measure_type = json.dumps(measure_type)
+    params = MeasuresRequestBuilder.MeasuresRequestBuilderPostQueryParameters(
+        query=query,
+        measure_type=measure_type,
+        join_restriction=join_restriction,
+        language=language,
+    )
+    content = await (
+        client.projects.by_project_id(project_id)
+        .collections.by_collection_id(collection_id)
+        .measures.post(
+            list(dimensions), request_configuration=RequestConfiguration(query_parameters=params)
+        )
+    )
+    return measure_array(content or b"{}")
+
+
+__all__ = [
+    "MeasureArray",
+    "MeasureAxis",
+    "SparseMeasure",
+    "fetch_measure_array",
+    "measure_array",
+]
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Coroutine, Sequence
+from contextlib import aclosing
+from typing import Any, NamedTuple, TypedDict, Unpack
+
+from axcpy.searchwebapi.generated.models.record import Record
+from axcpy.searchwebapi.generated.models.search_result import SearchResult
+from axcpy.searchwebapi.generated.projects.item.collections.item.records.records_request_builder import (  # noqa: E501
+    RecordsRequestBuilder,
+)
+from axcpy.searchwebapi.generated.search_web_api_client import SearchWebApiClient
+
+from .decoding import decode_search_result, loads, record_rows
+from .endpoints import RecordsQueryParameters, collection_endpoints
+
+logger = logging.getLogger(__name__)
+
+MAX_PAGE_SIZE = 1000
+
+
+class RowPage(NamedTuple):
+    """A page of flat record rows."""
+
+    number_results: int | None
+    results: list[dict[str, Any]]
+
+
+def records_builder(
+    client: SearchWebApiClient, project_id: str, collection_id: str
+) -> RecordsRequestBuilder:
+    """Return the request builder for /projects/{projectId}/collections/{collectionId}/records."""
+    return (
+        client.projects.by_project_id(project_id)
+        .collections.by_collection_id(collection_id)
+        .records
+    )
+
+
+def join_values(values: str | Sequence[str] | None) -> str | None:
+    """Join a list parameter (e.g. field names) with commas; strings pass through."""
+    if values is None or isinstance(values, str):
+        return values
+    return ",".join(values)
+
+
+class RecordPager:
+    """Async iterator over all records of a search, fetching pages ahead of the consumer.
+
+    The first page is requested alone to learn `numberResults`; afterwards up to
+    `prefetch` further pages are kept in flight while the consumer processes the
+    current one, so a large result set streams at connection capacity instead of
+    one round trip per page. Records are yielded in rank order.
+
+    Parameters
+    ----------
+    client: SearchWebApiClient
+        Client of an authenticated session (see `SearchWebApiSession`).
+    project_id: str
+        Project to search.
+    collection_id: str
+        Collection to search.
+    query: str, default "*"
+        Query expression.
+    fields: str | Sequence[str] | None
+        Fields to retrieve per record; keep this minimal for large scans.
+    folder_fields: str | Sequence[str] | None
+        Folder fields to retrieve per record.
+    body: bool, default False
+        Retrieve summarized content for each record.
+    order: str | None
+        Order criteria, e.g. ``"rm_modificationdate:desc"``.
+    join_restriction: str | None
+        Restriction on a joined collection.
+    language: str | None
+        Query language.
+    page_size: int, default 1000
+        Records per request (the server allows at most 1000).
+    prefetch: int, default 4
+        Number of pages requested ahead of the page being consumed.
+    max_records: int | None
+        Stop after this many records.
+    start_page: int, default 1
+        First page to fetch (1-based), e.g. to resume an interrupted scan.
+
+    Example
+    -------
+    >>> pager = RecordPager(swa.client, "project", "documents", fields=["rm_title"])
+    >>> async for record in pager:
+    ...     print(record.rank, record.id)
+    """
+
+    def __init__(
+        self,
+        client: SearchWebApiClient,
+        project_id: str,
+        collection_id: str,
+        *,
+        query: str = "*",
+        fields: str | Sequence[str] | None = None,
+        folder_fields: str | Sequence[str] | None = None,
+        body: bool = False,
+        order: str | None = None,
+        join_restriction: str | None = None,
+        language: str | None = None,
+        page_size: int = MAX_PAGE_SIZE,
+        prefetch: int = 4,
+        max_records: int | None = None,
+        start_page: int = 1,
+    ) -> None:
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+        if prefetch < 0:
+            raise ValueError("prefetch must not be negative")
+        if start_page < 1:
+            raise ValueError("start_page must be at least 1")
+        self._endpoints = collection_endpoints(client, project_id, collection_id)
+        self.query = query
+        self.fields = join_values(fields)
+        self.folder_fields = join_values(folder_fields)
+        self.body = body
+        self.order = order
+        self.join_restriction = join_restriction
+        self.language = language
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.max_records = max_records
+        self.start_page = start_page
+        self.number_results: int | None = None
+
+    def query_parameters(self, page: int) -> RecordsQueryParameters:
+        return RecordsQueryParameters(
+            query=self.query,
+            fields=self.fields,
+            folder_fields=self.folder_fields,
+            body=self.body,
+            order=self.order,
+            join_restriction=self.join_restriction,
+            language=self.language,
+            limit=self.page_size,
+            page=page,
+        )
+
+    async def fetch_page(self, page: int) -> SearchResult:
+        """Fetch and decode a single page."""
+        content = await self._endpoints.get_records(self.query_parameters(page))
+        return decode_search_result(content or b"{}")
+
+    async def fetch_rows(self, page: int) -> RowPage:
+        """Fetch a single page as flat rows (see `record_rows`)."""
+        content = await self._endpoints.get_records(self.query_parameters(page))
+        parsed = loads(content or b"{}")
+        return RowPage(parsed.get("numberResults"), list(record_rows(parsed)))
+
+    def _last_page(self, number_results: int) -> int:
+        available = max(number_results - (self.start_page - 1) * self.page_size, 0)
+        if self.max_records is not None:
+            available = min(available, self.max_records)
+        return self.start_page + math.ceil(available / self.page_size) - 1
+
+    def pages(self) -> AsyncGenerator[SearchResult]:
+        """Yield decoded pages in order while prefetching the following ones."""
+        return self._prefetched(self.fetch_page)
+
+    def row_pages(self) -> AsyncGenerator[RowPage]:
+        """Like `pages`, but each page holds flat rows instead of model objects."""
+        return self._prefetched(self.fetch_rows)
+
+    async def _prefetched[P: (SearchResult, RowPage)](
+        self, fetch: Callable[[int], Coroutine[Any, Any, P]]
+    ) -> AsyncGenerator[P]:
+        first = await fetch(self.start_page)
+        self.number_results = first.number_results or 0
+        last_page = self._last_page(self.number_results)
+        logger.debug(
+            "Paging %d results, pages %d..%d", self.number_results, self.start_page, last_page
+        )
+        if last_page < self.start_page:
+            return
+
+        pending: deque[asyncio.Task[P]] = deque()
+        next_page = self.start_page + 1
+
+        def schedule() -> None:
+            nonlocal next_page
+            while next_page <= last_page and len(pending) < self.prefetch:
+                pending.append(asyncio.create_task(fetch(next_page)))
+                next_page += 1
+
+        try:
+            schedule()
+            yield first
+            while pending:
+                page = await pending.popleft()
+                schedule()
+                yield page
+            while next_page <= last_page:  # prefetch == 0
+                page = await fetch(next_page)
+                next_page += 1
+                yield page
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def records(self) -> AsyncGenerator[Record]:
+        """Yield the records of all pages, honouring `max_records`."""
+        remaining = self.max_records
+        async with aclosing(self.pages()) as pages:  # cancels prefetches on early exit
+            async for page in pages:
+                for record in page.results or ():
+                    if remaining is not None:
+                        if remaining <= 0:
+                            return
+                        remaining -= 1
+                    yield record
+                if not page.results:
+                    return  # fewer results than announced, e.g. documents were removed
+
+    async def rows(self) -> AsyncGenerator[dict[str, Any]]:
+        """Yield flat rows (``id``, ``rank``, ``relevance``, fields) of all pages.
+
+        The lightweight path for bulk exports: no model objects are built.
+        """
+        remaining = self.max_records
+        async with aclosing(self.row_pages()) as pages:
+            async for page in pages:
+                for row in page.results:
+                    if remaining is not None:
+                        if remaining <= 0:
+                            return
+                        remaining -= 1
+                    yield row
+                if not page.results:
+                    return
+
+    def __aiter__(self) -> AsyncIterator[Record]:
+        return self.records()
+
+
+class PagerOptions(TypedDict, total=False):
+    """Keyword arguments of `RecordPager` after the collection."""
+
+    query: str
+    fields: str | Sequence[str] | None
+    folder_fields: str | Sequence[str] | None
+    body: bool
+    order: str | None
+    join_restriction: str | None
+    language: str | None
+    page_size: int
+    prefetch: int
+    max_records: int | None
+    start_page: int
+
+
+async def iter_records(
+    client: SearchWebApiClient,
+    project_id: str,
+    collection_id: str,
+    **kwargs: Unpack[PagerOptions],
+) -> AsyncGenerator[Record]:
+    """Shortcut for ``RecordPager(client, project_id, collection_id, **kwargs).records()``."""
+    async with aclosing(RecordPager(client, project_id, collection_id, **kwargs).records()) as it:
+        async for record in it:
+            yield record
+
+
+__all__ = [
+    "MAX_PAGE_SIZE",
+    "PagerOptions",
+    "RecordPager",
+    "RowPage",
+    "iter_records",
+    "join_values",
+    "records_builder",
+]
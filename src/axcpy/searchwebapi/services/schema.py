@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import difflib
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+from axcpy.searchwebapi.generated.models.field_description import FieldDescription
+from axcpy.searchwebapi.generated.models.field_description_type import FieldDescription_type
+from axcpy.searchwebapi.generated.models.fields_result import FieldsResult
+from axcpy.searchwebapi.generated.search_web_api_client import SearchWebApiClient
+
+from .cache import SearchCache, SearchKey
+from .decoding import decode_model
+
+# Pseudo attribute requesting the summarized record content (``body=true``).
+BODY_ATTRIBUTE = "body"
+# Dynamic properties the records endpoint returns although /fields does not list them.
+DYNAMIC_FIELDS = frozenset({"rm_is_best_bet"})
+
+
+class FieldProjection(NamedTuple):
+    """Minimal ``/records`` parameters for a list of attributes.
+
+    The names match the keyword arguments of `RecordPager` and
+    `CachedSearch.records`, so a projection can be passed as ``**projection._asdict()``.
+    """
+
+    fields: str | None = None
+    folder_fields: str | None = None
+    body: bool = False
+
+
+@dataclass(frozen=True)
+class CollectionSchema:
+    """Fields of a collection as described by ``collections/{collectionId}/fields``."""
+
+    project_id: str
+    collection_id: str
+    fields: Mapping[str, FieldDescription] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self.resolve(name) is not None
+
+    @property
+    def folder_fields(self) -> list[str]:
+        return [f for f, d in self.fields.items() if d.is_folder_field]
+
+    @property
+    def sortable_fields(self) -> list[str]:
+        return [f for f, d in self.fields.items() if d.is_sortable]
+
+    def resolve(self, name: str) -> FieldDescription | None:
+        """Description of a field id, display name or ``<parameterizedLong>.<parameter>``."""
+        description = self.fields.get(name)
+        if description is not None:
+            return description
+        base, dot, _ = name.partition(".")
+        if dot:
+            description = self.fields.get(base)
+            if (
+                description is not None
+                and description.type == FieldDescription_type.ParameterizedLong
+            ):
+                return description
+        matches = [d for d in self.fields.values() if d.display_name == name]
+        return matches[0] if len(matches) == 1 else None
+
+    def project(self, attributes: Iterable[str], *, folder_names: bool = True) -> FieldProjection:
+        """Turn requested attributes into minimal ``fields``/``folderFields``/``body``.
+
+        Display names are mapped to field ids and duplicates are dropped. Folder
+        fields go to ``folderFields`` (ids and display names of the folders), or
+        to ``fields`` (folder ids only) if `folder_names` is False. The pseudo
+        attribute ``"body"`` requests the summarized content.
+
+        Raises
+        ------
+        ValueError
+            If an attribute is not a field of the collection or is a binary
+            field (fetch those with `BinaryDownloader`).
+        """
+        fields: dict[str, None] = {}
+        folder_fields: dict[str, None] = {}
+        body = False
+        unknown: list[str] = []
+        binary: list[str] = []
+        for name in attributes:
+            if name == BODY_ATTRIBUTE:
+                body = True
+                continue
+            if name in DYNAMIC_FIELDS:
+                fields[name] = None
+                continue
+            description = self.resolve(name)
+            if description is None:
+                unknown.append(name)
+            elif description.type == FieldDescription_type.Binary:
+                binary.append(name)
+            elif description.is_folder_field and folder_names:
+                folder_fields[description.id or name] = None
+            else:
+                fields[name if "." in name else description.id or name] = None
+        if unknown:
+            names = [
+                *self.fields,
+                *(d.display_name for d in self.fields.values() if d.display_name),
+            ]
+            hints = []
+            for name in unknown:
+                close = difflib.get_close_matches(name, names, n=1)
+                hints.append(f"{name!r} (did you mean {close[0]!r}?)" if close else repr(name))
+            raise ValueError(
+                f"Unknown fields in {self.project_id}/{self.collection_id}: {', '.join(hints)}"
+            )
+        if binary:
+            raise ValueError(f"Binary fields cannot be projected: {', '.join(binary)}")
+        return FieldProjection(
+            fields=",".join(fields) or None,
+            folder_fields=",".join(folder_fields) or None,
+            body=body,
+        )
+
+
+async def fetch_collection_schema(
+    client: SearchWebApiClient, project_id: str, collection_id: str
+) -> CollectionSchema:
+    """Fetch the field descriptions of a collection."""
+    content = await (
+        client.projects.by_project_id(project_id)
+        .collections.by_collection_id(collection_id)
+        .fields.get()
+    )
+    result = decode_model(content or b"{}", FieldsResult)
+    if result.status is not None and result.status.successful is False:
+        raise RuntimeError(
+            f"Fetching fields of {project_id}/{collection_id} failed: {result.status.error_message}"
+        )
+    return CollectionSchema(
+        project_id,
+        collection_id,
+        {d.id: d for d in result.results or () if d.id is not None},
+    )
+
+
+class SchemaCache:
+    """Per-collection field schemas with time-to-live, and projections on top of them.
+
+    Schemas are fetched once per collection and kept for `ttl` seconds;
+    concurrent requests for the same collection share a single fetch. Use
+    `projection` to validate the attributes a workload needs before searching,
+    so a typo fails client-side instead of after a round trip, and to request
+    only those fields.
+
+    Parameters
+    ----------
+    client: SearchWebApiClient
+        Client of an authenticated session.
+    ttl: float | None, default 300.0
+        Seconds a schema stays valid; None keeps schemas until invalidated.
+    cache: SearchCache | None
+        Cache to store the schemas in (its own TTL applies); a new one if None.
+
+    Example
+    -------
+    >>> schemas = SchemaCache(swa.client)
+    >>> projection = await schemas.projection("p", "documents", ["rm_title", "Custodian"])
+    >>> pager = RecordPager(swa.client, "p", "documents", query="york", **projection._asdict())
+    """
+
+    def __init__(
+        self,
+        client: SearchWebApiClient,
+        *,
+        ttl: float | None = 300.0,
+        cache: SearchCache | None = None,
+    ) -> None:
+        self._client = client
+        self.cache = cache if cache is not None else SearchCache(max_entries=256, ttl=ttl)
+
+    async def schema(self, project_id: str, collection_id: str) -> CollectionSchema:
+        """Schema of a collection, fetched if absent or expired."""
+        return await self.cache.get_or_fetch(
+            SearchKey("fields", project_id, collection_id, ""),
+            lambda: fetch_collection_schema(self._client, project_id, collection_id),
+        )
+
+    async def projection(
+        self,
+        project_id: str,
+        collection_id: str,
+        attributes: Iterable[str],
+        *,
+        folder_names: bool = True,
+    ) -> FieldProjection:
+        """Validate `attributes` and return the minimal ``/records`` parameters for them."""
+        schema = await self.schema(project_id, collection_id)
+        return schema.project(attributes, folder_names=folder_names)
+
+    def invalidate(self, project_id: str, collection_id: str | None = None) -> int:
+        """Drop cached schemas, e.g. after the data model was changed."""
+        return self.cache.invalidate(project_id, collection_id)
+
+
+__all__ = [
+    "BODY_ATTRIBUTE",
+    "CollectionSchema",
+    "FieldProjection",
+    "SchemaCache",
+    "fetch_collection_schema",
+]
@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import logging
+from contextvars import ContextVar
+from types import TracebackType
+from typing import Any
+
+import httpx
+from kiota_abstractions.authentication import AuthenticationProvider
+from kiota_abstractions.request_information import RequestInformation
+from kiota_abstractions.serialization import (
+    ParseNodeFactoryRegistry,
+    SerializationWriterFactoryRegistry,
+)
+from kiota_http.httpx_request_adapter import HttpxRequestAdapter
+from kiota_serialization_json.json_parse_node_factory import JsonParseNodeFactory
+from kiota_serialization_json.json_serialization_writer_factory import (
+    JsonSerializationWriterFactory,
+)
+from kiota_serialization_text.text_parse_node_factory import TextParseNodeFactory
+from kiota_serialization_text.text_serialization_writer_factory import (
+    TextSerializationWriterFactory,
+)
+
+from axcpy.searchwebapi.generated.search_web_api_client import SearchWebApiClient
+
+logger = logging.getLogger(__name__)
+
+# Trace id sent as SWA-MDC-TOKEN with every request of the current context (see
+# `CachedSearchScope`); the server records it as creation trace id of cached searches.
+trace_token: ContextVar[str | None] = ContextVar("swa_trace_token", default=None)
+
+SESSION_HEADER = "SWA-SESSION"
+AUTHORIZATION_HEADER = "Authorization"
+TRACE_HEADER = "SWA-MDC-TOKEN"
+FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+# Conservative limit below the request line limits of common proxies and servers.
+DEFAULT_POST_QUERY_THRESHOLD = 4096
+
+
+class SessionAuthenticationProvider(AuthenticationProvider):
+    """Kiota authentication provider that prefers the SWA-SESSION header over credentials.
+
+    Basic credentials are only sent while no session id is known, i.e. for the
+    initial login and for re-login after the session expired.
+
+    Parameters
+    ----------
+    username: str
+        SearchWebAPI user name.
+    password: str
+        SearchWebAPI password.
+    """
+
+    def __init__(self, username: str, password: str) -> None:
+        self.username = username
+        self.password = password
+        self.session_id: str | None = None
+
+    @property
+    def basic_authorization(self) -> str:
+        credentials = f"{self.username}:{self.password}".encode()
+        return f"Basic {base64.b64encode(credentials).decode()}"
+
+    async def authenticate_request(
+        self,
+        request: RequestInformation,
+        additional_authentication_context: dict[str, Any] = {},  # noqa: B006 - kiota signature
+    ) -> None:
+        if self.session_id:
+            request.headers.try_add(SESSION_HEADER, self.session_id)
+        else:
+            request.headers.try_add(AUTHORIZATION_HEADER, self.basic_authorization)
+
+
+class SessionHttpClient(httpx.AsyncClient):
+    """Pooled `httpx.AsyncClient` that captures SWA-SESSION and re-logs in on expiry.
+
+    Every response carrying a SWA-SESSION header updates the provider's session id.
+    A 401 answer to a request sent with a session id is treated as an expired
+    session: the client logs in again with Basic credentials (once, even when many
+    requests fail concurrently) and retries the request with the new session id.
+
+    GET requests whose URL is longer than `post_query_threshold` characters are
+    sent as POST with the query parameters in an ``application/x-www-form-urlencoded``
+    body, which the SearchWebAPI accepts as an alternative to GET for read-only
+    operations. This keeps very long search expressions clear of URL length limits.
+
+    While `trace_token` is set, requests without an explicit SWA-MDC-TOKEN header
+    carry it.
+    """
+
+    def __init__(
+        self,
+        auth_provider: SessionAuthenticationProvider,
+        *,
+        login_url: str,
+        post_query_threshold: int | None = DEFAULT_POST_QUERY_THRESHOLD,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.auth_provider = auth_provider
+        self.login_url = login_url
+        self.post_query_threshold = post_query_threshold
+        self._login_lock = asyncio.Lock()
+
+    def _capture(self, response: httpx.Response) -> None:
+        session_id = response.headers.get(SESSION_HEADER)
+        if session_id and session_id != self.auth_provider.session_id:
+            logger.debug("Captured new SearchWebAPI session")
+            self.auth_provider.session_id = session_id
+
+    async def _relogin(self, expired_session: str) -> None:
+        async with self._login_lock:
+            if self.auth_provider.session_id not in (None, expired_session):
+                return  # another request already logged in again
+            logger.debug("SearchWebAPI session expired, logging in again")
+            self.auth_provider.session_id = None
+            request = self.build_request(
+                "POST",
+                self.login_url,
+                headers={
+                    AUTHORIZATION_HEADER: self.auth_provider.basic_authorization,
+                    "Accept": "application/json",
+                },
+            )
+            response = await super().send(request)
+            await response.aread()
+            response.raise_for_status()
+            self._capture(response)
+
+    def _form_encode(self, request: httpx.Request) -> httpx.Request:
+        """Move the query of a long GET request into a form-encoded POST body."""
+        if (
+            self.post_query_threshold is None
+            or request.method != "GET"
+            or not request.url.query
+            or len(str(request.url)) <= self.post_query_threshold
+        ):
+            return request
+        logger.debug(
+            "Sending %d byte query of %s as form body", len(request.url.query), request.url.path
+        )
+        headers = {
+            k: v for k, v in request.headers.items() if k.lower() not in ("content-length", "host")
+        }
+        headers["Content-Type"] = FORM_CONTENT_TYPE
+        return self.build_request(
+            "POST",
+            request.url.copy_with(query=None),
+            headers=headers,
+            content=request.url.query,
+            extensions=request.extensions,
+        )
+
+    async def send(self, request: httpx.Request, **kwargs: Any) -> httpx.Response:
+        token = trace_token.get()
+        if token is not None and TRACE_HEADER not in request.headers:
+            request.headers[TRACE_HEADER] = token
+        request = self._form_encode(request)
+        response = await super().send(request, **kwargs)
+        self._capture(response)
+
+        sent_session = request.headers.get(SESSION_HEADER)
+        if response.status_code != 401 or not sent_session:
+            return response
+
+        await response.aclose()
+        await self._relogin(sent_session)
+
+        retry = self.build_request(
+            request.method,
+            request.url,
+            headers={
+                **{k: v for k, v in request.headers.items() if k.lower() != SESSION_HEADER.lower()},
+                SESSION_HEADER: self.auth_provider.session_id or "",
+            },
+            content=request.content,
+            extensions=request.extensions,
+        )
+        response = await super().send(retry, **kwargs)
+        self._capture(response)
+        return response
+
+
+class SearchWebApiSession:
+    """Ready-to-use SearchWebAPI client with one pooled HTTP/2 connection and session reuse.
+
+    The session logs in once via `client.login.post()`, sends only the SWA-SESSION
+    header afterwards, transparently logs in again when the server expires the
+    session and shares a single `httpx.AsyncClient` for all requests.
+
+    Parameters
+    ----------
+    base_url: str
+        SearchWebAPI base URL (e.g. https://example.com:8443/searchWebApi).
+    username: str
+        SearchWebAPI user name.
+    password: str
+        SearchWebAPI password.
+    ignore_tls: bool, default False
+        If True, disables TLS certificate verification.
+    timeout: float | None, default 30.0
+        Default request timeout in seconds.
+    http2: bool, default True
+        Negotiate HTTP/2 (multiplexes concurrent requests over one connection).
+    limits: httpx.Limits | None
+        Connection pool limits.
+    headers: dict[str, str] | None
+        Extra headers sent with every request (e.g. SWA-SESSION-TYPE).
+    transport: httpx.AsyncBaseTransport | None
+        Custom transport for the pooled client (mainly for testing).
+    post_query_threshold: int | None, default 4096
+        URL length above which GET requests are sent as form-encoded POST
+        (see `SessionHttpClient`); None always uses GET.
+
+    Example
+    -------
+    >>> async with SearchWebApiSession(url, "user", "pass") as swa:
+    ...     projects = await swa.client.projects.get()
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        username: str,
+        password: str,
+        *,
+        ignore_tls: bool = False,
+        timeout: float | None = 30.0,
+        http2: bool = True,
+        limits: httpx.Limits | None = None,
+        headers: dict[str, str] | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        post_query_threshold: int | None = DEFAULT_POST_QUERY_THRESHOLD,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.auth_provider = SessionAuthenticationProvider(username, password)
+        self._http_client = SessionHttpClient(
+            self.auth_provider,
+            login_url=f"{self.base_url}/login",
+            post_query_threshold=post_query_threshold,
+            verify=not ignore_tls,
+            http2=http2,
+            timeout=timeout,
+            limits=limits or httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            headers=headers,
+            follow_redirects=True,
+            transport=transport,
+        )
+        parse_nodes = ParseNodeFactoryRegistry()  # type: ignore[no-untyped-call]
+        parse_nodes.CONTENT_TYPE_ASSOCIATED_FACTORIES["application/json"] = JsonParseNodeFactory()
+        parse_nodes.CONTENT_TYPE_ASSOCIATED_FACTORIES["text/plain"] = TextParseNodeFactory()
+        writers = SerializationWriterFactoryRegistry()  # type: ignore[no-untyped-call]
+        writers.CONTENT_TYPE_ASSOCIATED_FACTORIES["application/json"] = (
+            JsonSerializationWriterFactory()
+        )
+        writers.CONTENT_TYPE_ASSOCIATED_FACTORIES["text/plain"] = TextSerializationWriterFactory()
+        self.request_adapter = HttpxRequestAdapter(
+            self.auth_provider,
+            parse_node_factory=parse_nodes,
+            serialization_writer_factory=writers,
+            http_client=self._http_client,
+        )
+        self.request_adapter.base_url = self.base_url
+        self._client = SearchWebApiClient(self.request_adapter)
+
+    @property
+    def client(self) -> SearchWebApiClient:
+        return self._client
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """The pooled HTTP client shared by all requests of this session."""
+        return self._http_client
+
+    @property
+    def session_id(self) -> str | None:
+        return self.auth_provider.session_id
+
+    async def to_http_request(self, request_info: RequestInformation) -> httpx.Request:
+        """Turn a generated builder's `RequestInformation` into an authenticated httpx request.
+
+        Use this to send requests through `http_client` directly, e.g. to stream
+        a response body instead of letting kiota buffer it.
+        """
+        if request_info.http_method is None:
+            raise ValueError("RequestInformation has no HTTP method")
+        self.request_adapter.set_base_url_for_request_information(request_info)
+        await self.auth_provider.authenticate_request(request_info)
+        return self._http_client.build_request(
+            request_info.http_method.value,
+            request_info.url,
+            headers=request_info.request_headers,
+            content=request_info.content,
+        )
+
+    async def login(self) -> str:
+        """Log in explicitly and return the SWA-SESSION id."""
+        self.auth_provider.session_id = None
+        await self._client.login.post()
+        if not self.auth_provider.session_id:
+            raise RuntimeError("Login succeeded but no SWA-SESSION header was returned")
+        return self.auth_provider.session_id
+
+    async def logout(self) -> None:
+        """End the server-side session (no-op if not logged in)."""
+        if self.auth_provider.session_id:
+            try:
+                await self._client.logout.delete()
+            finally:
+                self.auth_provider.session_id = None
+
+    async def close(self) -> None:
+        """Log out and close the pooled HTTP client."""
+        try:
+            await self.logout()
+        finally:
+            await self._http_client.aclose()
+
+    async def __aenter__(self) -> SearchWebApiSession:
+        await self.login()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+
+__all__ = [
+    "SearchWebApiSession",
+    "SessionAuthenticationProvider",
+    "SessionHttpClient",
+]
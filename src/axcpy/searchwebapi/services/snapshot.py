@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from collections import deque
+from collections.abc import AsyncIterator, Sequence
+from contextlib import aclosing, suppress
+from types import TracebackType
+
+from kiota_abstractions.base_request_configuration import RequestConfiguration
+
+from axcpy.searchwebapi.generated.models.record import Record
+from axcpy.searchwebapi.generated.models.search_result_token import SearchResultToken
+from axcpy.searchwebapi.generated.models.search_result_token_response import (
+    SearchResultTokenResponse,
+)
+from axcpy.searchwebapi.generated.projects.item.collections.item.search_token.search_token_request_builder import (  # noqa: E501
+    SearchTokenRequestBuilder,
+)
+from axcpy.searchwebapi.generated.search_web_api_client import SearchWebApiClient
+
+from .decoding import decode_model
+from .paging import MAX_PAGE_SIZE, RecordPager
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+def search_token_builder(
+    client: SearchWebApiClient, project_id: str, collection_id: str
+) -> SearchTokenRequestBuilder:
+    """Return the request builder for .../collections/{collectionId}/searchToken."""
+    return (
+        client.projects.by_project_id(project_id)
+        .collections.by_collection_id(collection_id)
+        .search_token
+    )
+
+
+def search_result_range(token: str, start: int, end: int) -> str:
+    """Query restricting a search to ranks ``start`` (inclusive) to ``end`` of a token snapshot."""
+    return f"SEARCH_IN_SEARCHRESULT_RANGE={token};{start};{end}"
+
+
+class SnapshotCursor:
+    """Consistent, parallel scan of a search result through a sort order snapshot.
+
+    Implements the workflow documented for ``searchToken/sortOrderSnapshot``:
+    a search token is created for the query and order, a sort order snapshot is
+    taken for it, and the snapshot is read in disjoint rank ranges via
+    ``SEARCH_IN_SEARCHRESULT_RANGE=<token>;<start>;<end>`` queries by several
+    concurrent workers. Concurrent modifications of the sort keys do not shift
+    documents between ranges. While the cursor is open, the token lease is
+    renewed in the background; closing the cursor deletes the token (and with it
+    the snapshot).
+
+    Parameters
+    ----------
+    client: SearchWebApiClient
+        Client of an authenticated session. Tokens are bound to that session.
+    project_id: str
+        Project to search.
+    collection_id: str
+        Collection to search.
+    query: str, default "*"
+        Query expression of the token.
+    order: str | None
+        Order criteria the snapshot is sorted by.
+    join_restriction: str | None
+        Restriction on a joined collection.
+    language: str | None
+        Query language.
+    fields: str | Sequence[str] | None
+        Fields to retrieve per record.
+    folder_fields: str | Sequence[str] | None
+        Folder fields to retrieve per record.
+    body: bool, default False
+        Retrieve summarized content for each record.
+    workers: int, default 4
+        Number of ranges read concurrently.
+    range_size: int | None
+        Ranks per range; by default the result is split evenly across `workers`.
+    page_size: int, default 1000
+        Records per request within a range.
+    renew_interval: float, default 60.0
+        Seconds between lease renewals (PUT searchToken).
+    top_n: int | None
+        Only snapshot the first `top_n` documents.
+
+    Example
+    -------
+    >>> async with SnapshotCursor(swa.client, "p", "documents", order="rm_title") as cursor:
+    ...     async for record in cursor.scan():
+    ...         process(record)
+    """
+
+    def __init__(
+        self,
+        client: SearchWebApiClient,
+        project_id: str,
+        collection_id: str,
+        *,
+        query: str = "*",
+        order: str | None = None,
+        join_restriction: str | None = None,
+        language: str | None = None,
+        fields: str | Sequence[str] | None = None,
+        folder_fields: str | Sequence[str] | None = None,
+        body: bool = False,
+        workers: int = 4,
+        range_size: int | None = None,
+        page_size: int = MAX_PAGE_SIZE,
+        renew_interval: float = 60.0,
+        top_n: int | None = None,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if range_size is not None and range_size < 1:
+            raise ValueError("range_size must be at least 1")
+        self._client = client
+        self.project_id = project_id
+        self.collection_id = collection_id
+        self._search_token = search_token_builder(client, project_id, collection_id)
+        self.query = query
+        self.order = order
+        self.join_restriction = join_restriction
+        self.language = language
+        self.fields = fields
+        self.folder_fields = folder_fields
+        self.body = body
+        self.workers = workers
+        self.range_size = range_size
+        self.page_size = page_size
+        self.renew_interval = renew_interval
+        self.top_n = top_n
+        self.token: str | None = None
+        self.number_results: int | None = None
+        self.eol: str | None = None
+        self._renewal: asyncio.Task[None] | None = None
+
+    async def open(self) -> SearchResultTokenResponse:
+        """Create the search token and its sort order snapshot, then start renewing."""
+        if self.token is not None:
+            raise RuntimeError("Snapshot cursor is already open")
+        params = SearchTokenRequestBuilder.SearchTokenRequestBuilderGetQueryParameters(
+            query=self.query,
+            order=self.order,
+            join_restriction=self.join_restriction,
+            language=self.language,
+        )
+        content = await self._search_token.get(
+            request_configuration=RequestConfiguration(query_parameters=params)
+        )
+        response = decode_model(content or b"{}", SearchResultTokenResponse)
+        if not response.token:
+            raise RuntimeError("SearchWebAPI did not return a search token")
+        self.token = response.token
+        self.number_results = response.number_results or 0
+        self.eol = response.eol
+
+        try:
+            snapshot = self._search_token.sort_order_snapshot
+            snapshot_params = snapshot.SortOrderSnapshotRequestBuilderPostQueryParameters(
+                top_n=self.top_n
+            )
+            await snapshot.post(
+                SearchResultToken(token=self.token),
+                request_configuration=RequestConfiguration(query_parameters=snapshot_params),
+            )
+        except BaseException:
+            await self._delete_token()
+            raise
+        if self.top_n is not None:
+            self.number_results = min(self.number_results, self.top_n)
+        logger.debug("Opened snapshot of %d results", self.number_results)
+        self._renewal = asyncio.create_task(self._renew_periodically())
+        return response
+
+    async def renew(self) -> None:
+        """Extend the token lease once (PUT searchToken)."""
+        if self.token is None:
+            raise RuntimeError("Snapshot cursor is not open")
+        content = await self._search_token.put(SearchResultToken(token=self.token))
+        if content:
+            self.eol = decode_model(content, SearchResultTokenResponse).eol or self.eol
+
+    async def _renew_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.renew_interval)
+            try:
+                await self.renew()
+            except Exception as e:  # keep renewing; the scan surfaces real failures
+                logger.warning("Renewing search token failed: %s", e)
+
+    async def _delete_token(self) -> None:
+        token, self.token = self.token, None
+        if token is not None:
+            await self._search_token.delete(SearchResultToken(token=token))
+
+    async def close(self) -> None:
+        """Stop renewing and delete the token together with its snapshot."""
+        if self._renewal is not None:
+            self._renewal.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._renewal
+            self._renewal = None
+        await self._delete_token()
+
+    async def __aenter__(self) -> SnapshotCursor:
+        await self.open()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    def ranges(self) -> list[tuple[int, int]]:
+        """Rank ranges ``(start, end)`` covering the snapshot, ``end`` exclusive."""
+        if self.number_results is None:
+            raise RuntimeError("Snapshot cursor is not open")
+        total = self.number_results
+        size = self.range_size or max(math.ceil(total / self.workers), 1)
+        return [(start, min(start + size, total)) for start in range(0, total, size)]
+
+    def range_pager(self, start: int, end: int) -> RecordPager:
+        """Pager over the ranks ``start`` to ``end`` of the snapshot."""
+        if self.token is None:
+            raise RuntimeError("Snapshot cursor is not open")
+        return RecordPager(
+            self._client,
+            self.project_id,
+            self.collection_id,
+            query=search_result_range(self.token, start, end),
+            fields=self.fields,
+            folder_fields=self.folder_fields,
+            body=self.body,
+            page_size=min(self.page_size, max(end - start, 1)),
+            prefetch=1,
+            max_records=end - start,
+        )
+
+    async def scan(self) -> AsyncIterator[Record]:
+        """Yield all records of the snapshot, read by `workers` concurrent range readers.
+
+        Records arrive page by page in the order the pages complete, not in
+        rank order; each record is yielded exactly once.
+        """
+        pending = deque(self.ranges())
+        queue: asyncio.Queue[object] = asyncio.Queue(maxsize=2 * self.workers)
+
+        async def worker() -> None:
+            while pending:
+                start, end = pending.popleft()
+                async with aclosing(self.range_pager(start, end).pages()) as pages:
+                    async for page in pages:
+                        await queue.put(page.results or [])
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.workers, len(pending)))]
+
+        async def run() -> None:
+            try:
+                await asyncio.gather(*workers)
+            except Exception:
+                for task in workers:
+                    task.cancel()
+                await queue.put(_DONE)
+                raise
+            await queue.put(_DONE)
+
+        runner = asyncio.create_task(run())
+        try:
+            while (item := await queue.get()) is not _DONE:
+                for record in item:  # type: ignore[attr-defined]
+                    yield record
+            await runner  # re-raises a worker failure
+        finally:
+            for task in (runner, *workers):
+                task.cancel()
+            await asyncio.gather(runner, *workers, return_exceptions=True)
+
+
+__all__ = ["SnapshotCursor", "search_result_range", "search_token_builder"]
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import NamedTuple
+
+from axcpy.searchwebapi.generated.models.search_result_token_response import (
+    SearchResultTokenResponse,
+)
+from axcpy.searchwebapi.generated.search_web_api_client import SearchWebApiClient
+
+from .cache import SearchCache, SearchKey
+from .decoding import decode_model
+from .endpoints import CollectionEndpoints, SearchTokenQueryParameters, collection_endpoints
+
+logger = logging.getLogger(__name__)
+
+
+class TokenKey(NamedTuple):
+    """Search that a pooled token stands for."""
+
+    project_id: str
+    collection_id: str
+    query: str
+    order: str | None = None
+    join_restriction: str | None = None
+    language: str | None = None
+
+
+@dataclass
+class SearchTokenLease:
+    """A live search token held by a `SearchTokenPool`."""
+
+    key: TokenKey
+    token: str
+    number_results: int | None = None
+    eol: str | None = None
+    renewed_at: float = field(default_factory=time.monotonic)
+    in_use: int = 0
+
+
+class SearchTokenPool:
+    """Shared, renewed search tokens with LRU eviction.
+
+    `acquire` returns the live token for an identical search (same project,
+    collection, query, order, join restriction and language) or creates one with
+    ``GET searchToken``. While the pool is running, every token is renewed with
+    ``PUT searchToken`` each `renew_interval` seconds, so long analyses never hit
+    an expired token; a token whose renewal fails is dropped and re-created on
+    the next `acquire`. At most `max_tokens` tokens are kept: beyond that the
+    least recently used token not currently held through `lease` is deleted.
+    `close` deletes all tokens.
+
+    Parameters
+    ----------
+    client: SearchWebApiClient
+        Client of an authenticated session. Tokens are bound to that session.
+    max_tokens: int, default 32
+        Maximum number of live tokens.
+    renew_interval: float | None, default 60.0
+        Seconds between renewals; None disables background renewal.
+
+    Example
+    -------
+    >>> async with SearchTokenPool(swa.client, max_tokens=8) as pool:
+    ...     async with pool.lease("p", "documents", query="york") as lease:
+    ...         query = search_result_range(lease.token, 0, 100)
+    """
+
+    def __init__(
+        self,
+        client: SearchWebApiClient,
+        *,
+        max_tokens: int = 32,
+        renew_interval: float | None = 60.0,
+    ) -> None:
+        if max_tokens < 1:
+            raise ValueError("max_tokens must be at least 1")
+        self._client = client
+        self.max_tokens = max_tokens
+        self.renew_interval = renew_interval
+        self._leases: OrderedDict[TokenKey, SearchTokenLease] = OrderedDict()
+        self._creating = SearchCache(ttl=None)
+        self._renewal: asyncio.Task[None] | None = None
+        self.created = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._leases)
+
+    def _endpoints(self, key: TokenKey) -> CollectionEndpoints:
+        return collection_endpoints(self._client, key.project_id, key.collection_id)
+
+    async def _create(self, key: TokenKey) -> SearchTokenLease:
+        params = SearchTokenQueryParameters(
+            query=key.query,
+            order=key.order,
+            join_restriction=key.join_restriction,
+            language=key.language,
+        )
+        content = await self._endpoints(key).create_search_token(params)
+        response = decode_model(content or b"{}", SearchResultTokenResponse)
+        if not response.token:
+            raise RuntimeError("SearchWebAPI did not return a search token")
+        self.created += 1
+        return SearchTokenLease(
+            key=key, token=response.token, number_results=response.number_results, eol=response.eol
+        )
+
+    async def _add(self, key: TokenKey) -> SearchTokenLease:
+        lease = self._leases[key] = await self._create(key)
+        return lease
+
+    async def _delete(self, lease: SearchTokenLease) -> None:
+        try:
+            await self._endpoints(lease.key).delete_search_token(lease.token)
+        except Exception as e:  # the token expires on its own eventually
+            logger.warning("Deleting search token failed: %s", e)
+
+    async def _evict(self, keep: TokenKey) -> None:
+        while len(self._leases) > self.max_tokens:
+            victim = next((k for k, v in self._leases.items() if not v.in_use and k != keep), None)
+            if victim is None:
+                logger.debug("All %d search tokens are leased, pool exceeds limit", len(self))
+                return
+            lease = self._leases.pop(victim)
+            self.evicted += 1
+            await self._delete(lease)
+
+    async def acquire(
+        self,
+        project_id: str,
+        collection_id: str,
+        *,
+        query: str = "*",
+        order: str | None = None,
+        join_restriction: str | None = None,
+        language: str | None = None,
+    ) -> SearchTokenLease:
+        """Return the pooled token for the search, creating it if needed.
+
+        The token may be evicted once `max_tokens` newer searches were acquired;
+        use `lease` to keep it alive while working with it.
+        """
+        key = TokenKey(project_id, collection_id, query, order, join_restriction, language)
+        lease = self._leases.get(key)
+        if lease is not None:
+            self._leases.move_to_end(key)
+            return lease
+        # Concurrent acquires of the same search share one token request.
+        flight = SearchKey(
+            "searchToken", project_id, collection_id, query, join_restriction, language, order
+        )
+        lease = await self._creating.get_or_fetch(flight, lambda: self._add(key), store=False)
+        await self._evict(keep=key)
+        return lease
+
+    @asynccontextmanager
+    async def lease(
+        self,
+        project_id: str,
+        collection_id: str,
+        *,
+        query: str = "*",
+        order: str | None = None,
+        join_restriction: str | None = None,
+        language: str | None = None,
+    ) -> AsyncIterator[SearchTokenLease]:
+        """Acquire a token and protect it from eviction until the block exits."""
+        lease = await self.acquire(
+            project_id,
+            collection_id,
+            query=query,
+            order=order,
+            join_restriction=join_restriction,
+            language=language,
+        )
+        lease.in_use += 1
+        try:
+            yield lease
+        finally:
+            lease.in_use -= 1
+
+    async def _renew(self, lease: SearchTokenLease) -> None:
+        try:
+            content = await self._endpoints(lease.key).renew_search_token(lease.token)
+        except Exception as e:
+            logger.warning("Renewing search token failed, dropping it: %s", e)
+            if self._leases.get(lease.key) is lease and not lease.in_use:
+                del self._leases[lease.key]
+            return
+        if content:
+            lease.eol = decode_model(content, SearchResultTokenResponse).eol or lease.eol
+        lease.renewed_at = time.monotonic()
+
+    async def renew_all(self) -> None:
+        """Extend the lease of every pooled token once."""
+        await asyncio.gather(*(self._renew(lease) for lease in list(self._leases.values())))
+
+    async def _renew_periodically(self) -> None:
+        assert self.renew_interval is not None
+        while True:
+            await asyncio.sleep(self.renew_interval)
+            await self.renew_all()
+
+    def start(self) -> None:
+        """Start renewing the pooled tokens every `renew_interval` seconds."""
+        if self._renewal is None and self.renew_interval is not None:
+            self._renewal = asyncio.create_task(self._renew_periodically())
+
+    async def release(
+        self,
+        project_id: str,
+        collection_id: str,
+        *,
+        query: str = "*",
+        order: str | None = None,
+        join_restriction: str | None = None,
+        language: str | None = None,
+    ) -> bool:
+        """Delete the pooled token of a search; returns whether there was one."""
+        key = TokenKey(project_id, collection_id, query, order, join_restriction, language)
+        lease = self._leases.pop(key, None)
+        if lease is None:
+            return False
+        await self._delete(lease)
+        return True
+
+    async def close(self) -> None:
+        """Stop renewing and delete all pooled tokens."""
+        if self._renewal is not None:
+            self._renewal.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._renewal
+            self._renewal = None
+        leases, self._leases = list(self._leases.values()), OrderedDict()
+        await asyncio.gather(*(self._delete(lease) for lease in leases))
+
+    async def __aenter__(self) -> SearchTokenPool:
+        self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+
+__all__ = ["SearchTokenLease", "SearchTokenPool", "TokenKey"]
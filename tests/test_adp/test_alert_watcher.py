@@ -0,0 +1,87 @@
+"""Tests for the incremental service alert watcher."""
+
+from datetime import UTC, datetime
+
+import pytest
+from axcpy.adp.models.read_service_alerts import (
+    ReadServiceAlertsResult,
+    ReadServiceAlertsTaskConfig,
+    ServiceAlert,
+)
+from axcpy.adp.services.alert_watcher import ServiceAlertWatcher
+
+
+def _alert(alert_id: str, hour: int) -> ServiceAlert:
+    return ServiceAlert(id=alert_id, report_on=datetime(2026, 1, 19, hour, tzinfo=UTC))
+
+
+class _FakeAsyncSession:
+    """Serves queued alert batches and records the submitted configs."""
+
+    def __init__(self, batches: list[list[ServiceAlert]]) -> None:
+        self.batches = batches
+        self.configs: list[ReadServiceAlertsTaskConfig] = []
+
+    async def read_service_alerts(self, config, *, timeout=None) -> ReadServiceAlertsResult:
+        self.configs.append(config)
+        batch = self.batches.pop(0) if self.batches else []
+        return ReadServiceAlertsResult(adp_readServiceAlerts_json_output=batch)
+
+
+@pytest.mark.asyncio
+async def test_poll_advances_watermark_and_dedupes() -> None:
+    """Test that repeated alerts are dropped and the date filter follows the watermark."""
+    session = _FakeAsyncSession(
+        [
+            [_alert("b", 11), _alert("a", 10)],
+            [_alert("b", 11), _alert("c", 11), _alert("old", 9)],
+        ]
+    )
+    watcher = ServiceAlertWatcher(session, maximum=50)  # type: ignore[arg-type]
+
+    first = await watcher.poll()
+    assert [a.id for a in first] == ["a", "b"]
+    assert session.configs[0].adp_readServiceAlerts_date is None
+    assert session.configs[0].adp_readServiceAlerts_maximum == "50"
+
+    second = await watcher.poll()
+    assert [a.id for a in second] == ["c"]
+    assert session.configs[1].adp_readServiceAlerts_date == "2026-01-19T11:00:00+00:00"
+    # lastDate names an output variable, it is not a filter
+    assert session.configs[1].adp_readServiceAlerts_lastDate == ""
+    assert watcher.watermark == datetime(2026, 1, 19, 11, tzinfo=UTC)
+
+
+@pytest.mark.asyncio
+async def test_ring_buffer_is_bounded() -> None:
+    """Test that only the most recent alerts are retained."""
+    session = _FakeAsyncSession([[_alert(str(i), i) for i in range(5)]])
+    watcher = ServiceAlertWatcher(session, buffer_size=3)  # type: ignore[arg-type]
+    await watcher.poll()
+    assert [a.id for a in watcher.recent] == ["2", "3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_watermark_is_persisted(tmp_path) -> None:
+    """Test that a new watcher resumes from the persisted watermark."""
+    state = tmp_path / "alerts.json"
+    session = _FakeAsyncSession([[_alert("a", 10)]])
+    await ServiceAlertWatcher(session, state_path=state).poll()  # type: ignore[arg-type]
+
+    session = _FakeAsyncSession([[_alert("a", 10), _alert("b", 12)]])
+    resumed = ServiceAlertWatcher(session, state_path=state)  # type: ignore[arg-type]
+    assert resumed.watermark == datetime(2026, 1, 19, 10, tzinfo=UTC)
+    assert [a.id for a in await resumed.poll()] == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_async_iteration() -> None:
+    """Test that the watcher can be consumed with async for."""
+    session = _FakeAsyncSession([[_alert("a", 10)], [], [_alert("b", 11)]])
+    watcher = ServiceAlertWatcher(session, interval=0)  # type: ignore[arg-type]
+    received = []
+    async for alert in watcher:
+        received.append(alert.id)
+        if len(received) == 2:
+            watcher.stop()
+    assert received == ["a", "b"]
@@ -0,0 +1,69 @@
+"""Tests for the Export Documents CSV reader."""
+
+from pathlib import Path
+
+from axcpy.adp.models.export_documents import ExportDocumentsResult, ExportDocumentsTaskConfig
+from axcpy.adp.services.export_reader import ExportDocumentsReader, resolve_export_path
+
+
+def _write(tmp_path: Path, content: str) -> Path:
+    path = tmp_path / "demo_export.csv"
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def test_rows_use_task_dialect(tmp_path: Path) -> None:
+    """Test that separator, text indicator and multivalue separator come from the config."""
+    config = ExportDocumentsTaskConfig()  # ';', '"', '|'
+    path = _write(
+        tmp_path,
+        'Document ID;Title;Custodian\n1;"Hello; world";Smith|Jones\n2;"Say ""hi""";Doe\n',
+    )
+    rows = list(ExportDocumentsReader(config, path))
+    assert rows == [
+        {"Document ID": "1", "Title": "Hello; world", "Custodian": ["Smith", "Jones"]},
+        {"Document ID": "2", "Title": 'Say "hi"', "Custodian": "Doe"},
+    ]
+
+
+def test_explicit_multivalue_fields(tmp_path: Path) -> None:
+    """Test that declared multivalue columns are always lists and others never split."""
+    config = ExportDocumentsTaskConfig(
+        adp_exportDocuments_field_separator=",",
+        adp_exportDocuments_text_indicator="'",
+        adp_exportDocuments_multivalue_separator="#",
+    )
+    path = _write(tmp_path, "id,tags,note\n1,a#b,x#y\n2,,'c,d'\n3,z,\n")
+    reader = ExportDocumentsReader(config, path, multivalue_fields=["tags"])
+    rows = list(reader.rows())
+    assert [r["tags"] for r in rows] == [["a", "b"], [], ["z"]]
+    assert [r["note"] for r in rows] == ["x#y", "c,d", ""]
+    assert reader.columns == ["id", "tags", "note"]
+
+
+def test_batches(tmp_path: Path) -> None:
+    """Test column batches are bounded by size."""
+    config = ExportDocumentsTaskConfig()
+    body = "".join(f"{i};t{i}\n" for i in range(5))
+    path = _write(tmp_path, "id;title\n" + body)
+    batches = list(ExportDocumentsReader(config, path).batches(size=2))
+    assert [len(b["id"]) for b in batches] == [2, 2, 1]
+    assert batches[2] == {"id": ["4"], "title": ["t4"]}
+
+
+def test_empty_file(tmp_path: Path) -> None:
+    """Test that an empty export yields nothing."""
+    path = _write(tmp_path, "")
+    reader = ExportDocumentsReader(ExportDocumentsTaskConfig(), path)
+    assert list(reader.batches()) == []
+    assert reader.columns == []
+
+
+def test_resolve_export_path_with_mount() -> None:
+    """Test translation of the server-side export path to a local mount."""
+    result = ExportDocumentsResult(
+        adp_exportDocuments_exportFileName="demo_export.csv",
+        adp_exportDocuments_exportPath="E:\\MindServer\\export\\demo_export",
+    )
+    path = resolve_export_path(result, {"e:\\MindServer\\export": "/mnt/export"})
+    assert path == Path("/mnt/export/demo_export/demo_export.csv")
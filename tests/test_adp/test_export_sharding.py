@@ -0,0 +1,115 @@
+"""Tests for sharded Export Documents runs."""
+
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+from axcpy.adp.models.export_documents import ExportDocumentsResult, ExportDocumentsTaskConfig
+from axcpy.adp.models.query_engine import QueryEngineResult
+from axcpy.adp.services.export_sharding import ShardedExport, range_partitions
+
+
+def test_range_partitions() -> None:
+    """Test that range partitions are disjoint and open-ended."""
+    assert range_partitions("id", [10, 20]) == ["id<10", "id>=10 AND id<20", "id>=20"]
+    assert range_partitions("rm_sentdate", [datetime(2020, 1, 1, tzinfo=UTC)]) == [
+        "rm_sentdate<1577836800000L",
+        "rm_sentdate>=1577836800000L",
+    ]
+
+
+class _FakeAsyncSession:
+    """Counts from a fixed table and writes one CSV per export into tmp_path."""
+
+    def __init__(
+        self, tmp_path: Path, counts: dict[str, int], fail: frozenset[str] = frozenset()
+    ) -> None:
+        self.tmp_path = tmp_path
+        self.counts = counts
+        self.fail = fail
+        self.exports: list[ExportDocumentsTaskConfig] = []
+
+    async def query_engine(self, config, *, timeout=None) -> QueryEngineResult:
+        return QueryEngineResult(
+            adp_query_engine_documents_count=self.counts[config.adp_queryEngine_engineQuery]
+        )
+
+    async def export_documents(self, config, *, timeout=None) -> ExportDocumentsResult:
+        self.exports.append(config)
+        name = config.adp_exportDocuments_exportName
+        if name in self.fail:
+            raise RuntimeError("disk full")
+        (self.tmp_path / f"{name}.csv").write_text(
+            f"id;query\n{name};{config.adp_exportDocuments_query}\n", encoding="utf-8"
+        )
+        return ExportDocumentsResult(
+            adp_exportDocuments_exportFileName=f"{name}.csv",
+            adp_exportDocuments_exportPath=str(self.tmp_path),
+        )
+
+
+@pytest.mark.asyncio
+async def test_sharded_export_runs_and_merges(tmp_path: Path) -> None:
+    """Test partitions are verified, exported with suffixed names and merged in order."""
+    config = ExportDocumentsTaskConfig(
+        adp_exportDocuments_query="custodian=Smith",
+        adp_exportDocuments_exportName="matter",
+        adp_exportDocuments_engineIdentifier="engine1",
+    )
+    parts = range_partitions("id", [10])
+    counts = {
+        "custodian=Smith": 5,
+        "(custodian=Smith) AND (id<10)": 2,
+        "(custodian=Smith) AND (id>=10)": 3,
+    }
+    session = _FakeAsyncSession(tmp_path, counts)
+
+    result = await ShardedExport(session, config, parts, concurrency=2).run()  # type: ignore[arg-type]
+
+    assert result.total_count == 5
+    assert [p.expected_count for p in result.partitions] == [2, 3]
+    assert all(c.adp_exportDocuments_waitForExport for c in session.exports)
+    rows = list(result.rows())
+    assert [r["id"] for r in rows] == ["matter_part000", "matter_part001"]
+    assert rows[1]["query"] == "(custodian=Smith) AND (id>=10)"
+
+
+@pytest.mark.asyncio
+async def test_sharded_export_detects_gaps(tmp_path: Path) -> None:
+    """Test that partitions not covering the base query are rejected before exporting."""
+    config = ExportDocumentsTaskConfig(adp_exportDocuments_exportName="matter")
+    counts = {"*": 10, "id<10": 4, "id>=10": 5}
+    session = _FakeAsyncSession(tmp_path, counts)
+
+    with pytest.raises(ValueError, match="cover 9 documents"):
+        await ShardedExport(session, config, range_partitions("id", [10])).run()  # type: ignore[arg-type]
+    assert session.exports == []
+
+
+@pytest.mark.asyncio
+async def test_sharded_export_skips_empty_partitions(tmp_path: Path) -> None:
+    """Test that empty partitions are not exported."""
+    config = ExportDocumentsTaskConfig(adp_exportDocuments_exportName="matter")
+    counts = {"*": 4, "id<10": 0, "id>=10": 4}
+    session = _FakeAsyncSession(tmp_path, counts)
+    result = await ShardedExport(session, config, range_partitions("id", [10])).run()  # type: ignore[arg-type]
+    assert [p.index for p in result.partitions] == [1]
+    assert len(session.exports) == 1
+
+
+@pytest.mark.asyncio
+async def test_sharded_export_records_failed_partitions(tmp_path: Path) -> None:
+    """Test that a failing partition is reported while the others finish."""
+    config = ExportDocumentsTaskConfig(adp_exportDocuments_exportName="matter")
+    counts = {"*": 6, "id<10": 1, "id>=10 AND id<20": 2, "id>=20": 3}
+    session = _FakeAsyncSession(tmp_path, counts, fail=frozenset({"matter_part000"}))
+    sharded = ShardedExport(session, config, range_partitions("id", [10, 20]), concurrency=1)  # type: ignore[arg-type]
+
+    result = await sharded.run()
+
+    assert len(session.exports) == 3
+    assert result.has_errors()
+    assert [(p.index, p.error) for p in result.failed] == [(0, "disk full")]
+    assert [p.result is not None for p in result.partitions] == [False, True, True]
+    with pytest.raises(RuntimeError, match="Partition 0 failed: disk full"):
+        result.paths()
@@ -0,0 +1,82 @@
+"""Tests for the Query Engine count matrix."""
+
+import asyncio
+
+import pytest
+from axcpy.adp.models.query_engine import QueryEngineResult, QueryEngineTaskConfig
+from axcpy.adp.services.query_engine_matrix import query_engine_matrix
+
+
+class _FakeAsyncSession:
+    """Answers Query Engine calls with len(engine) * len(query) documents."""
+
+    def __init__(self, fail_on: str | None = None) -> None:
+        self.calls: list[tuple[str, str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail_on = fail_on
+
+    async def query_engine(self, config: QueryEngineTaskConfig, *, timeout=None):
+        engine = config.adp_queryEngine_engineName
+        query = config.adp_queryEngine_engineQuery
+        self.calls.append((engine, query))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        if query == self.fail_on:
+            raise RuntimeError("Query Engine task failed with status: error")
+        return QueryEngineResult(
+            adp_query_engine_documents_count=len(engine) * len(query),
+            adp_query_engine_aggregated_value=str(len(query)),
+        )
+
+
+@pytest.mark.asyncio
+async def test_matrix_layout_and_dedup() -> None:
+    """Test cells are laid out queries x engines and duplicates run once."""
+    session = _FakeAsyncSession()
+    result = await query_engine_matrix(
+        session,  # type: ignore[arg-type]
+        engines=["e1", "eng2"],
+        queries=["*", "abc", "*"],
+        concurrency=2,
+    )
+    assert result.shape == (3, 2)
+    assert result.documents_count == [[2, 4], [6, 12], [2, 4]]
+    assert len(session.calls) == 4
+    assert session.max_in_flight <= 2
+    assert not result.has_errors()
+
+
+@pytest.mark.asyncio
+async def test_matrix_records_errors() -> None:
+    """Test a failing cell does not abort the matrix."""
+    session = _FakeAsyncSession(fail_on="bad")
+    result = await query_engine_matrix(
+        session,  # type: ignore[arg-type]
+        engines=["e1"],
+        queries=["ok", "bad"],
+        config=QueryEngineTaskConfig(adp_queryEngine_engineUserName="reviewer"),
+    )
+    assert result.documents_count == [[4], [None]]
+    assert result.errors[1][0] is not None
+    assert result.has_errors()
+
+
+@pytest.mark.asyncio
+async def test_matrix_numpy_conversion() -> None:
+    """Test conversion to NumPy arrays."""
+    np = pytest.importorskip("numpy")
+    session = _FakeAsyncSession(fail_on="bad")
+    result = await query_engine_matrix(
+        session,  # type: ignore[arg-type]
+        engines=["e1", "e22"],
+        queries=["ab", "bad"],
+    )
+    counts = result.counts_array()
+    assert counts.shape == (2, 2)
+    assert counts[0].tolist() == [4.0, 6.0]
+    assert np.isnan(counts[1]).all()
+    assert result.aggregated_array()[0].tolist() == [2.0, 2.0]
+    assert result.latency_array().shape == (2, 2)
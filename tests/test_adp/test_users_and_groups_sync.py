@@ -0,0 +1,149 @@
+"""Tests for the Manage Users and Groups reconciler."""
+
+import pytest
+
+from axcpy.adp.models.manage_users_and_groups import (
+    Group,
+    ManageUsersAndGroupsResult,
+    ManageUsersAndGroupsTaskConfig,
+    User,
+    UsersAndGroups,
+)
+from axcpy.adp.services.users_and_groups_sync import (
+    UsersAndGroupsReconciler,
+    diff_users_and_groups,
+)
+
+
+def _state(users: dict[str, bool], groups: dict[str, list[str]]) -> UsersAndGroups:
+    return UsersAndGroups(
+        Users={
+            name: User(Name=name, External=external, Existent=True)
+            for name, external in users.items()
+        },
+        Groups={
+            name: Group(Name=name, Users=members, Existent=True) for name, members in groups.items()
+        },
+    )
+
+
+class _FakeSession:
+    """Records submitted configs and serves a fixed directory state."""
+
+    def __init__(self, state: UsersAndGroups) -> None:
+        self.state = state
+        self.submitted: list[ManageUsersAndGroupsTaskConfig] = []
+
+    def manage_users_and_groups(self, config, *, timeout=None) -> ManageUsersAndGroupsResult:
+        self.submitted.append(config)
+        return ManageUsersAndGroupsResult(
+            adp_manageUsersAndGroups_output_file_name="out.json",
+            adp_manageUsersAndGroups_json_output=self.state,
+        )
+
+
+def test_diff_no_changes() -> None:
+    """Test that identical states produce an empty change set."""
+    state = _state({"alice": False}, {"reviewers": ["alice"]})
+    changes = diff_users_and_groups(state, state)
+    assert changes.is_empty()
+    assert list(changes.to_task_configs()) == []
+
+
+def test_diff_adds_and_removes() -> None:
+    """Test that only the differences are scheduled."""
+    current = _state(
+        {"alice": False, "bob": False, "carol": False},
+        {"reviewers": ["alice", "bob"], "legacy": ["carol"]},
+    )
+    desired = _state(
+        {"alice": False, "bob": True, "dave": False},
+        {"reviewers": ["alice", "dave"], "admins": ["alice"]},
+    )
+    changes = diff_users_and_groups(current, desired, passwords={"dave": "secret"}, prune=True)
+
+    created = {u.UserName: u for u in changes.users_to_create}
+    assert set(created) == {"bob", "dave"}
+    assert created["bob"].ExternalUser is True
+    assert created["dave"].Password == "secret"
+    assert [g.GroupName for g in changes.groups_to_create] == ["admins"]
+    assert {(a.GroupName, a.UserName) for a in changes.assignments_to_add} == {
+        ("admins", "alice"),
+        ("reviewers", "dave"),
+    }
+    assert [(a.GroupName, a.UserName, a.Remove) for a in changes.assignments_to_remove] == [
+        ("reviewers", "bob", True)
+    ]
+    assert [u.UserName for u in changes.users_to_remove] == ["carol"]
+    assert [g.GroupName for g in changes.groups_to_remove] == ["legacy"]
+
+
+def test_diff_without_prune_only_adds() -> None:
+    """Test that the default prune=False never schedules removals."""
+    current = _state({"alice": False, "bob": False}, {"reviewers": ["alice", "bob"]})
+    desired = _state({"alice": False}, {"reviewers": ["alice"]})
+    assert diff_users_and_groups(current, desired).is_empty()
+    assert diff_users_and_groups(current, desired, prune=False).is_empty()
+
+
+def test_diff_requires_password_for_users_becoming_internal() -> None:
+    """Test that an external user is not re-created as internal user with an empty password."""
+    current = _state({"alice": True}, {})
+    desired = _state({"alice": False}, {})
+    with pytest.raises(ValueError, match="alice"):
+        diff_users_and_groups(current, desired)
+
+    changes = diff_users_and_groups(current, desired, passwords={"alice": "secret"})
+    assert [(u.UserName, u.ExternalUser, u.Password) for u in changes.users_to_create] == [
+        ("alice", False, "secret")
+    ]
+
+
+def test_diff_ignores_non_existent_current_entries() -> None:
+    """Test that entries the server flags as non-existent are created again."""
+    current = UsersAndGroups(Users={"alice": User(Name="alice", Existent=False)})
+    desired = _state({"alice": False}, {})
+    changes = diff_users_and_groups(current, desired)
+    assert [u.UserName for u in changes.users_to_create] == ["alice"]
+
+
+def test_task_configs_are_batched_by_phase() -> None:
+    """Test chunking respects batch size and keeps phases apart."""
+    current = _state({}, {})
+    desired = _state(
+        {f"user{i}": False for i in range(5)},
+        {"team": [f"user{i}" for i in range(5)]},
+    )
+    configs = list(diff_users_and_groups(current, desired).to_task_configs(batch_size=4))
+
+    # 6 definitions (5 users + 1 group) -> 2 tasks, 5 assignments -> 2 tasks
+    assert len(configs) == 4
+    assert len(configs[0].adp_manageUsersAndGroups_userDefinition) == 4
+    assert configs[0].adp_manageUsersAndGroups_assignmentUserToGroup == []
+    assert len(configs[1].adp_manageUsersAndGroups_groupDefinition) == 1
+    assert configs[2].adp_manageUsersAndGroups_userDefinition == []
+    assert len(configs[2].adp_manageUsersAndGroups_assignmentUserToGroup) == 4
+    assert configs[2].adp_manageUsersAndGroups_assignmentUserToGroup[0]["User name"] == "user0"
+
+
+def test_reconciler_sync_submits_only_changes() -> None:
+    """Test that sync reads state once and submits just the diff."""
+    session = _FakeSession(_state({"alice": False}, {"reviewers": ["alice"]}))
+    reconciler = UsersAndGroupsReconciler(session, batch_size=10)  # type: ignore[arg-type]
+
+    changes = reconciler.sync(_state({"alice": False, "bob": False}, {"reviewers": ["alice"]}))
+
+    assert [u.UserName for u in changes.users_to_create] == ["bob"]
+    # First call reads the state, second submits the single change
+    assert len(session.submitted) == 2
+    assert session.submitted[0].adp_manageUsersAndGroups_userDefinition == []
+    assert session.submitted[1].adp_manageUsersAndGroups_userDefinition[0]["User name"] == "bob"
+
+
+def test_reconciler_sync_noop() -> None:
+    """Test that an in-sync directory results in a single read."""
+    state = _state({"alice": False}, {})
+    session = _FakeSession(state)
+    changes = UsersAndGroupsReconciler(session).sync(state)  # type: ignore[arg-type]
+    assert changes.is_empty()
+    assert len(session.submitted) == 1
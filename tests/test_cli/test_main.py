@@ -1,5 +1,11 @@
 """Tests for CLI main module."""
 
+import subprocess
+import sys
+
+import axcpy
+import axcpy.searchwebapi
+import pytest
 from typer.testing import CliRunner
 from axcpy.cli.main import app
 
@@ -18,3 +24,50 @@ def test_help() -> None:
     result = runner.invoke(app, ["--help"])
     assert result.exit_code == 0
     assert "Axcelerate Python Client" in result.stdout
+
+
+def test_cli_import_does_not_load_searchwebapi() -> None:
+    """Test that the CLI and ADP start without importing the kiota stack."""
+    code = (
+        "import sys, axcpy, axcpy.adp, axcpy.cli.main\n"
+        "assert not [m for m in sys.modules if m.startswith(('kiota', 'axcpy.searchwebapi.'))]\n"
+        "assert axcpy.searchwebapi.SearchWebApiSession.__name__ == 'SearchWebApiSession'\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_lazy_attributes_are_listed_and_unknown_names_rejected() -> None:
+    """Test that lazily imported names show up in dir() and unknown ones raise AttributeError."""
+    assert {"adp", "searchwebapi"} <= set(dir(axcpy))
+    assert {"SearchWebApiClient", "SearchWebApiSession"} <= set(dir(axcpy.searchwebapi))
+    with pytest.raises(AttributeError, match="no attribute 'nope'"):
+        _ = axcpy.nope  # type: ignore[attr-defined]
+    with pytest.raises(AttributeError, match="no attribute 'nope'"):
+        _ = axcpy.searchwebapi.nope  # type: ignore[attr-defined]
+
+
+def test_missing_kiota_names_the_searchwebapi_extra() -> None:
+    """Test that using the client without kiota points to the searchwebapi extra."""
+    code = (
+        "import sys\n"
+        "sys.modules['kiota_abstractions'] = None\n"
+        "import axcpy.searchwebapi\n"
+        "try:\n"
+        "    axcpy.searchwebapi.SearchWebApiSession\n"
+        "except ImportError as e:\n"
+        "    assert 'axcpy[searchwebapi]' in str(e), e\n"
+        "else:\n"
+        "    raise AssertionError('no ImportError')\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_search_export_rejects_resume_to_stdout() -> None:
+    """Test that export validates its options before connecting."""
+    result = runner.invoke(
+        app,
+        ["search", "export", "york", "-P", "p", "-c", "c", "--resume"],
+        env={"SWA_BASE_URL": "https://swa.invalid", "SWA_USERNAME": "u", "SWA_PASSWORD": "p"},
+    )
+    assert result.exit_code == 1
+    assert "--resume requires an output file" in result.output
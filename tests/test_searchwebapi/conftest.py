@@ -0,0 +1,39 @@
+"""Shared fixtures for the SearchWebAPI tests."""
+
+from collections.abc import AsyncIterator, Callable
+
+import httpx
+import pytest
+from axcpy.searchwebapi import SearchWebApiSession
+
+BASE_URL = "https://swa.example.com/searchWebApi"
+
+Handler = Callable[[httpx.Request], httpx.Response]
+SessionFactory = Callable[..., SearchWebApiSession]
+
+
+def _empty_response(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={})
+
+
+@pytest.fixture
+async def make_session() -> AsyncIterator[SessionFactory]:
+    """Factory for logged-in sessions whose requests are answered by a fake server.
+
+    Call it with a handler (``httpx.Request -> httpx.Response``); requests the
+    handler does not care about, such as the logout on close, should get a
+    200 answer. Sessions are closed when the test ends.
+    """
+    sessions: list[SearchWebApiSession] = []
+
+    def make(handler: Handler = _empty_response) -> SearchWebApiSession:
+        swa = SearchWebApiSession(
+            BASE_URL, "user", "secret", http2=False, transport=httpx.MockTransport(handler)
+        )
+        swa.auth_provider.session_id = "s1"
+        sessions.append(swa)
+        return swa
+
+    yield make
+    for swa in sessions:
+        await swa.close()
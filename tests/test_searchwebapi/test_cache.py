@@ -0,0 +1,162 @@
+"""Tests for the search result cache."""
+
+import asyncio
+
+import httpx
+from axcpy.searchwebapi.generated.models.change_request import ChangeRequest
+from axcpy.searchwebapi.generated.models.change_request_type import ChangeRequest_type
+from axcpy.searchwebapi.services import CachedSearch, ChangeWriter, SearchCache, SearchKey
+
+
+def _key(query="*", collection="c", page=1):
+    return SearchKey("records", "p", collection, query, page=page)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_evicts_least_recently_used_and_expired_entries() -> None:
+    """Test that the cache drops the least recently used and expired entries."""
+    clock = _Clock()
+    cache = SearchCache(max_entries=2, ttl=10, clock=clock)
+
+    cache.put(_key("a"), 1)
+    cache.put(_key("b"), 2)
+    assert cache.get(_key("a")) == 1
+    cache.put(_key("c"), 3)
+    assert _key("b") not in cache
+    assert cache.get(_key("a")) == 1
+
+    clock.now = 11
+    assert cache.get(_key("c")) is None
+    assert len(cache) == 1
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_invalidate_drops_collection_or_project() -> None:
+    """Test that invalidation drops a whole collection or project."""
+    cache = SearchCache()
+    cache.put(_key("a", collection="c"), 1)
+    cache.put(_key("a", collection="d"), 2)
+
+    assert cache.invalidate("p", "c") == 1
+    assert _key("a", collection="d") in cache
+    assert cache.invalidate("p") == 1
+    assert len(cache) == 0
+
+
+async def test_get_or_fetch_shares_concurrent_fetches_and_skips_stale_results() -> None:
+    """Test that concurrent misses share one fetch and stale results are not stored."""
+    cache = SearchCache()
+    calls = 0
+    release = asyncio.Event()
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return calls
+
+    first = asyncio.create_task(cache.get_or_fetch(_key(), fetch))
+    second = asyncio.create_task(cache.get_or_fetch(_key(), fetch))
+    await asyncio.sleep(0)
+    cache.invalidate("p", "c")  # a change while the search is in flight
+    release.set()
+
+    assert await asyncio.gather(first, second) == [1, 1]
+    assert calls == 1
+    assert _key() not in cache
+    assert await cache.get_or_fetch(_key(), fetch) == 2
+    assert await cache.get_or_fetch(_key(), fetch) == 2
+
+
+async def test_get_or_fetch_without_store_only_shares_the_fetch() -> None:
+    """Test that store=False shares a concurrent fetch but neither reads nor writes entries."""
+    cache = SearchCache()
+    cache.put(_key(), 0)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        return calls
+
+    results = await asyncio.gather(
+        cache.get_or_fetch(_key(), fetch, store=False),
+        cache.get_or_fetch(_key(), fetch, store=False),
+    )
+
+    assert results == [1, 1]
+    assert cache.get(_key()) == 0
+    assert await cache.get_or_fetch(_key(), fetch, store=False) == 2
+    assert cache.get(_key()) == 0
+
+
+async def test_cached_records_are_invalidated_by_change_writer(make_session) -> None:
+    """Test that flushed changes invalidate cached searches of their collection."""
+    record_requests = 0
+
+    def server(request: httpx.Request) -> httpx.Response:
+        nonlocal record_requests
+        if request.url.path.endswith("/records") and request.method == "GET":
+            record_requests += 1
+            return httpx.Response(
+                200, json={"numberResults": 1, "results": [{"id": f"r{record_requests}"}]}
+            )
+        if request.url.path.endswith("/changes/queue"):
+            return httpx.Response(200, json={"success": True})
+        return httpx.Response(200, json={})
+
+    swa = make_session(server)
+    cache = SearchCache()
+    search = CachedSearch(swa.client, cache)
+
+    first = await search.records("p", "c", query="york", fields=["rm_title"])
+    again = await search.records("p", "c", query="york", fields="rm_title")
+    other_page = await search.records("p", "c", query="york", fields="rm_title", page=2)
+    assert again is first
+    assert other_page is not first
+    assert record_requests == 2
+
+    writer = ChangeWriter(swa.client, "p", "c", flush_interval=None, cache=cache)
+    await writer.add(
+        "york", ChangeRequest(type=ChangeRequest_type.ADD_FOLDERS, field="t", folder_ids=["x"])
+    )
+    await writer.flush()
+
+    refreshed = await search.records("p", "c", query="york", fields="rm_title")
+    assert refreshed.results[0].id == "r3"
+    # not cached while the server may still be applying the changes
+    await search.records("p", "c", query="york", fields="rm_title")
+    assert record_requests == 4
+
+    assert await writer.flush_and_wait() is True
+    drained = await search.records("p", "c", query="york", fields="rm_title")
+    assert await search.records("p", "c", query="york", fields="rm_title") is drained
+    assert record_requests == 5
+
+
+def test_suspended_collection_is_not_cached() -> None:
+    """Test that a suspended collection is neither served nor stored."""
+    cache = SearchCache()
+    cache.put(_key("a"), 1)
+    cache.put(_key("a", collection="other"), 2)
+
+    cache.suspend("p", "c")
+    cache.suspend("p", "c")
+    cache.put(_key("b"), 3)
+    assert _key("a") not in cache and _key("b") not in cache
+    assert cache.get(_key("a", collection="other")) == 2
+
+    cache.resume("p", "c")
+    cache.put(_key("b"), 3)
+    assert _key("b") not in cache
+    cache.resume("p", "c")
+    cache.put(_key("b"), 3)
+    assert cache.get(_key("b")) == 3
@@ -0,0 +1,64 @@
+"""Tests for the cached-search scope manager."""
+
+import asyncio
+
+import httpx
+from axcpy.searchwebapi.services import CachedSearchScope, RecordPager, new_trace_token
+
+
+class _CachingServer:
+    """Creates one cached search per distinct (trace token, query) of /records."""
+
+    def __init__(self) -> None:
+        self.cached: list[tuple[str, str]] = [("foreign.1", "other workload")]
+        self.deletes: list[str] = []
+        self.counter = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/records"):
+            token = request.headers.get("SWA-MDC-TOKEN") or f"auto.{self.counter}"
+            query = request.url.params["query"]
+            if not any(q == query and t.startswith(token) for t, q in self.cached):
+                self.counter += 1
+                self.cached.append((f"{token}.{self.counter}", query))
+            return httpx.Response(200, json={"numberResults": 0, "results": []})
+        if path.endswith("/cachedSearches"):
+            if request.method == "DELETE":
+                ids = request.url.params["creationTraceIds"].split(",")
+                self.deletes.append(request.url.params["creationTraceIds"])
+                self.cached = [(t, q) for t, q in self.cached if t not in ids]
+            return httpx.Response(200, json=[{"creationTraceId": t} for t, _ in self.cached])
+        return httpx.Response(200, json={})
+
+
+def test_new_trace_token_format() -> None:
+    """Test that trace tokens carry the scope name."""
+    token = new_trace_token("priv screen")
+    first, second, label = token.split(".")
+    assert int(first, 36) > 0 and int(second, 36) >= 0
+    assert label == "priv_screen"
+    assert new_trace_token() != new_trace_token()
+
+
+async def test_scope_tags_searches_and_drops_only_its_own(make_session) -> None:
+    """Test that a scope only drops the tokens it created."""
+    server = _CachingServer()
+    swa = make_session(server)
+
+    async with CachedSearchScope(swa.client, "p", "c", label="screen") as scope:
+
+        async def search(query: str) -> None:
+            await RecordPager(swa.client, "p", "c", query=query).fetch_page(1)
+
+        await asyncio.gather(search("a"), search("b"), search("a"))
+        assert len(await scope.cached_searches("c")) == 2
+
+    await RecordPager(swa.client, "p", "c", query="outside").fetch_page(1)
+
+    assert scope.report.created == {"c": 2}
+    assert scope.report.dropped == 2
+    assert len(server.deletes) == 1
+    remaining = [t for t, _ in server.cached]
+    assert remaining[0] == "foreign.1"
+    assert len(remaining) == 2 and not remaining[1].startswith(scope.trace_token)
@@ -0,0 +1,137 @@
+"""Tests for the coalescing change writer."""
+
+import json
+
+import httpx
+import pytest
+from axcpy.searchwebapi.generated.models.change_request import ChangeRequest
+from axcpy.searchwebapi.generated.models.change_request_type import ChangeRequest_type
+from axcpy.searchwebapi.services import ChangeWriter, merge_changes
+
+ADD = ChangeRequest_type.ADD_FOLDERS
+REMOVE = ChangeRequest_type.REMOVE_FOLDERS
+
+
+def _change(type_, field="tags", folders=None, text=None):
+    return ChangeRequest(type=type_, field=field, folder_ids=folders, text=text)
+
+
+class _ChangesServer:
+    def __init__(self) -> None:
+        self.puts: list[tuple[str, str, list[dict]]] = []
+        self.queue_params: list[httpx.QueryParams] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/records") and request.method == "PUT":
+            self.puts.append(
+                (
+                    request.url.params["query"],
+                    request.url.params["blockUntilComplete"],
+                    json.loads(request.content),
+                )
+            )
+            return httpx.Response(200, json={"status": {"successful": True}})
+        if request.url.path.endswith("/changes/queue"):
+            self.queue_params.append(request.url.params)
+            return httpx.Response(200, json={"success": True})
+        return httpx.Response(200, json={})
+
+
+def test_merge_changes_unions_folders_per_field() -> None:
+    """Test that folder changes of the same field are merged."""
+    merged = merge_changes(
+        [
+            _change(ADD, folders=["a"]),
+            _change(ChangeRequest_type.SET_TEXT, field="note", text="x"),
+            _change(ADD, folders=["b", "a"]),
+            _change(ChangeRequest_type.SET_TEXT, field="note", text="y"),
+            _change(REMOVE, folders=["a"]),
+            _change(ADD, folders=["c"]),
+        ]
+    )
+
+    assert [(c.type, c.field, c.folder_ids, c.text) for c in merged] == [
+        (ADD, "tags", ["a", "b"], None),
+        (ChangeRequest_type.SET_TEXT, "note", None, "y"),
+        (REMOVE, "tags", ["a"], None),
+        (ADD, "tags", ["c"], None),
+    ]
+
+
+async def test_flush_coalesces_scopes_with_identical_changes(make_session) -> None:
+    """Test that scopes with identical changes are sent in one request."""
+    server = _ChangesServer()
+    swa = make_session(server)
+    writer = ChangeWriter(swa.client, "p", "c", flush_interval=None)
+
+    for doc in range(5):
+        await writer.add(f"id={doc}", _change(ADD, folders=["responsive"]))
+    await writer.add("id=9", _change(ADD, folders=["privileged"]))
+    await writer.add("id=9", _change(ADD, folders=["hot"]))
+
+    assert writer.pending == 7
+    assert await writer.flush() == 2
+    queries = sorted(q for q, _, _ in server.puts)
+    assert queries == ["(id=0) OR (id=1) OR (id=2) OR (id=3) OR (id=4)", "id=9"]
+    assert {block for _, block, _ in server.puts} == {"false"}
+    bodies = {q: body for q, _, body in server.puts}
+    assert bodies["id=9"] == [
+        {"field": "tags", "folderIds": ["privileged", "hot"], "type": "ADD_FOLDERS"}
+    ]
+    assert writer.pending == 0
+
+
+async def test_flush_by_size_and_scope_limit(make_session) -> None:
+    """Test that the writer flushes once the change or scope limit is reached."""
+    server = _ChangesServer()
+    swa = make_session(server)
+    writer = ChangeWriter(
+        swa.client, "p", "c", max_pending=4, max_scopes_per_request=2, flush_interval=None
+    )
+
+    for doc in range(4):
+        await writer.add(f"id={doc}", _change(ADD, folders=["f"]))
+
+    assert writer.pending == 0
+    assert len(server.puts) == 2
+
+
+async def test_flush_and_wait_queries_change_queue(make_session) -> None:
+    """Test that flush_and_wait polls the change queue until it is empty."""
+    server = _ChangesServer()
+    swa = make_session(server)
+
+    async with ChangeWriter(swa.client, "p", "c", flush_interval=10) as writer:
+        await writer.add("id=1", _change(ADD, folders=["f"]))
+        assert await writer.flush_and_wait(timeout=5) is True
+
+    assert len(server.puts) == 1
+    assert server.queue_params[0]["timeoutMillis"] == "5000"
+
+
+async def test_failed_requests_are_requeued(make_session) -> None:
+    """Test that changes of a failed request are queued again."""
+    server = _ChangesServer()
+    failing = {"id=1"}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "PUT" and request.url.params["query"] in failing:
+            return httpx.Response(200, json={"status": {"successful": False, "errorMessage": "x"}})
+        return server(request)
+
+    swa = make_session(handler)
+    writer = ChangeWriter(swa.client, "p", "c", flush_interval=None)
+    await writer.add("id=1", _change(ADD, folders=["a"]))
+    await writer.add("id=2", _change(ADD, folders=["b"]))
+
+    with pytest.raises(RuntimeError, match="x"):
+        await writer.flush()
+    assert [q for q, _, _ in server.puts] == ["id=2"]
+    assert writer.pending == 1
+
+    await writer.add("id=1", _change(ADD, folders=["c"]))
+    failing.clear()
+    await writer.close()
+    assert server.puts[-1][0] == "id=1"
+    assert server.puts[-1][2] == [{"field": "tags", "folderIds": ["a", "c"], "type": "ADD_FOLDERS"}]
+    assert writer.pending == 0
@@ -0,0 +1,76 @@
+"""Tests for the bounded-concurrency map helper."""
+
+import asyncio
+
+import pytest
+from axcpy.searchwebapi.services import bounded_map
+
+
+async def test_outcomes_are_yielded_with_errors_and_bounded_concurrency() -> None:
+    """Test that every item yields one outcome and at most `concurrency` calls run at once."""
+    running = 0
+    peak = 0
+
+    async def call(item: int) -> int:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001 * (5 - item))
+        running -= 1
+        if item == 3:
+            raise ValueError("three")
+        return item * 10
+
+    outcomes = [outcome async for outcome in bounded_map(call, range(5), concurrency=2)]
+
+    assert peak == 2
+    assert sorted((item, result) for item, result, _ in outcomes) == [
+        (0, 0),
+        (1, 10),
+        (2, 20),
+        (3, None),
+        (4, 40),
+    ]
+    errors = [error for _, _, error in outcomes if error is not None]
+    assert [str(error) for error in errors] == ["three"]
+
+
+async def test_closing_early_cancels_calls_without_hanging() -> None:
+    """Test that closing the generator while the work queue is full returns promptly."""
+    consumed = 0
+    release = asyncio.Event()
+
+    async def items():
+        nonlocal consumed
+        for item in range(100):
+            consumed += 1
+            yield item
+
+    async def call(item: int) -> int:
+        if item:
+            await release.wait()
+        return item
+
+    outcomes = bounded_map(call, items(), concurrency=2)
+    assert await anext(outcomes) == (0, 0, None)
+    await asyncio.sleep(0)
+    await asyncio.wait_for(outcomes.aclose(), 1)
+    assert consumed < 10
+
+
+async def test_failing_input_propagates_after_started_calls() -> None:
+    """Test that an error while iterating the items is raised after the started calls."""
+
+    def items():
+        yield 1
+        yield 2
+        raise RuntimeError("input broke")
+
+    async def call(item: int) -> int:
+        return item
+
+    seen = []
+    with pytest.raises(RuntimeError, match="input broke"):
+        async for item, _, _ in bounded_map(call, items(), concurrency=4):
+            seen.append(item)
+    assert sorted(seen) == [1, 2]
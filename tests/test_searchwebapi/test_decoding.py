@@ -0,0 +1,82 @@
+"""Tests for the fast SearchWebAPI response decoders."""
+
+import json
+
+import pytest
+from kiota_serialization_json.json_parse_node_factory import JsonParseNodeFactory
+
+from axcpy.searchwebapi.generated.models.field_description import FieldDescription
+from axcpy.searchwebapi.generated.models.field_description_type import FieldDescription_type
+from axcpy.searchwebapi.generated.models.search_result import SearchResult
+from axcpy.searchwebapi.services import decode_model, decode_search_result, record_rows
+
+PAGE = {
+    "numberResults": 42,
+    "status": {"successful": True, "httpStatus": 200},
+    "results": [
+        {
+            "id": "doc-1",
+            "rank": 1,
+            "relevance": 0.75,
+            "body": "hello",
+            "fields": [
+                {"id": "rm_title", "value": "Title"},
+                {"id": "rm_size", "value": "12", "valueObject": {"value": 12}},
+            ],
+            "undocumented": True,
+        },
+        {"id": "doc-2", "rank": 2, "relevance": 0.5, "fields": []},
+    ],
+    "extra": "x",
+}
+BODY = json.dumps(PAGE).encode()
+
+
+def _kiota(body: bytes, model: type) -> object:
+    node = JsonParseNodeFactory().get_root_parse_node("application/json", body)
+    return node.get_object_value(model)
+
+
+def test_decode_matches_kiota_with_additional_data() -> None:
+    """Test that decoding with additional data matches the kiota parser."""
+    assert decode_search_result(BODY, additional_data=True) == _kiota(BODY, SearchResult)
+
+
+def test_decode_skips_additional_data_by_default() -> None:
+    """Test that unknown keys are dropped unless asked for."""
+    result = decode_search_result(BODY)
+
+    assert result.number_results == 42
+    assert result.status.successful is True
+    assert [r.id for r in result.results] == ["doc-1", "doc-2"]
+    assert result.results[0].fields[1].value_object.additional_data == {"value": 12}
+    assert result.additional_data == {}
+    assert result.results[0].additional_data == {}
+
+
+def test_decode_model_converts_enums() -> None:
+    """Test that enum values are converted to their members."""
+    description = decode_model(b'{"id": "rm_title", "type": "text"}', FieldDescription)
+
+    assert description.type is FieldDescription_type.Text
+
+
+def test_decode_model_rejects_non_objects() -> None:
+    """Test that a JSON value other than an object is rejected."""
+    with pytest.raises(ValueError):
+        decode_model(b"[]", SearchResult)
+
+
+def test_record_rows_flattens_fields() -> None:
+    """Test that record fields are flattened into rows."""
+    rows = list(record_rows(BODY))
+
+    assert rows[0] == {
+        "id": "doc-1",
+        "rank": 1,
+        "relevance": 0.75,
+        "body": "hello",
+        "rm_title": "Title",
+        "rm_size": "12",
+    }
+    assert rows[1] == {"id": "doc-2", "rank": 2, "relevance": 0.5}
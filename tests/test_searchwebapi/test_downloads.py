@@ -0,0 +1,124 @@
+"""Tests for the streaming binary downloader."""
+
+import asyncio
+import hashlib
+
+import httpx
+import pytest
+from axcpy.searchwebapi.services import BinaryDownloader
+
+NATIVES = {
+    "doc-1": b"native one " * 1000,
+    "doc-2": b"native two " * 500,
+    "doc-3": b"native one " * 1000,  # duplicate content of doc-1
+}
+
+
+class _BinaryServer:
+    """Serves NATIVES with Range support and records the requests."""
+
+    def __init__(self, chunk_size: int | None = None) -> None:
+        self.requests: list[httpx.Request] = []
+        self.chunk_size = chunk_size
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if not request.url.path.endswith("/content"):
+            return httpx.Response(200, json={})
+        record_id = request.url.path.split("/")[-2]
+        if record_id not in NATIVES:
+            return httpx.Response(404)
+        assert request.url.params["field"] == "rm_native"
+        data = NATIVES[record_id]
+        headers = {"Content-Disposition": f'attachment; filename="{record_id}.pdf"'}
+        if "Range" in request.headers:
+            start = int(request.headers["Range"].removeprefix("bytes=").rstrip("-"))
+            return httpx.Response(206, content=data[start:], headers=headers)
+        if self.chunk_size:
+            return httpx.Response(200, content=self._chunks(data), headers=headers)
+        return httpx.Response(200, content=data, headers=headers)
+
+    async def _chunks(self, data: bytes):
+        for start in range(0, len(data), self.chunk_size):
+            await asyncio.sleep(0)  # let concurrent downloads interleave
+            yield data[start : start + self.chunk_size]
+
+
+async def test_download_streams_to_content_addressed_path(make_session, tmp_path) -> None:
+    """Test that a download is stored under its checksum."""
+    server = _BinaryServer()
+    swa = make_session(server)
+    downloader = BinaryDownloader(swa, "p", "c", tmp_path, field="rm_native", chunk_size=1024)
+
+    result = await downloader.download("doc-1")
+
+    digest = hashlib.sha256(NATIVES["doc-1"]).hexdigest()
+    assert result.digest == digest
+    assert result.path == tmp_path / digest[:2] / digest[2:4] / digest
+    assert result.path.read_bytes() == NATIVES["doc-1"]
+    assert result.filename == "doc-1.pdf"
+    assert server.requests[0].headers["SWA-SESSION"] == "s1"
+
+    again = await downloader.download("doc-1")
+    assert again.skipped
+    assert len(server.requests) == 1
+
+
+async def test_download_resumes_partial_file(make_session, tmp_path) -> None:
+    """Test that a partial file is resumed with a range request."""
+    server = _BinaryServer()
+    swa = make_session(server)
+    downloader = BinaryDownloader(swa, "p", "c", tmp_path, field="rm_native")
+    partial = downloader._partial_path("doc-2", "rm_native")
+    partial.parent.mkdir(parents=True)
+    partial.write_bytes(NATIVES["doc-2"][:1000])
+
+    result = await downloader.download("doc-2")
+
+    assert server.requests[0].headers["Range"] == "bytes=1000-"
+    assert result.path.read_bytes() == NATIVES["doc-2"]
+    assert result.digest == hashlib.sha256(NATIVES["doc-2"]).hexdigest()
+    assert not partial.exists()
+
+
+async def test_download_rejects_checksum_mismatch(make_session, tmp_path) -> None:
+    """Test that a file with the wrong checksum is rejected."""
+    swa = make_session(_BinaryServer())
+    downloader = BinaryDownloader(swa, "p", "c", tmp_path, field="rm_native", algorithm="md5")
+
+    with pytest.raises(ValueError):
+        await downloader.download("doc-1", expected_digest="0" * 32)
+    assert not downloader._partial_path("doc-1", "rm_native").exists()
+
+
+async def test_download_many_reports_failures_and_deduplicates(make_session, tmp_path) -> None:
+    """Test that download_many reports failures and fetches each binary once."""
+    swa = make_session(_BinaryServer())
+    downloader = BinaryDownloader(swa, "p", "c", tmp_path, field="rm_native", workers=2)
+
+    results = {
+        r.record_id: r
+        async for r in downloader.download_many(["doc-1", "doc-2", "doc-3", "missing"])
+    }
+
+    assert results["missing"].error is not None
+    assert results["doc-1"].path == results["doc-3"].path
+    assert results["doc-2"].path.read_bytes() == NATIVES["doc-2"]
+    assert len((tmp_path / "manifest.jsonl").read_text().splitlines()) == 3
+
+
+async def test_duplicate_record_ids_are_downloaded_once(make_session, tmp_path) -> None:
+    """Test that concurrent downloads of the same binary share one request."""
+    server = _BinaryServer(chunk_size=1000)
+    swa = make_session(server)
+    downloader = BinaryDownloader(
+        swa, "p", "c", tmp_path, field="rm_native", workers=4, chunk_size=1000
+    )
+
+    results = [r async for r in downloader.download_many(["doc-1"] * 4 + ["doc-2"])]
+
+    assert len(results) == 5 and not any(r.error for r in results)
+    assert sorted(r.skipped for r in results if r.record_id == "doc-1") == [False, True, True, True]
+    assert all(r.path.read_bytes() == NATIVES[r.record_id] for r in results)
+    assert sum(r.url.path.endswith("/doc-1/content") for r in server.requests) == 1
+    assert not any((tmp_path / ".partial").iterdir())
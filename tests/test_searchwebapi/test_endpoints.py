@@ -0,0 +1,102 @@
+"""Tests for the precompiled collection endpoints."""
+
+import gc
+
+import httpx
+from kiota_abstractions.base_request_configuration import RequestConfiguration
+from kiota_abstractions.method import Method
+from axcpy.searchwebapi import SearchWebApiSession
+from axcpy.searchwebapi.services import collection_endpoints
+from axcpy.searchwebapi.services.endpoints import (
+    _ENDPOINTS,
+    BinaryContentQueryParameters,
+    QueueQueryParameters,
+    RecordsQueryParameters,
+    SearchTokenQueryParameters,
+)
+
+
+def _builder_url(swa: SearchWebApiSession, info) -> str:
+    swa.request_adapter.set_base_url_for_request_information(info)
+    return info.url
+
+
+async def test_urls_match_generated_builders(make_session) -> None:
+    """Test that the endpoint URLs match those of the generated builders."""
+    swa = make_session()
+    endpoints = collection_endpoints(swa.client, "p 1", "docs/x")
+    collection = swa.client.projects.by_project_id("p 1").collections.by_collection_id("docs/x")
+    params = RecordsQueryParameters(
+        query='author:"O\'Brien" & york', fields="a,b", body=False, limit=100, page=3
+    )
+
+    fast = endpoints.records_request(params)
+    slow = collection.records.to_get_request_information(
+        RequestConfiguration(query_parameters=params)
+    )
+    assert fast.url == _builder_url(swa, slow)
+    assert fast.request_headers == slow.request_headers
+
+    queue = QueueQueryParameters(timeout_millis=5000, only_high_priority_changes=True)
+    slow = collection.changes.queue.to_get_request_information(
+        RequestConfiguration(query_parameters=queue)
+    )
+    assert endpoints.changes_queue_request(queue).url == _builder_url(swa, slow)
+
+    token = SearchTokenQueryParameters(query="york", order="rm_modificationdate:desc")
+    slow = collection.search_token.to_get_request_information(
+        RequestConfiguration(query_parameters=token)
+    )
+    assert endpoints.search_token_request(Method.GET, token).url == _builder_url(swa, slow)
+
+    binary = BinaryContentQueryParameters(field="rm_native")
+    slow = collection.binary.by_record_id("r/1").content.to_get_request_information(
+        RequestConfiguration(query_parameters=binary)
+    )
+    assert endpoints.binary_content_request("r/1", "rm_native").url == _builder_url(swa, slow)
+
+
+async def test_endpoints_are_shared_and_send_through_the_session(make_session) -> None:
+    """Test that endpoints are cached per collection and use the session."""
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path.endswith("/searchToken"):
+            return httpx.Response(200, json={"token": "t1", "numberResults": 7})
+        return httpx.Response(200, json={"numberResults": 0, "results": []})
+
+    swa = make_session(handler)
+    endpoints = collection_endpoints(swa.client, "p", "c")
+    assert collection_endpoints(swa.client, "p", "c") is endpoints
+    assert collection_endpoints(swa.client, "p", "other") is not endpoints
+
+    await endpoints.get_records(RecordsQueryParameters(query="york", limit=10))
+    await endpoints.renew_search_token("t1")
+    await endpoints.delete_search_token("t1")
+
+    get, put, delete = requests
+    assert get.url.path == "/searchWebApi/projects/p/collections/c/records"
+    assert get.url.params["query"] == "york" and get.url.params["limit"] == "10"
+    assert get.headers["SWA-SESSION"] == "s1"
+    assert (put.method, delete.method) == ("PUT", "DELETE")
+    assert put.content == delete.content == b'{"token": "t1"}'
+
+
+def test_endpoints_are_released_with_the_session() -> None:
+    """Test that the shared endpoints do not keep a collected session's client alive."""
+    swa = SearchWebApiSession(
+        "https://swa.example/searchWebApi",
+        "user",
+        "secret",
+        http2=False,
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json={})),
+    )
+    collection_endpoints(swa.client, "p", "c")
+    gc.collect()  # sessions of earlier tests
+    entries = len(_ENDPOINTS)
+
+    del swa
+    gc.collect()
+
+    assert len(_ENDPOINTS) == entries - 1
@@ -0,0 +1,142 @@
+"""Tests for the streaming search export."""
+
+import csv
+import json
+
+import httpx
+import pytest
+from axcpy.searchwebapi import SearchWebApiSession
+from axcpy.searchwebapi.services import SearchExport
+from axcpy.searchwebapi.services.export import last_written_rank
+
+TOTAL = 23
+
+
+class _RecordsServer:
+    """Serves TOTAL ranked records in pages and records the requested pages."""
+
+    def __init__(self) -> None:
+        self.pages: list[int] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if not request.url.path.endswith("/records"):
+            return httpx.Response(200, json={})
+        params = request.url.params
+        page, limit = int(params["page"]), int(params["limit"])
+        self.pages.append(page)
+        assert params["fields"] == "rm_title"
+        ranks = range((page - 1) * limit + 1, min(page * limit, TOTAL) + 1)
+        results = [
+            {
+                "id": f"doc-{rank}",
+                "rank": rank,
+                "relevance": 1.0,
+                "fields": [{"id": "rm_title", "value": f'Title "{rank}", ünïcode'}],
+            }
+            for rank in ranks
+        ]
+        return httpx.Response(200, json={"numberResults": TOTAL, "results": results})
+
+
+def _export(swa: SearchWebApiSession, **kwargs) -> SearchExport:
+    return SearchExport(
+        swa.client, "p", "c", query="york", fields=["rm_title"], page_size=5, **kwargs
+    )
+
+
+async def test_ndjson_export_writes_all_records_in_rank_order(make_session, tmp_path) -> None:
+    """Test that an NDJSON export writes every record in rank order."""
+    server = _RecordsServer()
+    swa = make_session(server)
+    path = tmp_path / "out.ndjson"
+    progress = []
+
+    report = await _export(swa, prefetch=2).write(
+        path, on_progress=lambda r: progress.append(r.records), progress_interval=0
+    )
+
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line["rank"] for line in lines] == list(range(1, TOTAL + 1))
+    assert lines[0] == {
+        "id": "doc-1",
+        "rank": 1,
+        "relevance": 1.0,
+        "rm_title": 'Title "1", ünïcode',
+    }
+    assert report.records == report.number_results == TOTAL
+    assert report.last_rank == TOTAL
+    assert progress[-1] == TOTAL
+
+
+async def test_interrupted_csv_export_resumes_after_last_complete_record(
+    make_session, tmp_path
+) -> None:
+    """Test that a truncated CSV export resumes after its last complete line."""
+    server = _RecordsServer()
+    swa = make_session(server)
+    path = tmp_path / "out.csv"
+
+    first = await _export(swa, max_records=12).write(path)
+    assert first.records == 12
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write("doc-13,13,1.0,Tit")  # partial row of a killed export
+    assert last_written_rank(path) == 12
+
+    server.pages.clear()
+    second = await _export(swa).write(path, resume=True)
+
+    with path.open(encoding="utf-8", newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    assert [int(row["rank"]) for row in rows] == list(range(1, TOTAL + 1))
+    assert rows[12]["rm_title"] == 'Title "13", ünïcode'
+    assert second.resumed_after_rank == 12 and second.records == TOTAL - 12
+    assert server.pages[0] == 3  # ranks 11..15, the first two are skipped
+
+    with pytest.raises(ValueError, match="columns differ"):
+        await SearchExport(swa.client, "p", "c", fields=["rm_title"], body=True).write(
+            path, resume=True
+        )
+
+
+async def test_resume_with_other_columns_leaves_the_file_unchanged(make_session, tmp_path) -> None:
+    """Test that a rejected resume does not truncate the partial last line."""
+    swa = make_session(_RecordsServer())
+    path = tmp_path / "out.csv"
+    await _export(swa, max_records=3).write(path)
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write("doc-4,4,1.0,Tit")
+    written = path.read_bytes()
+
+    with pytest.raises(ValueError, match="columns differ"):
+        await SearchExport(swa.client, "p", "c", fields=["rm_title"], body=True).write(
+            path, resume=True
+        )
+
+    assert path.read_bytes() == written
+
+
+async def test_resume_skips_back_over_records_without_rank(make_session, tmp_path) -> None:
+    """Test that resuming ignores trailing records without a rank."""
+    server = _RecordsServer()
+    swa = make_session(server)
+    path = tmp_path / "out.ndjson"
+
+    await _export(swa, max_records=7).write(path)
+    with path.open("a", encoding="utf-8") as handle:  # rows 8 and 9 came back unranked
+        handle.write('{"id":"doc-8","rank":null}\n{"id":"doc-9","rank":null}\n{"id":"d')
+    assert last_written_rank(path) == 7
+    assert path.read_text(encoding="utf-8").splitlines()[-1].startswith('{"id":"doc-7"')
+
+    second = await _export(swa).write(path, resume=True)
+
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line["id"] for line in lines] == [f"doc-{rank}" for rank in range(1, TOTAL + 1)]
+    assert second.resumed_after_rank == 7
+
+
+def test_last_written_rank_of_csv_without_ranked_records(tmp_path) -> None:
+    """Test that a CSV file holding only its header resumes from the start."""
+    path = tmp_path / "out.csv"
+    path.write_text("id,rank,relevance\ndoc-1,,1.0\n", encoding="utf-8")
+    assert last_written_rank(path) == 0
+    assert path.read_text(encoding="utf-8") == "id,rank,relevance\n"
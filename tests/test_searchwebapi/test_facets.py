@@ -0,0 +1,91 @@
+"""Tests for the facet scanner."""
+
+import asyncio
+
+import httpx
+from axcpy.searchwebapi.services import FacetScanner
+from axcpy.searchwebapi.services.facets import UNKNOWN_NUMBER_RESULTS
+
+FOLDERS = [
+    {"id": f"{name}-{i}", "displayName": f"{name}{i:04d}", "count": i + 1}
+    for name in ("alpha", "beta")
+    for i in range(25)
+]
+
+
+class _FacetServer:
+    def __init__(self, *, report_total: bool = True) -> None:
+        self.report_total = report_total
+        self.params: list[httpx.QueryParams] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if not request.url.path.endswith("/filters/custodian/values"):
+            return httpx.Response(200, json={})
+        self.params.append(request.url.params)
+        prefix = request.url.params.get("prefix", "")
+        offset = int(request.url.params["offset"])
+        limit = int(request.url.params["limit"])
+        matching = [f for f in FOLDERS if f["displayName"].startswith(prefix)]
+        total = len(matching) if self.report_total else UNKNOWN_NUMBER_RESULTS
+        return httpx.Response(
+            200,
+            json={"numberResults": total, "results": matching[offset : offset + limit]},
+        )
+
+
+async def test_collect_pages_concurrently_with_known_total(make_session) -> None:
+    """Test that pages are fetched concurrently when the total is known."""
+    server = _FacetServer()
+    swa = make_session(server)
+    scanner = FacetScanner(swa.client, "p", "c", "custodian", page_size=10, order="name")
+
+    facet = await scanner.collect()
+
+    assert sorted(facet.ids) == sorted(f["id"] for f in FOLDERS)
+    assert sum(facet.counts) == sum(f["count"] for f in FOLDERS)
+    assert sorted(int(p["offset"]) for p in server.params) == [0, 10, 20, 30, 40]
+    assert {p["order"] for p in server.params} == {"name"}
+
+
+async def test_collect_pages_until_short_page_for_meta_engines(make_session) -> None:
+    """Test that meta engines are paged until a short page."""
+    server = _FacetServer(report_total=False)
+    swa = make_session(server)
+    scanner = FacetScanner(swa.client, "p", "c", "custodian", page_size=20)
+
+    records = [r async for r in scanner.records()]
+
+    assert len(records) == len(FOLDERS)
+    assert [int(p["offset"]) for p in server.params] == [0, 20, 40]
+
+
+async def test_collect_shards_by_prefix_and_checks_coverage(make_session) -> None:
+    """Test that facet values are sharded by prefix and checked for coverage."""
+    server = _FacetServer()
+    swa = make_session(server)
+    scanner = FacetScanner(swa.client, "p", "c", "custodian", prefixes=["alpha", "beta"])
+
+    facet = await scanner.collect()
+
+    assert len(facet) == len(FOLDERS)
+    assert facet.expected_count == len(FOLDERS)
+    assert facet.complete is True
+    assert {p.get("prefix") for p in server.params} == {"alpha", "beta", None}
+
+    partial = await FacetScanner(swa.client, "p", "c", "custodian", prefixes=["alpha"]).collect()
+    assert partial.complete is False
+
+
+async def test_breaking_out_of_records_stops_the_scan(make_session) -> None:
+    """Test that leaving the loop early while the page queue is full returns promptly."""
+    server = _FacetServer()
+    swa = make_session(server)
+    scanner = FacetScanner(swa.client, "p", "c", "custodian", page_size=1, concurrency=1)
+
+    records = scanner.records()
+    first = await anext(records)
+    for _ in range(10):
+        await asyncio.sleep(0)  # let the shard fill the queue
+    await asyncio.wait_for(records.aclose(), 1)
+
+    assert first.id == FOLDERS[0]["id"]
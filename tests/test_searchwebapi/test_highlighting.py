@@ -0,0 +1,219 @@
+"""Tests for batched in-document search and highlighted document content."""
+
+import gc
+
+import httpx
+import pytest
+from kiota_abstractions.api_error import APIError
+from axcpy.searchwebapi import SearchWebApiSession
+from axcpy.searchwebapi.services import (
+    DocumentHighlighter,
+    HighlightExpressionCache,
+    InDocumentSearchBatch,
+    SearchCache,
+    highlight_expressions,
+)
+from axcpy.searchwebapi.services.highlighting import _EXPRESSIONS
+
+HITS = {
+    "doc-1": {
+        "searchTerms": {
+            "termsToHighlight": ["privileged", "counsel"],
+            "numberHits": 3,
+            "numberHitsByPage": [2, 0, 1],
+            "hitLocationsRel": [0.1, 0.8, 0.5],
+        }
+    },
+    "doc-2": {
+        "searchTerms": {"termsToHighlight": [], "numberHits": 0, "numberHitsByPage": []},
+        "userTerms": {"termsToHighlight": ["attorney"], "numberHits": 1, "hitLocationsRel": [0.3]},
+    },
+}
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _HighlightServer:
+    def __init__(self) -> None:
+        self.expression_requests = 0
+        self.search_params: list[httpx.QueryParams] = []
+        self.content_params: list[httpx.QueryParams] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/search/highlightExpression"):
+            self.expression_requests += 1
+            if request.url.params["query"] != "privileged OR counsel":
+                return httpx.Response(400, json={"message": "Syntax error"})
+            return httpx.Response(
+                200, json={"results": [{"field": "*", "regularExpression": "privileged|counsel"}]}
+            )
+        if path.endswith("/inDocumentSearch"):
+            self.search_params.append(request.url.params)
+            record_id = path.split("/")[-2]
+            if record_id not in HITS:
+                return httpx.Response(404, json={})
+            return httpx.Response(200, json=HITS[record_id])
+        if path.endswith("/content"):
+            self.content_params.append(request.url.params)
+            record_id = path.split("/")[-2]
+            return httpx.Response(200, json={"id": record_id, "body": f"<p>{record_id}</p>"})
+        return httpx.Response(200, json={})
+
+
+async def test_batch_builds_columnar_hit_table(make_session) -> None:
+    """Test that a batch of searches yields a columnar hit table."""
+    server = _HighlightServer()
+    swa = make_session(server)
+    batch = InDocumentSearchBatch(
+        swa.client, "p", "c", query="privileged OR counsel", user_terms=["attorney"], concurrency=2
+    )
+
+    async def record_ids():
+        for record_id in ("doc-1", "doc-2", "missing"):
+            yield record_id
+
+    table = await batch.run(record_ids())
+
+    assert server.expression_requests == 1
+    assert table.expression == {"*": "privileged|counsel"}
+    rows = sorted(zip(table.record_ids, table.kinds, table.pages, table.locations))
+    assert rows == [
+        ("doc-1", "search_terms", 1, 0.1),
+        ("doc-1", "search_terms", 1, 0.8),
+        ("doc-1", "search_terms", 3, 0.5),
+        ("doc-2", "user_terms", 0, 0.3),
+    ]
+    assert table.hit_counts == {"doc-1": 3, "doc-2": 1}
+    assert sorted(table.terms) == ["attorney", "counsel", "privileged"]
+    assert list(table.errors) == ["missing"]
+    params = server.search_params[0]
+    assert params["highlightSearchTermQuery"] == "privileged OR counsel"
+    assert params["highlightUserTerms"] == "attorney"
+    assert params["requestHitLocationsPageRelative"] == "true"
+
+
+async def test_results_report_each_document_once(make_session) -> None:
+    """Test that results yields one outcome per document, with either a result or an error."""
+    server = _HighlightServer()
+    swa = make_session(server)
+    batch = InDocumentSearchBatch(swa.client, "p", "c", query="privileged OR counsel")
+
+    outcomes = {
+        record_id: (result, error)
+        async for record_id, result, error in batch.results(["doc-1", "missing", "doc-2"])
+    }
+
+    assert sorted(outcomes) == ["doc-1", "doc-2", "missing"]
+    result, error = outcomes["doc-1"]
+    assert error is None and result is not None
+    assert result.search_terms is not None and result.search_terms.number_hits == 3
+    result, error = outcomes["missing"]
+    assert result is None and error is not None
+    assert batch.expression == {"*": "privileged|counsel"}
+
+
+async def test_invalid_query_fails_before_any_document_is_searched(make_session) -> None:
+    """Test that a query the server rejects fails the batch before searching documents."""
+    server = _HighlightServer()
+    swa = make_session(server)
+    batch = InDocumentSearchBatch(swa.client, "p", "c", query="privileged AND (")
+
+    with pytest.raises(APIError):
+        await batch.run(["doc-1", "doc-2"])
+
+    assert server.expression_requests == 1
+    assert server.search_params == []
+
+
+async def test_expression_is_fetched_once_per_search(make_session) -> None:
+    """Test that the highlight expression is only fetched once per search."""
+    server = _HighlightServer()
+    swa = make_session(server)
+    query = "privileged OR counsel"
+    viewer = DocumentHighlighter(swa.client, "p", "c", query=query, fields=["rm_title"])
+
+    first = await viewer.content("doc-1")
+    second = await viewer.content("doc-2", page=2)
+    reopened = DocumentHighlighter(swa.client, "p", "c", query=query, hit_navigation="next")
+    await reopened.content("doc-1")
+    await InDocumentSearchBatch(swa.client, "p", "c", query=query).run(["doc-1"])
+
+    assert server.expression_requests == 1
+    assert first.expression == second.expression == {"*": "privileged|counsel"}
+    assert (second.record_id, second.record.body) == ("doc-2", "<p>doc-2</p>")
+    assert len(server.content_params) == 3
+    params = server.content_params[1]
+    assert params["highlightSearchTermQuery"] == query
+    assert params["body"] == "true" and params["page"] == "2"
+    assert params["fields"] == "rm_title"
+    assert server.content_params[2]["highlightHitNavigation"] == "next"
+
+    expressions = HighlightExpressionCache(swa.client)
+    other = DocumentHighlighter(swa.client, "p", "c", query=query, expressions=expressions)
+    await other.content("doc-1")
+    assert server.expression_requests == 2
+    assert expressions.invalidate("p") == 1
+
+
+async def test_expressions_expire_after_ttl(make_session) -> None:
+    """Test that a memoized expression is fetched again once its TTL has passed."""
+    server = _HighlightServer()
+    swa = make_session(server)
+    clock = _Clock()
+    expressions = HighlightExpressionCache(swa.client, cache=SearchCache(ttl=10, clock=clock))
+    query = "privileged OR counsel"
+
+    await expressions.get("p", "c", query=query)
+    clock.now = 9
+    await expressions.get("p", "c", query=query)
+    assert server.expression_requests == 1
+
+    clock.now = 10
+    assert expressions.cached("p", "c", query=query) is None
+    assert await expressions.get("p", "c", query=query) == {"*": "privileged|counsel"}
+    assert server.expression_requests == 2
+
+
+async def test_invalidating_the_shared_cache_refetches_expressions(make_session) -> None:
+    """Test that invalidating the client's shared cache makes new viewers fetch again."""
+    server = _HighlightServer()
+    swa = make_session(server)
+    query = "privileged OR counsel"
+    shared = highlight_expressions(swa.client)
+    assert highlight_expressions(swa.client) is shared
+
+    await DocumentHighlighter(swa.client, "p", "c", query=query).content("doc-1")
+    assert shared.cached("p", "c", query=query) == {"*": "privileged|counsel"}
+    assert shared.invalidate("p", "other") == 0
+    assert shared.invalidate("p", "c") == 1
+    assert shared.cached("p", "c", query=query) is None
+
+    await DocumentHighlighter(swa.client, "p", "c", query=query).content("doc-2")
+    await InDocumentSearchBatch(swa.client, "p", "c", query=query).run(["doc-1"])
+    assert server.expression_requests == 2
+
+
+def test_shared_cache_is_released_with_the_session() -> None:
+    """Test that the shared expression cache does not keep a collected session's client alive."""
+    swa = SearchWebApiSession(
+        "https://swa.example/searchWebApi",
+        "user",
+        "secret",
+        http2=False,
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json={})),
+    )
+    highlight_expressions(swa.client)
+    gc.collect()  # sessions of earlier tests
+    entries = len(_EXPRESSIONS)
+
+    del swa
+    gc.collect()
+
+    assert len(_EXPRESSIONS) == entries - 1
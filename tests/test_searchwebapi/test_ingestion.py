@@ -0,0 +1,169 @@
+"""Tests for the bulk ingestion pipeline."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from axcpy.searchwebapi.generated.models.field_data import FieldData
+from axcpy.searchwebapi.generated.models.job_status import JobStatus
+from axcpy.searchwebapi.generated.models.record_data import RecordData
+from axcpy.searchwebapi.services import BulkIngestion
+
+
+class _TransactionServer:
+    """Accepts buffers for transaction B1 and reports job J1 as finished on the second poll."""
+
+    def __init__(self, fail_on_buffer: int | None = None, reject_buffer: int | None = None) -> None:
+        self.fail_on_buffer = fail_on_buffer
+        self.reject_buffer = reject_buffer
+        self.buffers: list[list[str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.starts = 0
+        self.finish_body: dict | None = None
+        self.polls = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/bulkInsertRemoveTransaction"):
+            self.starts += 1
+            return httpx.Response(200, json={"indexingBufferId": "B1"})
+        if path.endswith("/B1/buffer"):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await asyncio.sleep(0.01)
+                if self.fail_on_buffer is not None and len(self.buffers) == self.fail_on_buffer:
+                    self.fail_on_buffer = None
+                    return httpx.Response(500, json={"status": {"successful": False}})
+                if self.reject_buffer is not None and len(self.buffers) == self.reject_buffer:
+                    self.reject_buffer = None
+                    status = {"successful": False, "errorMessage": "Buffer is full"}
+                    return httpx.Response(200, json={"status": status})
+                body = json.loads(request.content)
+                self.buffers.append([r["uniqueId"] for r in body["newRecords"]])
+                return httpx.Response(200, json={"status": {"successful": True}})
+            finally:
+                self.in_flight -= 1
+        if path.endswith("/B1/end"):
+            self.finish_body = json.loads(request.content)
+            return httpx.Response(200, json={"jobId": "J1"})
+        if path.endswith("/B1/end/J1"):
+            self.polls += 1
+            status = "FINISHED" if self.polls >= 2 else "RUNNING"
+            return httpx.Response(200, json={"jobStatus": status})
+        return httpx.Response(200, json={})
+
+
+def _records(count: int) -> list[RecordData]:
+    return [
+        RecordData(
+            unique_id=f"doc-{i}",
+            field_data=[FieldData(field_name="rm_title", value=f"Title {i}")],
+        )
+        for i in range(count)
+    ]
+
+
+async def test_run_chunks_uploads_and_finishes(make_session) -> None:
+    """Test that records are uploaded in chunks and the job is finished."""
+    server = _TransactionServer()
+    swa = make_session(server)
+
+    ingestion = BulkIngestion(
+        swa.client,
+        "p",
+        "c",
+        data_source_id="crawler",
+        max_records=4,
+        concurrency=2,
+        poll_interval=0.0,
+    )
+    report = await ingestion.run(_records(10))
+
+    assert sorted(sum(server.buffers, [])) == sorted(f"doc-{i}" for i in range(10))
+    assert sorted(len(b) for b in server.buffers) == [2, 4, 4]
+    assert server.max_in_flight == 2
+    assert server.finish_body == {"numberDocuments": 10, "analyzedSizeGb": 1}
+    assert report.documents == 10
+    assert report.buffers == 3
+    assert report.job_id == "J1"
+    assert report.job_status == JobStatus.FINISHED
+    assert report.documents_per_second > 0
+
+
+async def test_buffers_are_bounded_by_bytes(make_session) -> None:
+    """Test that buffers are cut at the byte limit."""
+    server = _TransactionServer()
+    swa = make_session(server)
+
+    ingestion = BulkIngestion(
+        swa.client, "p", "c", data_source_id="crawler", max_bytes=150, poll_interval=0.0
+    )
+    await ingestion.upload(_records(6))
+
+    assert all(len(b) <= 2 for b in server.buffers)
+    assert ingestion.state.uploaded_records == 6
+
+
+async def test_resume_skips_acknowledged_records(make_session, tmp_path) -> None:
+    """Test that resuming skips records the server has acknowledged."""
+    state_path = tmp_path / "ingestion.json"
+    server = _TransactionServer(fail_on_buffer=2)
+    swa = make_session(server)
+
+    first = BulkIngestion(
+        swa.client,
+        "p",
+        "c",
+        data_source_id="crawler",
+        max_records=2,
+        concurrency=1,
+        state_path=state_path,
+    )
+    with pytest.raises(Exception):
+        await first.upload(_records(8))
+    assert first.state.uploaded_records == 4
+    assert state_path.exists()
+
+    second = BulkIngestion(
+        swa.client,
+        "p",
+        "c",
+        data_source_id="crawler",
+        max_records=2,
+        concurrency=1,
+        poll_interval=0.0,
+        state_path=state_path,
+    )
+    report = await second.run(_records(8))
+
+    assert server.starts == 1
+    assert server.buffers[2:] == [["doc-4", "doc-5"], ["doc-6", "doc-7"]]
+    assert report.documents == 8
+    assert report.resumed_documents == 4
+    assert not state_path.exists()
+
+
+async def test_rejected_buffer_is_not_counted_as_uploaded(make_session, tmp_path) -> None:
+    """Test that a buffer the server answers with an unsuccessful status fails the upload."""
+    state_path = tmp_path / "ingestion.json"
+    server = _TransactionServer(reject_buffer=1)
+    swa = make_session(server)
+
+    ingestion = BulkIngestion(
+        swa.client,
+        "p",
+        "c",
+        data_source_id="crawler",
+        max_records=2,
+        concurrency=1,
+        state_path=state_path,
+    )
+    with pytest.raises(RuntimeError, match="Buffer is full"):
+        await ingestion.upload(_records(6))
+
+    assert ingestion.state.uploaded_records == 2
+    assert ingestion.state.uploaded_buffers == 1
+    assert '"uploaded_records":2' in state_path.read_text(encoding="utf-8")
@@ -0,0 +1,109 @@
+"""Tests for the streaming multipart record insertion."""
+
+import email
+import hashlib
+import json
+from email import policy
+
+import httpx
+from axcpy.searchwebapi.services import InsertDocument, MultipartInserter, SearchCache, SearchKey
+
+
+class _InsertServer:
+    """Parses insert transactions and records their parts per unique id."""
+
+    def __init__(self, fail: set[str] = frozenset()) -> None:
+        self.fail = fail
+        self.inserted: dict[str, tuple[dict, list[bytes], list[str]]] = {}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if not request.url.path.endswith("/records/insertRemoveTransaction"):
+            return httpx.Response(200, json={})
+        assert request.method == "POST"
+        assert request.headers["SWA-SESSION"] == "s1"
+        message = email.message_from_bytes(
+            f"Content-Type: {request.headers['Content-Type']}\r\n\r\n".encode() + request.content,
+            policy=policy.HTTP,
+        )
+        parts = list(message.iter_parts())
+        names = [p.get_param("name", header="Content-Disposition") for p in parts]
+        assert names[-1] == "request" and set(names[:-1]) <= {"binaries"}
+        body = json.loads(parts[-1].get_payload(decode=True))
+        record = body["newRecords"][0]
+        fields = {f["fieldName"]: f.get("value", f.get("valueList")) for f in record["fieldData"]}
+        binaries = [p.get_payload(decode=True) for p in parts[:-1]]
+        filenames = [p.get_filename() for p in parts[:-1]]
+        self.inserted[record["uniqueId"]] = (fields, binaries, filenames)
+        if record["uniqueId"] in self.fail:
+            return httpx.Response(
+                200, json={"status": {"successful": False, "errorMessage": "duplicate id"}}
+            )
+        return httpx.Response(200, json={"status": {"successful": True}})
+
+
+async def test_insert_streams_files_and_fills_mandatory_fields(make_session, tmp_path) -> None:
+    """Test that inserts stream files and fill in mandatory fields."""
+    server = _InsertServer()
+    swa = make_session(server)
+    native = tmp_path / "letter.pdf"
+    native.write_bytes(b"%PDF " * 5000)
+    xml = tmp_path / "letter.xml"
+    xml.write_bytes(b"<content>Dear York</content>")
+    inserter = MultipartInserter(swa, "p", "c", crawl_id="crawl-1", chunk_size=1000)
+
+    result = await inserter.insert(
+        InsertDocument(
+            "doc-1", fields={"title": "Letter", "tags": ["a", "b"]}, content=[xml], native=native
+        )
+    )
+
+    fields, binaries, filenames = server.inserted["doc-1"]
+    checksum = hashlib.md5(native.read_bytes()).hexdigest()
+    assert result.checksum == checksum
+    assert result.bytes_sent == native.stat().st_size + xml.stat().st_size
+    assert binaries == [xml.read_bytes(), native.read_bytes()]
+    assert filenames == ["content-0.xml", "letter.pdf"]
+    assert fields["content"] == "0"
+    assert fields["rm_native"] == "1"
+    assert fields["rm_checksum"] == checksum
+    assert fields["rm_crawlid"] == "crawl-1"
+    assert fields["rm_attachmentroot"] == "doc-1"
+    assert fields["rm_modificationdate"].endswith("Z")
+    assert fields["title"] == "Letter"
+    assert fields["tags"] == ["a", "b"]
+
+
+async def test_insert_many_pipelines_iterables_and_reports_failures(make_session) -> None:
+    """Test that insert_many runs inserts concurrently and reports failures."""
+    server = _InsertServer(fail={"doc-2"})
+    swa = make_session(server)
+    inserter = MultipartInserter(swa, "p", "c", crawl_id="crawl-1", concurrency=2)
+
+    async def chunks(i: int):
+        for part in (b"<content>", f"document {i}".encode(), b"</content>"):
+            yield part
+
+    documents = (InsertDocument(f"doc-{i}", content=[chunks(i)]) for i in range(5))
+    results = {r.unique_id: r async for r in inserter.insert_many(documents)}
+
+    assert set(results) == set(server.inserted) == {f"doc-{i}" for i in range(5)}
+    assert results["doc-2"].error == "Inserting doc-2 failed: duplicate id"
+    fields, binaries, _ = server.inserted["doc-3"]
+    assert binaries == [b"<content>document 3</content>"]
+    assert fields["rm_checksum"] == hashlib.md5(binaries[0]).hexdigest()
+    assert "rm_native" not in fields
+
+
+async def test_insert_invalidates_cached_results(make_session) -> None:
+    """Test that an insert invalidates the cached searches of its collection."""
+    server = _InsertServer()
+    swa = make_session(server)
+    cache = SearchCache()
+    cache.put(SearchKey("records", "p", "c", "*"), "stale")
+    cache.put(SearchKey("records", "p", "other", "*"), "kept")
+    inserter = MultipartInserter(swa, "p", "c", crawl_id="crawl-1", cache=cache)
+
+    await inserter.insert(InsertDocument("doc-1", content=[b"<content>x</content>"]))
+
+    assert SearchKey("records", "p", "c", "*") not in cache
+    assert SearchKey("records", "p", "other", "*") in cache
@@ -0,0 +1,103 @@
+"""Tests for measure cube conversion."""
+
+import json
+
+import httpx
+import pytest
+from axcpy.searchwebapi.generated.models.dimension_request import DimensionRequest
+from axcpy.searchwebapi.services import fetch_measure_array, measure_array
+
+np = pytest.importorskip("numpy")
+
+
+def _dimension(field, members):
+    return {
+        "fieldName": field,
+        "size": len(members),
+        "members": [
+            {"identifier": ident, "fields": [{"id": "rm_display_name", "value": name}]}
+            for ident, name in members
+        ],
+    }
+
+
+CUBE = {
+    "dimensions": [
+        _dimension("custodian", [("c1", "Smith"), ("c2", "Jones"), ("c3", "Lee")]),
+        _dimension("doc_type", [("t1", "email"), ("t2", "memo")]),
+    ],
+    "values": [[5, 0], [2, 3], [0, 0]],
+}
+
+
+def test_measure_array_labels_and_slices() -> None:
+    """Test that measure arrays are labelled and can be sliced."""
+    cube = measure_array(json.dumps(CUBE).encode())
+
+    assert cube.dims == ("custodian", "doc_type")
+    assert cube.data.dtype == np.int64
+    assert cube.sel(custodian="Jones", doc_type="memo") == 3
+    row = cube.sel(custodian="c1")
+    assert row.dims == ("doc_type",)
+    assert row.data.tolist() == [5, 0]
+    sub = cube.sel({"custodian": ["Lee", "Smith"]})
+    assert sub.axes[0].labels == ("c3", "c1")
+    assert sub.data.tolist() == [[0, 0], [5, 0]]
+    assert cube.sel(custodian=slice(0, 2)).shape == (2, 2)
+
+
+def test_measure_array_aggregation_and_sparse() -> None:
+    """Test that measure arrays aggregate and convert to sparse form."""
+    cube = measure_array(CUBE)
+
+    assert cube.sum() == 10
+    assert cube.marginal("doc_type").data.tolist() == [7, 3]
+    assert cube.max("custodian").data.tolist() == [5, 3]
+    sparse = cube.to_sparse()
+    assert len(sparse) == 3
+    assert np.array_equal(sparse.to_dense().data, cube.data)
+    assert cube.to_dict() == {("c1", "t1"): 5, ("c2", "t1"): 2, ("c2", "t2"): 3}
+
+
+def test_measure_array_one_dimension_and_doubles() -> None:
+    """Test that one-dimensional and floating point measures are decoded."""
+    cube = measure_array(
+        {
+            "dimensions": [_dimension("custodian", [("c1", "A"), ("c2", "B")])],
+            "valuesDouble": [[0.5, 1.5]],
+        }
+    )
+    assert cube.shape == (2,)
+    assert cube.data.dtype == np.float64
+    assert measure_array({"dimensions": [], "values": [[42]]}).data[()] == 42
+
+    with pytest.raises(ValueError):
+        measure_array({"dimensions": CUBE["dimensions"], "values": [[1, 2]]})
+    with pytest.raises(RuntimeError):
+        measure_array({"status": {"successful": False, "errorMessage": "bad field"}})
+
+
+async def test_fetch_measure_array_posts_dimensions(make_session) -> None:
+    """Test that the dimensions are posted with the measure request."""
+    requests: list[httpx.Request] = []
+
+    def server(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path.endswith("/measures"):
+            return httpx.Response(200, json=CUBE)
+        return httpx.Response(200, json={})
+
+    swa = make_session(server)
+
+    cube = await fetch_measure_array(
+        swa.client,
+        "p",
+        "c",
+        [DimensionRequest(field="custodian"), DimensionRequest(field="doc_type")],
+        query="privileged",
+        measure_type={"typeName": "count"},
+    )
+
+    assert cube.shape == (3, 2)
+    assert json.loads(requests[0].content) == [{"field": "custodian"}, {"field": "doc_type"}]
+    assert json.loads(requests[0].url.params["measureType"]) == {"typeName": "count"}
@@ -0,0 +1,83 @@
+"""Tests for the prefetching record pager."""
+
+import asyncio
+
+import httpx
+import pytest
+from axcpy.searchwebapi.services import RecordPager
+
+
+class _RecordsServer:
+    """Serves `total` records in rank order and tracks concurrent page requests."""
+
+    def __init__(self, total: int) -> None:
+        self.total = total
+        self.pages: list[int] = []
+        self.params: list[httpx.QueryParams] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if not request.url.path.endswith("/records"):
+            return httpx.Response(200, json={})  # logout
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            page = int(request.url.params["page"])
+            limit = int(request.url.params["limit"])
+            self.pages.append(page)
+            self.params.append(request.url.params)
+            start = (page - 1) * limit
+            results = [
+                {"id": f"doc-{rank}", "rank": rank}
+                for rank in range(start + 1, min(start + limit, self.total) + 1)
+            ]
+            return httpx.Response(200, json={"numberResults": self.total, "results": results})
+        finally:
+            self.in_flight -= 1
+
+
+async def test_pager_yields_all_records_in_order_with_prefetch(make_session) -> None:
+    """Test that prefetched pages are yielded in order."""
+    server = _RecordsServer(total=95)
+    swa = make_session(server)
+
+    pager = RecordPager(
+        swa.client, "p", "c", fields=["rm_title", "rm_size"], page_size=10, prefetch=3
+    )
+    ranks = [record.rank async for record in pager]
+
+    assert ranks == list(range(1, 96))
+    assert pager.number_results == 95
+    assert sorted(server.pages) == list(range(1, 11))
+    assert server.max_in_flight == 3
+    assert server.params[0]["fields"] == "rm_title,rm_size"
+
+
+async def test_pager_respects_max_records_and_start_page(make_session) -> None:
+    """Test that the pager honours max_records and start_page."""
+    server = _RecordsServer(total=95)
+    swa = make_session(server)
+
+    pager = RecordPager(swa.client, "p", "c", page_size=10, start_page=3, max_records=15)
+    ranks = [record.rank async for record in pager]
+
+    assert ranks == list(range(21, 36))
+    assert sorted(server.pages) == [3, 4]
+
+
+async def test_pager_handles_empty_result(make_session) -> None:
+    """Test that an empty result yields no records."""
+    server = _RecordsServer(total=0)
+    swa = make_session(server)
+
+    assert [r async for r in RecordPager(swa.client, "p", "c")] == []
+    assert server.pages == [1]
+
+
+def test_pager_validates_page_size(make_session) -> None:
+    """Test that an invalid page size is rejected."""
+    swa = make_session(_RecordsServer(total=0))
+    with pytest.raises(ValueError):
+        RecordPager(swa.client, "p", "c", page_size=5000)
@@ -0,0 +1,86 @@
+"""Tests for the collection schema cache and field projection."""
+
+import httpx
+import pytest
+from axcpy.searchwebapi.services import CachedSearch, SchemaCache, SearchCache
+
+FIELDS = [
+    {"id": "rm_title", "displayName": "Title", "type": "text", "isSortable": True},
+    {"id": "rm_author", "displayName": "Author", "type": "text"},
+    {"id": "custodian", "displayName": "Custodian", "type": "singleValue", "isFolderField": True},
+    {"id": "ranks", "displayName": "ranks", "type": "parameterizedLong"},
+    {"id": "rm_native", "displayName": "Native", "type": "binary"},
+]
+
+
+class _SchemaServer:
+    def __init__(self) -> None:
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.url.path.endswith("/fields"):
+            return httpx.Response(200, json={"numberResults": len(FIELDS), "results": FIELDS})
+        return httpx.Response(200, json={"numberResults": 0, "results": []})
+
+    def count(self, suffix: str) -> int:
+        return sum(r.url.path.endswith(suffix) for r in self.requests)
+
+
+async def test_projection_maps_attributes_to_minimal_parameters(make_session) -> None:
+    """Test that a projection requests only the fields it needs."""
+    server = _SchemaServer()
+    swa = make_session(server)
+    schemas = SchemaCache(swa.client)
+
+    projection = await schemas.projection(
+        "p", "c", ["Title", "rm_title", "custodian", "ranks.A", "body", "rm_is_best_bet"]
+    )
+    assert projection.fields == "rm_title,ranks.A,rm_is_best_bet"
+    assert projection.folder_fields == "custodian"
+    assert projection.body is True
+
+    ids_only = await schemas.projection("p", "c", ["Custodian"], folder_names=False)
+    assert ids_only == ("custodian", None, False)
+
+    await CachedSearch(swa.client).records("p", "c", query="york", **projection._asdict())
+    params = server.requests[-1].url.params
+    assert params["fields"] == "rm_title,ranks.A,rm_is_best_bet"
+    assert params["folderFields"] == "custodian"
+    assert params["body"] == "true"
+    assert server.count("/fields") == 1
+
+
+async def test_unknown_and_binary_fields_are_rejected_without_search(make_session) -> None:
+    """Test that unknown and binary fields are rejected before searching."""
+    server = _SchemaServer()
+    swa = make_session(server)
+    schemas = SchemaCache(swa.client)
+
+    with pytest.raises(ValueError, match="'rm_titel' \\(did you mean 'rm_title'\\?\\)"):
+        await schemas.projection("p", "c", ["rm_titel", "rm_author"])
+    with pytest.raises(ValueError, match="Binary fields"):
+        await schemas.projection("p", "c", ["rm_native"])
+    with pytest.raises(ValueError, match="Unknown"):
+        await schemas.projection("p", "c", ["rm_title.A"])  # not a parameterizedLong field
+
+    assert [r.url.path.rsplit("/", 1)[-1] for r in server.requests] == ["fields"]
+
+
+async def test_schemas_expire_and_can_be_invalidated(make_session) -> None:
+    """Test that cached schemas expire and can be invalidated."""
+    server = _SchemaServer()
+    swa = make_session(server)
+    now = [0.0]
+    schemas = SchemaCache(swa.client, cache=SearchCache(ttl=300.0, clock=lambda: now[0]))
+
+    schema = await schemas.schema("p", "c")
+    assert "Author" in schema and schema.folder_fields == ["custodian"]
+    await schemas.schema("p", "c")
+    assert server.count("/fields") == 1
+    now[0] = 301.0
+    await schemas.schema("p", "c")
+    assert server.count("/fields") == 2
+    schemas.invalidate("p", "c")
+    await schemas.schema("p", "c")
+    assert server.count("/fields") == 3
@@ -0,0 +1,103 @@
+"""Tests for the SearchWebAPI session factory."""
+
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+from axcpy.searchwebapi import SearchWebApiSession
+from axcpy.searchwebapi.services import RecordPager
+
+BASE_URL = "https://swa.example.com/searchWebApi"
+
+
+class _FakeServer:
+    """Minimal SearchWebAPI stand-in issuing numbered sessions."""
+
+    def __init__(self) -> None:
+        self.valid_sessions: set[str] = set()
+        self.logins = 0
+        self.requests: list[httpx.Request] = []
+
+    def expire_all(self) -> None:
+        self.valid_sessions.clear()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        session = request.headers.get("SWA-SESSION")
+        if session in self.valid_sessions:
+            if request.url.path.endswith("/logout"):
+                self.valid_sessions.discard(session)
+            return httpx.Response(200, json={"results": []})
+        if request.headers.get("Authorization", "").startswith("Basic "):
+            self.logins += 1
+            new_session = f"s{self.logins}"
+            self.valid_sessions.add(new_session)
+            return httpx.Response(200, json={}, headers={"SWA-SESSION": new_session})
+        return httpx.Response(401, json={})
+
+
+@pytest.mark.asyncio
+async def test_session_logs_in_once_and_reuses_header() -> None:
+    """Test that credentials are only sent for the login."""
+    server = _FakeServer()
+    async with SearchWebApiSession(
+        BASE_URL, "user", "pass", http2=False, transport=httpx.MockTransport(server)
+    ) as swa:
+        assert swa.session_id == "s1"
+        await swa.client.projects.get()
+        await swa.client.projects.get()
+
+    assert server.logins == 1
+    assert server.requests[0].url.path == "/searchWebApi/login"
+    for request in server.requests[1:]:
+        assert "Authorization" not in request.headers
+        assert request.headers["SWA-SESSION"] == "s1"
+    assert server.requests[-1].url.path == "/searchWebApi/logout"
+
+
+@pytest.mark.asyncio
+async def test_session_relogs_in_on_expiry() -> None:
+    """Test that an expired session is renewed and the request retried."""
+    server = _FakeServer()
+    swa = SearchWebApiSession(
+        BASE_URL, "user", "pass", http2=False, transport=httpx.MockTransport(server)
+    )
+    try:
+        await swa.login()
+        server.expire_all()
+        body = await swa.client.projects.get()
+        assert body == b'{"results":[]}'
+        assert swa.session_id == "s2"
+        assert server.logins == 2
+    finally:
+        await swa.close()
+
+
+@pytest.mark.asyncio
+async def test_long_get_query_is_sent_as_form_post() -> None:
+    """Test that GET requests with very long URLs move their query into a POST body."""
+    server = _FakeServer()
+    swa = SearchWebApiSession(
+        BASE_URL,
+        "user",
+        "pass",
+        http2=False,
+        transport=httpx.MockTransport(server),
+        post_query_threshold=200,
+    )
+    try:
+        await swa.login()
+        long_query = " OR ".join(f'privileged="term {i}"' for i in range(500))
+        await RecordPager(swa.client, "p", "c", query=long_query).fetch_page(1)
+        await RecordPager(swa.client, "p", "c", query="york").fetch_page(1)
+
+        long_request, short_request = server.requests[-2:]
+        assert long_request.method == "POST"
+        assert long_request.url.query == b""
+        assert long_request.headers["Content-Type"] == "application/x-www-form-urlencoded"
+        assert long_request.headers["SWA-SESSION"] == "s1"
+        assert parse_qs(long_request.content.decode())["query"] == [long_query]
+        assert short_request.method == "GET"
+        assert short_request.url.params["query"] == "york"
+    finally:
+        await swa.close()
@@ -0,0 +1,100 @@
+"""Tests for the sort order snapshot cursor."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from axcpy.searchwebapi.services import SnapshotCursor
+
+
+class _SnapshotServer:
+    """Issues token T1 over `total` documents and serves SEARCH_IN_SEARCHRESULT_RANGE queries."""
+
+    def __init__(self, total: int, delay: float = 0.0) -> None:
+        self.total = total
+        self.delay = delay
+        self.calls: list[tuple[str, str]] = []
+        self.range_queries: list[str] = []
+        self.fail_ranges = False
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.calls.append((request.method, path.rsplit("/", 1)[-1]))
+        if path.endswith("/sortOrderSnapshot"):
+            assert json.loads(request.content) == {"token": "T1"}
+            return httpx.Response(200)
+        if path.endswith("/searchToken"):
+            if request.method == "GET":
+                return httpx.Response(
+                    200, json={"token": "T1", "numberResults": self.total, "eol": "e0"}
+                )
+            if request.method == "PUT":
+                return httpx.Response(200, json={"token": "T1", "eol": "e1"})
+            return httpx.Response(200)  # DELETE
+        if path.endswith("/records"):
+            await asyncio.sleep(self.delay)
+            if self.fail_ranges:
+                return httpx.Response(500, json={"status": {"successful": False}})
+            query = request.url.params["query"]
+            self.range_queries.append(query)
+            token, start, end = query.split("=", 1)[1].split(";")
+            assert token == "T1"
+            page = int(request.url.params["page"])
+            limit = int(request.url.params["limit"])
+            first = int(start) + (page - 1) * limit
+            last = min(first + limit, int(end))
+            results = [{"id": f"doc-{rank}", "rank": rank} for rank in range(first, last)]
+            return httpx.Response(
+                200, json={"numberResults": int(end) - int(start), "results": results}
+            )
+        return httpx.Response(200, json={})
+
+
+async def test_scan_reads_all_ranges_and_deletes_token(make_session) -> None:
+    """Test that a scan reads every range and deletes its token."""
+    server = _SnapshotServer(total=25)
+    swa = make_session(server)
+
+    async with SnapshotCursor(
+        swa.client, "p", "c", order="rm_title", workers=3, page_size=4
+    ) as cursor:
+        assert cursor.ranges() == [(0, 9), (9, 18), (18, 25)]
+        ids = [record.id async for record in cursor.scan()]
+
+    assert sorted(ids, key=lambda i: int(i.split("-")[1])) == [f"doc-{i}" for i in range(25)]
+    assert set(server.range_queries) == {
+        "SEARCH_IN_SEARCHRESULT_RANGE=T1;0;9",
+        "SEARCH_IN_SEARCHRESULT_RANGE=T1;9;18",
+        "SEARCH_IN_SEARCHRESULT_RANGE=T1;18;25",
+    }
+    assert server.calls[:2] == [("GET", "searchToken"), ("POST", "sortOrderSnapshot")]
+    assert server.calls[-1] == ("DELETE", "searchToken")
+    assert cursor.token is None
+
+
+async def test_token_is_renewed_while_scanning(make_session) -> None:
+    """Test that the token is renewed during a long scan."""
+    server = _SnapshotServer(total=6, delay=0.03)
+    swa = make_session(server)
+
+    async with SnapshotCursor(
+        swa.client, "p", "c", workers=1, page_size=2, renew_interval=0.02
+    ) as cursor:
+        assert len([r async for r in cursor.scan()]) == 6
+
+    assert ("PUT", "searchToken") in server.calls
+    assert cursor.eol == "e1"
+
+
+async def test_worker_failure_propagates_and_token_is_deleted(make_session) -> None:
+    """Test that a worker failure is raised and the token still deleted."""
+    server = _SnapshotServer(total=10)
+    server.fail_ranges = True
+    swa = make_session(server)
+
+    with pytest.raises(Exception):
+        async with SnapshotCursor(swa.client, "p", "c", workers=2) as cursor:
+            [r async for r in cursor.scan()]
+
+    assert server.calls[-1] == ("DELETE", "searchToken")
@@ -0,0 +1,89 @@
+"""Tests for the search token pool."""
+
+import asyncio
+import json
+
+import httpx
+from axcpy.searchwebapi.services import SearchTokenPool
+
+
+class _TokenServer:
+    def __init__(self) -> None:
+        self.issued = 0
+        self.live: set[str] = set()
+        self.renewed: list[str] = []
+        self.deleted: list[str] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if not request.url.path.endswith("/searchToken"):
+            return httpx.Response(200, json={})
+        if request.method == "GET":
+            await asyncio.sleep(0.01)
+            self.issued += 1
+            token = f"T{self.issued}"
+            self.live.add(token)
+            return httpx.Response(200, json={"token": token, "numberResults": 10, "eol": "e0"})
+        token = json.loads(request.content)["token"]
+        if request.method == "PUT":
+            if token not in self.live:
+                return httpx.Response(404, json={"status": {"successful": False}})
+            self.renewed.append(token)
+            return httpx.Response(200, json={"token": token, "eol": "e1"})
+        self.live.discard(token)
+        self.deleted.append(token)
+        return httpx.Response(200)
+
+
+async def test_pool_reuses_tokens_for_identical_searches(make_session) -> None:
+    """Test that identical searches share a token."""
+    server = _TokenServer()
+    swa = make_session(server)
+    pool = SearchTokenPool(swa.client, renew_interval=None)
+
+    first, second = await asyncio.gather(
+        pool.acquire("p", "c", query="york", order="rm_title"),
+        pool.acquire("p", "c", query="york", order="rm_title"),
+    )
+    other = await pool.acquire("p", "c", query="york", order="rm_title:desc")
+
+    assert first is second
+    assert first.token == "T1" and first.number_results == 10
+    assert other.token == "T2"
+    assert server.issued == 2
+
+    await pool.close()
+    assert sorted(server.deleted) == ["T1", "T2"]
+
+
+async def test_pool_evicts_least_recently_used_unleased_token(make_session) -> None:
+    """Test that the least recently used unleased token is evicted."""
+    server = _TokenServer()
+    swa = make_session(server)
+    pool = SearchTokenPool(swa.client, max_tokens=2, renew_interval=None)
+
+    async with pool.lease("p", "c", query="a"):
+        await pool.acquire("p", "c", query="b")
+        await pool.acquire("p", "c", query="c")
+        assert server.deleted == ["T2"]  # "a" is leased, "b" is the oldest free one
+        assert len(pool) == 2
+
+    await pool.close()
+
+
+async def test_pool_renews_in_background_and_drops_expired_tokens(make_session) -> None:
+    """Test that tokens are renewed in the background and dropped once expired."""
+    server = _TokenServer()
+    swa = make_session(server)
+
+    async with SearchTokenPool(swa.client, renew_interval=0.02) as pool:
+        lease = await pool.acquire("p", "c", query="a")
+        await pool.acquire("p", "c", query="b")
+        server.live.discard("T2")  # expired on the server
+        await asyncio.sleep(0.05)
+
+        assert "T1" in server.renewed
+        assert lease.eol == "e1"
+        assert len(pool) == 1
+        assert (await pool.acquire("p", "c", query="b")).token == "T3"
+
+    assert sorted(server.deleted) == ["T1", "T3"]